@@ -0,0 +1,22 @@
+"""
+Time of the analytic engine against simulation of the same register.
+"""
+from darpi.quantitative.analytic import get_analytic_distribution
+from darpi.quantitative.probability import get_register_totals
+
+from .common import get_benchmark_register
+
+
+class AnalyticDistribution:
+    params = [10, 100, 1000]
+    param_names = ["risks"]
+    timeout = 600
+
+    def setup(self, n_risks):
+        self.register = get_benchmark_register(n_risks)
+
+    def time_analytic_distribution(self, n_risks):
+        get_analytic_distribution(self.register)
+
+    def time_register_totals(self, n_risks):
+        get_register_totals(self.register, iterations=10**6, seed=1)
@@ -0,0 +1,40 @@
+"""
+Time to sample registers that mix distribution families, against triangular-only registers.
+"""
+from darpi.quantitative.distributions import get_mixed_sample_matrix
+
+from .common import get_benchmark_register
+
+FAMILIES = ("triangular", "pert", "uniform", "lognormal", "discrete")
+
+
+def get_benchmark_risks(n_risks: int, mixed: bool) -> dict[str, dict]:
+    """
+    Convert the benchmark register to a dictionary of risks, cycling through every family if
+    `mixed`.
+    """
+    register = get_benchmark_register(n_risks)
+    risks = {}
+    for index, (name, minimum, mode, maximum, probability) in enumerate(zip(*register)):
+        family = FAMILIES[index % len(FAMILIES)] if mixed else "triangular"
+        costs = {
+            "triangular": (minimum, mode, maximum),
+            "pert": (minimum, mode, maximum),
+            "uniform": (minimum, maximum),
+            "lognormal": (minimum, maximum),
+            "discrete": (minimum, mode, maximum),
+        }[family]
+        risks[name] = {"distribution": family, "costs": costs, "probability": probability}
+    return risks
+
+
+class MixedSampling:
+    params = ([10, 100], [False, True])
+    param_names = ["risks", "mixed"]
+    timeout = 600
+
+    def setup(self, n_risks, mixed):
+        self.risks = get_benchmark_risks(n_risks, mixed)
+
+    def time_get_mixed_sample_matrix(self, n_risks, mixed):
+        get_mixed_sample_matrix(self.risks, iterations=10**5, seed=42)
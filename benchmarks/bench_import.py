@@ -0,0 +1,19 @@
+"""
+Import time of the numeric core and of the optional plotting and table modules.
+
+`timeraw_` benchmarks run their code in a fresh interpreter, so nothing is already imported.
+"""
+
+
+class ImportTime:
+    def timeraw_import_probability(self):
+        return "import darpi.quantitative.probability"
+
+    def timeraw_import_results(self):
+        return "import darpi.quantitative.results"
+
+    def timeraw_import_tables(self):
+        return "import darpi.quantitative.tables"
+
+    def timeraw_import_plots(self):
+        return "import darpi.quantitative.plots"
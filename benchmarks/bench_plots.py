@@ -0,0 +1,33 @@
+"""
+Time and size of the figures built from simulations of increasing length.
+"""
+from darpi.quantitative.plots import plot_histogram_and_cdf, plot_ppf_curve
+from darpi.quantitative.results import SimulationResult
+
+from .bench_postprocessing import get_benchmark_totals
+
+
+class Plots:
+    params = [10**4, 10**5, 10**6]
+    param_names = ["iterations"]
+    timeout = 600
+
+    def setup(self, iterations):
+        result = SimulationResult(get_benchmark_totals(iterations))
+        self.hist_data = result.get_histogram_data()
+        self.cdf_data = result.get_empirical_cdf()
+        self.ppf_data = result.get_empirical_ppf()
+
+    def time_plot_histogram_and_cdf(self, iterations):
+        plot_histogram_and_cdf(self.hist_data, self.cdf_data)
+
+    def peakmem_plot_histogram_and_cdf(self, iterations):
+        plot_histogram_and_cdf(self.hist_data, self.cdf_data)
+
+    def track_histogram_and_cdf_bytes(self, iterations):
+        return len(plot_histogram_and_cdf(self.hist_data, self.cdf_data).to_json())
+
+    track_histogram_and_cdf_bytes.unit = "bytes"
+
+    def time_plot_ppf_curve(self, iterations):
+        plot_ppf_curve(self.ppf_data)
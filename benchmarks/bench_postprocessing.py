@@ -0,0 +1,63 @@
+"""
+Time and peak memory of the post-processing of simulated totals.
+"""
+import numpy as np
+
+from darpi.quantitative.probability import (
+    get_costs,
+    get_empirical_cdf,
+    get_empirical_ppf,
+    get_histogram_data,
+    get_non_exceedance_probabilities,
+)
+from darpi.quantitative.results import SimulationResult
+
+P_VALUES = np.linspace(0.01, 0.99, 99)
+
+
+def get_benchmark_totals(iterations: int) -> np.ndarray:
+    """
+    Draw totals shaped like a simulation: an atom at zero and a skewed, positive remainder.
+    """
+    rng = np.random.default_rng(iterations)
+    totals = rng.gamma(4, 2500, iterations)
+    totals[rng.random(iterations) < 0.05] = 0
+    return totals
+
+
+class PostProcessing:
+    params = [10**4, 10**5, 10**6, 10**7]
+    param_names = ["iterations"]
+    timeout = 600
+
+    def setup(self, iterations):
+        self.totals = get_benchmark_totals(iterations)
+        self.sorted_totals = np.sort(self.totals)
+
+    def time_get_empirical_ppf(self, iterations):
+        get_empirical_ppf(self.totals)
+
+    def peakmem_get_empirical_ppf(self, iterations):
+        get_empirical_ppf(self.totals)
+
+    def time_get_empirical_cdf(self, iterations):
+        get_empirical_cdf(self.totals)
+
+    def time_get_histogram_data(self, iterations):
+        get_histogram_data(self.totals)
+
+    def peakmem_get_histogram_data(self, iterations):
+        get_histogram_data(self.totals)
+
+    def time_get_costs(self, iterations):
+        get_costs(self.sorted_totals, P_VALUES, is_sorted=True)
+
+    def time_get_non_exceedance_probabilities(self, iterations):
+        get_non_exceedance_probabilities(self.sorted_totals, self.totals[:1000], is_sorted=True)
+
+    def time_simulation_result_queries(self, iterations):
+        result = SimulationResult(self.totals)
+        result.get_empirical_ppf()
+        result.get_empirical_cdf()
+        result.get_histogram_data()
+        result.get_costs(P_VALUES)
@@ -0,0 +1,38 @@
+"""
+Memory, time and accuracy of single against double precision samples.
+"""
+import numpy as np
+
+from darpi.quantitative.probability import get_costs, get_sample_matrix, sum_sample_matrix
+
+from .common import get_benchmark_register
+
+P_VALUES = np.asarray([0.1, 0.5, 0.8, 0.9, 0.99])
+DTYPES = {"float64": np.float64, "float32": np.float32}
+
+
+class SamplePrecision:
+    params = (list(DTYPES), [100, 1000])
+    param_names = ["dtype", "risks"]
+    timeout = 600
+
+    def setup(self, dtype, n_risks):
+        self.register = get_benchmark_register(n_risks)
+
+    def time_sample_matrix(self, dtype, n_risks):
+        samples = get_sample_matrix(self.register, 10**5, seed=1, dtype=DTYPES[dtype])
+        sum_sample_matrix(samples, self.register.names)
+
+    def peakmem_sample_matrix(self, dtype, n_risks):
+        samples = get_sample_matrix(self.register, 10**5, seed=1, dtype=DTYPES[dtype])
+        sum_sample_matrix(samples, self.register.names)
+
+    def track_p_value_error(self, dtype, n_risks):
+        costs = {}
+        for name, value in (("float64", np.float64), (dtype, DTYPES[dtype])):
+            samples = get_sample_matrix(self.register, 10**5, seed=1, dtype=value)
+            totals = sum_sample_matrix(samples, self.register.names).astype(value)
+            costs[name] = get_costs(totals, P_VALUES)
+        return float(np.abs(costs[dtype] / costs["float64"] - 1).max())
+
+    track_p_value_error.unit = "largest relative error of P10 to P99"
@@ -0,0 +1,94 @@
+"""
+Time and peak memory of sampling and aggregation, over register size, iterations and the mix
+of risk probabilities.
+"""
+import numpy as np
+
+from darpi.quantitative.probability import (
+    get_aggregate_data,
+    get_register_totals,
+    get_sample_matrix,
+    get_samples,
+    get_sparse_samples,
+    get_triangular_distribution,
+    sum_sample_matrix,
+)
+
+from .common import get_benchmark_register
+
+# Skip parameter combinations beyond these numbers of samples (risks times iterations)
+MAX_MATRIX_SAMPLES = 10**8
+MAX_SAMPLES = 10**9
+
+
+class Samples:
+    params = [0.02, 0.5, 1.0]
+    param_names = ["probability"]
+
+    def setup(self, probability):
+        self.distribution = get_triangular_distribution(1000, 5000, 2000)
+
+    def time_get_samples(self, probability):
+        get_samples(self.distribution, probability, seed=1)
+
+    def peakmem_get_samples(self, probability):
+        get_samples(self.distribution, probability, seed=1)
+
+    def time_get_sparse_samples(self, probability):
+        get_sparse_samples(self.distribution, probability, seed=1)
+
+
+class AggregateData:
+    params = ([10, 100, 1000, 10000], ["low", "high", "mixed"])
+    param_names = ["risks", "probability"]
+    timeout = 600
+
+    def setup(self, n_risks, probability):
+        self.register = get_benchmark_register(n_risks, probability)
+
+    def time_get_aggregate_data(self, n_risks, probability):
+        get_aggregate_data(self.register, seed=1)
+
+    def peakmem_get_aggregate_data(self, n_risks, probability):
+        get_aggregate_data(self.register, seed=1)
+
+    def time_get_aggregate_data_sparse(self, n_risks, probability):
+        get_aggregate_data(self.register, seed=1, sparse_probability=0.05)
+
+
+class Aggregation:
+    params = (
+        [10, 100, 1000, 10000],
+        [10**4, 10**5, 10**6, 10**7],
+        ["low", "high", "mixed"],
+    )
+    param_names = ["risks", "iterations", "probability"]
+    timeout = 1200
+
+    def setup(self, n_risks, iterations, probability):
+        if n_risks * iterations > MAX_SAMPLES:
+            raise NotImplementedError
+        self.register = get_benchmark_register(n_risks, probability)
+
+    def time_get_sample_matrix(self, n_risks, iterations, probability):
+        if n_risks * iterations > MAX_MATRIX_SAMPLES:
+            raise NotImplementedError
+        sum_sample_matrix(
+            get_sample_matrix(self.register, iterations, seed=1), self.register.names
+        )
+
+    def peakmem_get_sample_matrix(self, n_risks, iterations, probability):
+        if n_risks * iterations > MAX_MATRIX_SAMPLES:
+            raise NotImplementedError
+        sum_sample_matrix(
+            get_sample_matrix(self.register, iterations, seed=1), self.register.names
+        )
+
+    def time_get_register_totals(self, n_risks, iterations, probability):
+        get_register_totals(self.register, iterations, seed=1)
+
+    def peakmem_get_register_totals(self, n_risks, iterations, probability):
+        get_register_totals(self.register, iterations, seed=1)
+
+    def time_get_register_totals_float32(self, n_risks, iterations, probability):
+        get_register_totals(self.register, iterations, seed=1, dtype=np.float32)
@@ -0,0 +1,23 @@
+"""
+Time to count and plot qualitative registers of increasing size.
+"""
+import numpy as np
+
+from darpi.qualitative.plots import plot_heat_map
+from darpi.qualitative.scoring import get_heat_map_data
+
+
+class HeatMap:
+    params = [10**3, 2 * 10**4, 10**6]
+    param_names = ["risks"]
+
+    def setup(self, risks):
+        rng = np.random.default_rng(42)
+        self.probability = rng.integers(1, 6, size=risks)
+        self.impact = rng.integers(1, 6, size=risks)
+
+    def time_get_heat_map_data(self, risks):
+        get_heat_map_data(self.probability, self.impact)
+
+    def time_plot_heat_map(self, risks):
+        plot_heat_map(self.probability, self.impact, "Risks")
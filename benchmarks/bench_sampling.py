@@ -0,0 +1,71 @@
+"""
+Error against time of the sampling methods of `get_sample_matrix()`.
+
+Run with `asv run`, or directly with `python -m benchmarks.bench_sampling` for a quick table.
+"""
+import time
+
+import numpy as np
+
+from darpi.quantitative.probability import get_costs, get_sample_matrix, sum_sample_matrix
+
+from .common import get_benchmark_register
+
+P_VALUES = np.asarray([0.5, 0.8, 0.9])
+N_RISKS = 50
+REFERENCE_ITERATIONS = 2**22
+REPLICATIONS = 20
+
+
+def get_p_value_costs(sampling: str, iterations: int, seed: int) -> np.ndarray:
+    register = get_benchmark_register(N_RISKS)
+    samples = get_sample_matrix(register, iterations, seed=seed, sampling=sampling)
+    return get_costs(sum_sample_matrix(samples, register.names), P_VALUES)
+
+
+def get_reference_costs() -> np.ndarray:
+    return get_p_value_costs("random", REFERENCE_ITERATIONS, seed=0)
+
+
+def get_p_value_error(
+    reference: np.ndarray, sampling: str, iterations: int
+) -> float:
+    costs = np.asarray(
+        [
+            get_p_value_costs(sampling, iterations, seed)
+            for seed in range(1, REPLICATIONS + 1)
+        ]
+    )
+    return float(np.sqrt(np.mean((costs / reference - 1) ** 2)))
+
+
+class SamplingAccuracy:
+    params = (["random", "latin-hypercube", "sobol"], [2**10, 2**12, 2**14, 2**16])
+    param_names = ["sampling", "iterations"]
+    timeout = 600
+
+    def setup_cache(self):
+        return get_reference_costs()
+
+    def setup(self, reference, sampling, iterations):
+        self.register = get_benchmark_register(N_RISKS)
+
+    def time_sample_matrix(self, reference, sampling, iterations):
+        get_sample_matrix(self.register, iterations, seed=1, sampling=sampling)
+
+    def track_p_value_error(self, reference, sampling, iterations):
+        return get_p_value_error(reference, sampling, iterations)
+
+    track_p_value_error.unit = "RMS relative error of P50/P80/P90"
+
+
+if __name__ == "__main__":
+    reference = get_reference_costs()
+    print(f"{'sampling':<16}{'iterations':>12}{'seconds':>10}{'error':>12}")
+    for sampling in SamplingAccuracy.params[0]:
+        for iterations in SamplingAccuracy.params[1]:
+            start = time.perf_counter()
+            get_p_value_costs(sampling, iterations, seed=1)
+            seconds = time.perf_counter() - start
+            error = get_p_value_error(reference, sampling, iterations)
+            print(f"{sampling:<16}{iterations:>12}{seconds:>10.4f}{error:>12.2e}")
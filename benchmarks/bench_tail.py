@@ -0,0 +1,57 @@
+"""
+Time of the tail metrics against sorting the totals.
+"""
+import numpy as np
+
+from darpi.quantitative.tail import (
+    get_exceedance_probability,
+    get_expected_shortfall,
+    get_tail_mean,
+    get_value_at_risk,
+)
+
+from .bench_postprocessing import get_benchmark_totals
+
+LEVELS = np.array([0.5, 0.8, 0.9, 0.95, 0.99])
+
+
+class TailMetrics:
+    params = [10**5, 10**6, 10**7]
+    param_names = ["iterations"]
+    timeout = 600
+
+    def setup(self, iterations):
+        self.totals = get_benchmark_totals(iterations)
+        self.budget = np.median(self.totals)
+        self.budgets = np.quantile(self.totals, np.linspace(0, 1, 1000))
+
+    def time_sort(self, iterations):
+        np.sort(self.totals)
+
+    def time_get_value_at_risk(self, iterations):
+        get_value_at_risk(self.totals, LEVELS)
+
+    def time_get_expected_shortfall(self, iterations):
+        get_expected_shortfall(self.totals, LEVELS)
+
+    def time_get_exceedance_probability(self, iterations):
+        get_exceedance_probability(self.totals, self.budget)
+
+    def time_get_exceedance_probability_budgets(self, iterations):
+        get_exceedance_probability(self.totals, self.budgets)
+
+    def time_get_tail_mean_budgets(self, iterations):
+        get_tail_mean(self.totals, self.budgets)
+
+
+class BatchedTailMetrics:
+    params = [10, 100]
+    param_names = ["registers"]
+
+    def setup(self, registers):
+        self.totals = np.stack(
+            [get_benchmark_totals(10**5 + register)[: 10**5] for register in range(registers)]
+        )
+
+    def time_get_expected_shortfall(self, registers):
+        get_expected_shortfall(self.totals, LEVELS)
@@ -0,0 +1,34 @@
+import numpy as np
+
+from darpi.config import RiskRegister
+
+
+def get_benchmark_register(n_risks: int, probability: str = "mixed") -> RiskRegister:
+    """
+    Build a reproducible register of `n_risks` triangular risks for benchmarking.
+
+    Parameters
+    ----------
+    n_risks : int
+        The number of risks.
+    probability : str, optional
+        The mix of occurrence probabilities: "low" (1-5%), "high" (50-100%) or "mixed" (the
+        default, 1-100%).
+
+    Returns
+    -------
+    RiskRegister
+        The register.
+    """
+    rng = np.random.default_rng(n_risks)
+    minimum = rng.uniform(1000, 10000, n_risks).round()
+    maximum = minimum * rng.uniform(1.5, 5, n_risks).round(2)
+    mode = (minimum + (maximum - minimum) * rng.uniform(0.1, 0.6, n_risks)).round()
+    low, high = {"low": (0.01, 0.05), "high": (0.5, 1), "mixed": (0.01, 1)}[probability]
+    return RiskRegister(
+        names=np.asarray([f"Risk {index + 1}" for index in range(n_risks)], dtype=object),
+        minimum=minimum,
+        mode=mode,
+        maximum=maximum,
+        probability=rng.uniform(low, high, n_risks).round(2),
+    )
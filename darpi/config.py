@@ -1,6 +1,34 @@
 from collections import namedtuple
 
 ITERATIONS = int(1e5)
+RISK_BLOCK_SIZE = 64
+CHUNK_SIZE = 2**16
+QUANTILE_BINS = 2**20
+CONVERGENCE_BATCH_SIZE = 2**12
+ANALYTIC_GRID_SIZE = 2**16
+CACHE_MAX_BYTES = 2**30
+PLOT_MAX_POINTS = 2000
+PLOT_WEBGL_THRESHOLD = 1000
 PPFData = namedtuple("PPFData", ["cost", "p"])
 HistogramData = namedtuple("HistogramData", ["cost", "frequency"])
 CDFData = namedtuple("CDFData", ["cost", "p"])
+SparseSamples = namedtuple("SparseSamples", ["index", "cost", "iterations"])
+SensitivityData = namedtuple(
+    "SensitivityData", ["risk", "tail_contribution", "rank_correlation", "removal_delta"]
+)
+RiskRegister = namedtuple(
+    "RiskRegister", ["names", "minimum", "mode", "maximum", "probability"]
+)
+ConvergenceData = namedtuple(
+    "ConvergenceData",
+    ["p_values", "cost", "standard_error", "iterations", "converged"],
+)
+RegisterError = namedtuple("RegisterError", ["row", "name", "message"])
+PortfolioData = namedtuple("PortfolioData", ["nodes", "totals"])
+StageRecord = namedtuple(
+    "StageRecord", ["stage", "seconds", "nbytes", "peak_bytes", "iterations", "risks"]
+)
+HeatMapData = namedtuple("HeatMapData", ["probability", "impact", "counts"])
+DistributionGroup = namedtuple(
+    "DistributionGroup", ["family", "rows", "names", "parameters", "probability"]
+)
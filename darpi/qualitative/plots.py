@@ -1,8 +1,15 @@
+from typing import TYPE_CHECKING
+
 import numpy as np
-import plotly.graph_objects as go
 
+from darpi.config import HeatMapData
+from darpi.qualitative.scoring import get_heat_map_data, get_score_centroid
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
-def plot_empty_heat_map(low: int = 1, high: int = 5) -> go.Figure:
+
+def plot_empty_heat_map(low: int = 1, high: int = 5) -> "go.Figure":
     """
     Creates an empty heat map with customizable axis range and color scale.
 
@@ -18,6 +25,8 @@ def plot_empty_heat_map(low: int = 1, high: int = 5) -> go.Figure:
     go.Figure
         A Plotly figure object representing the empty heat map.
     """
+    import plotly.graph_objects as go
+
     axis_range = [low - 0.5, high + 0.5]
     array = np.linspace(axis_range[0], axis_range[1])
 
@@ -73,30 +82,43 @@ def plot_empty_heat_map(low: int = 1, high: int = 5) -> go.Figure:
 
 
 def add_scatter_to_heat_map(
-    risk_score_counts: list[dict[str, float]], title: str
-) -> go.Figure:
+    risk_score_counts: list[dict[str, float]] | HeatMapData,
+    title: str,
+    low: int = 1,
+    high: int = 5,
+) -> "go.Figure":
     """
     Adds a scatter plot to the heat map, representing risks with their impact and probability.
 
     Parameters:
     -----------
-    risks : List[Dict[str, Any]]
+    risk_score_counts : List[Dict[str, Any]] or HeatMapData
         A list of dictionaries where each dictionary contains 'impact', 'probability',
         and 'counts' keys, representing the risk's impact, probability, and occurrence count.
+        Or the counted cells from `get_heat_map_data()`.
     title : str
         The title of the resulting heat map with scatter plot.
+    low : int, optional
+        The lower bound of the axis range, by default 1.
+    high : int, optional
+        The upper bound of the axis range, by default 5.
 
     Returns:
     --------
     go.Figure
         A Plotly figure object representing the heat map with the added scatter plot.
     """
-    impacts = np.array([risk["impact"] for risk in risks])
-    probabilities = np.array([risk["probability"] for risk in risks])
-    counts = np.array([risk["counts"] for risk in risks])
-
-    gmean_prob = (probabilities * counts).sum() / counts.sum()
-    gmean_impact = (impacts * counts).sum() / counts.sum()
+    import plotly.graph_objects as go
+
+    if not isinstance(risk_score_counts, HeatMapData):
+        risk_score_counts = HeatMapData(
+            *(
+                np.array([risk[field] for risk in risk_score_counts])
+                for field in HeatMapData._fields
+            )
+        )
+    probabilities, impacts, counts = risk_score_counts
+    gmean_prob, gmean_impact = get_score_centroid(risk_score_counts)
     max_count = max(counts)
 
     marker_size = 12
@@ -120,7 +142,7 @@ def add_scatter_to_heat_map(
         ),
     )
 
-    fig = plot_empty_heat_map()
+    fig = plot_empty_heat_map(low, high)
     fig.add_trace(scatter).add_trace(
         go.Scatter(
             x=[gmean_prob],
@@ -143,3 +165,42 @@ def add_scatter_to_heat_map(
     )
 
     return fig
+
+
+def plot_heat_map(
+    probability: np.ndarray,
+    impact: np.ndarray,
+    title: str,
+    low: int = 1,
+    high: int = 5,
+) -> "go.Figure":
+    """
+    Plots the risks of a register on a heat map from their raw scores.
+
+    Parameters:
+    -----------
+    probability : np.ndarray
+        The probability score of each risk, a whole number between `low` and `high`.
+    impact : np.ndarray
+        The impact score of each risk, a whole number between `low` and `high`.
+    title : str
+        The title of the heat map.
+    low : int, optional
+        The lowest score, by default 1.
+    high : int, optional
+        The highest score, by default 5.
+
+    Returns:
+    --------
+    go.Figure
+        A Plotly figure object with one marker per cell, sized by the number of risks in it,
+        and the mean scores of the register.
+
+    Notes:
+    ------
+    The risks are counted with `get_heat_map_data()`, so the figure has one marker per
+    non-empty cell, whatever the number of risks.
+    """
+    return add_scatter_to_heat_map(
+        get_heat_map_data(probability, impact, low, high), title, low, high
+    )
@@ -0,0 +1,99 @@
+import numpy as np
+
+from darpi.config import HeatMapData
+
+
+def _get_score_index(scores: np.ndarray, low: int, high: int, label: str) -> np.ndarray:
+    scores = np.asarray(scores)
+    if scores.ndim != 1:
+        raise ValueError(f"`{label}` must be one-dimensional.")
+    if not np.all(np.isfinite(scores)) or np.any(scores != np.round(scores)):
+        raise ValueError(f"`{label}` scores must be whole numbers.")
+    if np.any((scores < low) | (scores > high)):
+        raise ValueError(f"`{label}` scores must be between {low} and {high}.")
+    return scores.astype(np.intp) - low
+
+
+def get_heat_map_data(
+    probability: np.ndarray, impact: np.ndarray, low: int = 1, high: int = 5
+) -> HeatMapData:
+    """
+    Count the risks in each cell of a heat map.
+
+    Parameters
+    ----------
+    probability : np.ndarray
+        The probability score of each risk, a whole number between `low` and `high`.
+    impact : np.ndarray
+        The impact score of each risk, a whole number between `low` and `high`.
+    low : int, optional
+        The lowest score, by default 1.
+    high : int, optional
+        The highest score, by default 5.
+
+    Returns
+    -------
+    HeatMapData
+        An object containing, for each cell with at least one risk, ordered by probability and
+        then impact:
+        - `probability`: The probability score of the cell.
+        - `impact`: The impact score of the cell.
+        - `counts`: The number of risks in the cell.
+
+    Raises
+    ------
+    ValueError
+        If the scores are not whole numbers between `low` and `high`, or if `probability` and
+        `impact` differ in length.
+
+    Notes
+    -----
+    Each risk is mapped to the index of its cell in the flattened `(probability, impact)` grid,
+    and all cells are counted with a single `np.bincount()`.
+
+    Example
+    -------
+    >>> data = get_heat_map_data(df["probability"], df[["schedule", "cost"]].max(axis=1))
+    >>> add_scatter_to_heat_map(data, "Some risks on a heat map")
+    """
+    size = high - low + 1
+    probability_index = _get_score_index(probability, low, high, "probability")
+    impact_index = _get_score_index(impact, low, high, "impact")
+    if len(probability_index) != len(impact_index):
+        raise ValueError("`probability` and `impact` must have the same length.")
+    counts = np.bincount(probability_index * size + impact_index, minlength=size * size)
+    cells = np.flatnonzero(counts)
+    return HeatMapData(
+        probability=low + cells // size,
+        impact=low + cells % size,
+        counts=counts[cells],
+    )
+
+
+def get_score_centroid(data: HeatMapData) -> tuple[float, float]:
+    """
+    Calculate the mean probability and impact scores of a heat map, weighted by counts.
+
+    Parameters
+    ----------
+    data : HeatMapData
+        The counted cells, e.g. from `get_heat_map_data()`.
+
+    Returns
+    -------
+    tuple of float
+        The mean probability score and the mean impact score.
+
+    Raises
+    ------
+    ValueError
+        If the heat map holds no risks.
+    """
+    counts = np.asarray(data.counts)
+    total = counts.sum()
+    if total == 0:
+        raise ValueError("The heat map holds no risks.")
+    return (
+        float(np.dot(data.probability, counts) / total),
+        float(np.dot(data.impact, counts) / total),
+    )
@@ -0,0 +1,272 @@
+import numpy as np
+
+from darpi.config import (
+    ANALYTIC_GRID_SIZE,
+    RISK_BLOCK_SIZE,
+    CDFData,
+    HistogramData,
+    PPFData,
+    RiskRegister,
+)
+from darpi.quantitative.probability import get_p_value, get_triangular_cdf
+from darpi.quantitative.register import get_register_subset, get_risk_register
+
+
+class AnalyticDistribution:
+    """
+    Distribution of the total cost of a register, as probabilities on an evenly spaced grid.
+
+    It provides the same queries as `SimulationResult`, so it can be used with
+    `get_non_exceedance_table()` and the plots in place of simulated totals.
+
+    Parameters
+    ----------
+    pmf : np.ndarray
+        The probability of each grid point. Point `0` is a total of zero; the probability of
+        point `k > 0` is spread evenly over `[(k - 0.5) * step, (k + 0.5) * step]`.
+    step : float
+        The spacing of the grid.
+    minimum : float
+        The smallest non-zero total that can occur.
+    maximum : float
+        The largest total that can occur.
+    """
+
+    def __init__(self, pmf: np.ndarray, step: float, minimum: float, maximum: float):
+        self.pmf = pmf
+        self.step = step
+        self.minimum = minimum
+        self.maximum = maximum
+        self.cost = np.arange(len(pmf)) * step
+        # Corners of the piecewise linear CDF: the atom at zero, then the upper edge of each cell
+        self._edges = np.concatenate([[0], (np.arange(len(pmf)) + 0.5) * step])
+        self._edges[1:] = np.clip(self._edges[1:], 0, maximum)
+        self._edge_probabilities = np.concatenate([[pmf[0]], np.cumsum(pmf)])
+
+    def get_empirical_cdf(self) -> CDFData:
+        """
+        Calculate the cumulative distribution function at every grid point with a probability.
+
+        Returns
+        -------
+        CDFData
+            An object containing the grid costs and corresponding cumulative probabilities.
+        """
+        occupied = self.pmf > 0
+        occupied[0] = False
+        return CDFData(cost=self.cost[occupied], p=np.cumsum(self.pmf)[occupied])
+
+    def get_empirical_ppf(self) -> PPFData:
+        """
+        Calculate the percent-point function (PPF) at every percentile.
+
+        Returns
+        -------
+        PPFData
+            An object containing the cost values at each percentile and the corresponding
+            percentiles, laid out as by `get_empirical_ppf()`.
+        """
+        p_values = np.linspace(start=0, stop=1, num=101)
+        cost = self.get_costs(p_values)
+        cost[-1] = self.maximum
+
+        # Add the `1-risk_probability` value to the array as the lower bound
+        lower_limit_index = len(cost[cost == 0]) - 1
+        if lower_limit_index >= 0:
+            cost[lower_limit_index] = self.minimum
+
+        return PPFData(cost=cost, p=p_values)
+
+    def get_histogram_data(self, num_bins: int = 40) -> HistogramData:
+        """
+        Calculate histogram data, excluding the probability of a zero total.
+
+        Parameters
+        ----------
+        num_bins : int, optional
+            The number of bins, by default 40, spanning the non-zero totals as in
+            `get_histogram_data()`.
+
+        Returns
+        -------
+        HistogramData
+            An object containing the histogram bin edges and the probability of each bin.
+        """
+        hist, bin_edges = np.histogram(
+            np.clip(self.cost[1:], self.minimum, self.maximum),
+            bins=num_bins,
+            range=(self.minimum, self.maximum),
+            weights=self.pmf[1:],
+        )
+        return HistogramData(cost=bin_edges, frequency=hist)
+
+    def get_p_value(self, p_value: float) -> float:
+        """
+        Retrieve the cost associated with a specific non-exceedance probability (p-value).
+
+        Parameters
+        ----------
+        p_value : float
+            The non-exceedance probability, see `get_p_value()`.
+
+        Returns
+        -------
+        float
+            The cost value corresponding to the specified p-value, rounded to two decimal places.
+        """
+        return get_p_value(self, p_value)
+
+    def get_costs(self, p_values: np.ndarray | float) -> np.ndarray:
+        """
+        Retrieve the costs at any number of non-exceedance probabilities.
+
+        Parameters
+        ----------
+        p_values : np.ndarray or float
+            The non-exceedance probabilities, between `0` and `1`.
+
+        Returns
+        -------
+        np.ndarray
+            The cost at each of `p_values`, interpolated within grid cells.
+        """
+        cost = np.interp(p_values, self._edge_probabilities[1:], self._edges[1:])
+        cost = np.clip(cost, self.minimum, self.maximum)
+        return np.where(np.asarray(p_values) <= self.pmf[0], 0.0, cost)
+
+    def get_non_exceedance_probabilities(self, costs: np.ndarray | float) -> np.ndarray:
+        """
+        Retrieve the probability that each of any number of costs is not exceeded.
+
+        Parameters
+        ----------
+        costs : np.ndarray or float
+            The costs to evaluate.
+
+        Returns
+        -------
+        np.ndarray
+            The non-exceedance probability of each of `costs`, interpolated within grid cells.
+        """
+        return np.interp(costs, self._edges, self._edge_probabilities, left=0.0)
+
+
+def get_risk_pmfs(register: RiskRegister, step: float, length: int) -> np.ndarray:
+    """
+    Discretize each risk of a register onto a common grid of costs.
+
+    Parameters
+    ----------
+    register : RiskRegister
+        The risks to discretize.
+    step : float
+        The spacing of the grid.
+    length : int
+        The number of grid points in each row of the result.
+
+    Returns
+    -------
+    np.ndarray
+        The probability of each risk at each grid point, of shape `(number of risks, length)`.
+        A risk that does not occur costs zero; otherwise grid point `k` gets the probability of
+        the triangular distribution between `(k - 0.5) * step` and `(k + 0.5) * step`.
+
+    Raises
+    ------
+    ValueError
+        If any cost is negative, as the grid starts at zero.
+    """
+    if (register.minimum < 0).any():
+        raise ValueError("Negative costs are not supported by the analytic distribution.")
+    first = np.floor(register.minimum / step + 0.5).astype(np.int64)
+    last = np.floor(register.maximum / step + 0.5).astype(np.int64)
+    offsets = np.arange((last - first).max() + 1)
+    index = first[:, None] + offsets
+    edges = (index - 0.5) * step
+    cdf = get_triangular_cdf(
+        np.concatenate([edges, edges[:, -1:] + step], axis=1),
+        register.minimum[:, None],
+        register.mode[:, None],
+        register.maximum[:, None],
+    )
+
+    pmfs = np.zeros((len(register.names), length))
+    rows = np.arange(len(register.names))[:, None]
+    pmfs[rows, index] = np.diff(cdf, axis=1) * register.probability[:, None]
+    pmfs[:, 0] += 1 - register.probability
+    return pmfs
+
+
+def get_analytic_distribution(
+    risks: dict[str, dict[str, tuple[int, int, int] | float]] | RiskRegister,
+    grid_size: int = ANALYTIC_GRID_SIZE,
+) -> AnalyticDistribution:
+    """
+    Calculate the distribution of the total cost of independent risks without sampling.
+
+    Every risk is discretized onto a common grid of costs and the distributions are convolved
+    with FFTs, so the result is deterministic and has no sampling noise.
+
+    Parameters
+    ----------
+    risks : dict of str to dict of str to tuple or float, or RiskRegister
+        The risks, structured as for `get_aggregate_data()`.
+    grid_size : int, optional
+        The number of grid steps between zero and the largest possible total, by default
+        `ANALYTIC_GRID_SIZE`. Costs are resolved to within one step.
+
+    Returns
+    -------
+    AnalyticDistribution
+        The distribution of the total cost, which provides the PPF, CDF, histogram and p-values.
+
+    Raises
+    ------
+    ValueError
+        If any cost is negative, see `get_risk_pmfs()`. Registers with savings (negative
+        costs) must be simulated, e.g. with `get_simulation_result()`.
+
+    Notes
+    -----
+    The risks must be independent; correlation between risks is not supported. The time taken
+    grows with the number of risks times `grid_size * log(grid_size)`, and not with the
+    precision of the tail, so it is much faster than simulation for large registers at
+    high precision. Totals whose probability cannot be told apart from rounding error are
+    dropped, so the range of the distribution is the range that can realistically occur.
+
+    Example
+    -------
+    >>> distribution = get_analytic_distribution(risks)
+    >>> distribution.get_p_value(0.9)
+    >>> get_non_exceedance_table(distribution)
+    """
+    from scipy import fft
+
+    register = get_risk_register(risks)
+    occurs = register.probability > 0
+    maximum = float(register.maximum[occurs].sum())
+    certain = register.probability >= 1
+    minimum = float(register.minimum[certain].sum())
+    if minimum == 0 and (occurs & ~certain).any():
+        minimum = float(register.minimum[occurs & ~certain].min())
+
+    step = maximum / grid_size if maximum > 0 else 1.0
+    last = np.floor(register.maximum / step + 0.5).astype(np.int64)
+    support = int(last.sum()) + 1
+    length = fft.next_fast_len(support + int(last.max() + 1), real=True)
+
+    spectrum = np.ones(length // 2 + 1, dtype=complex)
+    for start in range(0, len(register.names), RISK_BLOCK_SIZE):
+        block = get_register_subset(register, slice(start, start + RISK_BLOCK_SIZE))
+        spectrum *= fft.rfft(get_risk_pmfs(block, step, length), axis=1).prod(axis=0)
+
+    pmf = np.clip(fft.irfft(spectrum, n=length)[:support], 0, None)
+    # Round-off of the FFTs is bounded by about `eps * length` of the largest probability
+    significant = np.flatnonzero(pmf > np.finfo(float).eps * length * pmf.max())
+    pmf = pmf[: significant[-1] + 1]
+    pmf /= pmf.sum()
+    maximum = min(maximum, (significant[-1] + 0.5) * step)
+    if significant[-1] > 0:
+        first = significant[significant > 0][0]
+        minimum = max(minimum, (first - 0.5) * step)
+    return AnalyticDistribution(pmf, step=step, minimum=minimum, maximum=maximum)
@@ -0,0 +1,213 @@
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from darpi.config import CACHE_MAX_BYTES, ITERATIONS, RiskRegister
+from darpi.quantitative.probability import (
+    get_sample_matrix,
+    get_seed_sequence,
+    get_stream_key,
+)
+from darpi.quantitative.register import get_register_subset
+
+
+def get_sample_key(
+    minimum: float,
+    mode: float,
+    maximum: float,
+    probability: float,
+    iterations: int,
+    seed: np.random.SeedSequence,
+    name: str,
+) -> str:
+    """
+    Get the key that identifies the samples of a risk.
+
+    Parameters
+    ----------
+    minimum : float
+        The minimum cost of the risk.
+    mode : float
+        The mode of the cost of the risk.
+    maximum : float
+        The maximum cost of the risk.
+    probability : float
+        The probability that the risk occurs.
+    iterations : int
+        The number of samples.
+    seed : np.random.SeedSequence
+        The root seed of the simulation.
+    name : str
+        The name of the risk, which selects its random stream, see `get_stream_key()`.
+
+    Returns
+    -------
+    str
+        A hexadecimal digest of everything the samples depend on.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.asarray([minimum, mode, maximum, probability], dtype=np.float64).tobytes())
+    digest.update(
+        repr((iterations, seed.entropy, seed.spawn_key, get_stream_key(name))).encode()
+    )
+    return digest.hexdigest()
+
+
+class SampleCache:
+    """
+    Least-recently-used cache of per-risk samples, bounded in bytes, with an optional disk store.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        The most memory the cached samples may use, by default `CACHE_MAX_BYTES`. The least
+        recently used samples are evicted first.
+    directory : str, Path or None, optional
+        A directory where samples are also saved as `.npy` files, by default `None` (memory
+        only). Samples that are not in memory are memory-mapped from it, so the store can be
+        shared by later runs and other registers.
+
+    Attributes
+    ----------
+    hits : int
+        The number of samples found in the cache.
+    misses : int
+        The number of samples that were not.
+    """
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES, directory: str | Path | None = None):
+        self.max_bytes = max_bytes
+        self.directory = None if directory is None else Path(directory)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get_path(self, key: str) -> Path:
+        return self.directory / f"{key}.npy"
+
+    def get(self, key: str) -> np.ndarray | None:
+        """
+        Retrieve samples from the cache.
+
+        Parameters
+        ----------
+        key : str
+            The key of the samples, see `get_sample_key()`.
+
+        Returns
+        -------
+        np.ndarray or None
+            The samples, read-only, or `None` if they are not cached.
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        if self.directory is not None and self._get_path(key).exists():
+            self.hits += 1
+            samples = np.load(self._get_path(key), mmap_mode="r")
+            self._add(key, samples)
+            return samples
+        self.misses += 1
+        return None
+
+    def put(self, key: str, samples: np.ndarray) -> None:
+        """
+        Add samples to the cache, and to the disk store if there is one.
+
+        Parameters
+        ----------
+        key : str
+            The key of the samples, see `get_sample_key()`.
+        samples : np.ndarray
+            The samples.
+        """
+        if self.directory is not None:
+            np.save(self._get_path(key), samples)
+        samples = samples.copy()
+        samples.flags.writeable = False
+        self._add(key, samples)
+
+    def _add(self, key: str, samples: np.ndarray) -> None:
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key).nbytes
+        if samples.nbytes > self.max_bytes:
+            return
+        self._entries[key] = samples
+        self.nbytes += samples.nbytes
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        """
+        Remove all samples from memory. The disk store, if any, is kept.
+        """
+        self._entries.clear()
+        self.nbytes = 0
+
+
+def get_cached_sample_matrix(
+    register: RiskRegister,
+    cache: SampleCache,
+    iterations: int = ITERATIONS,
+    seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+) -> np.ndarray:
+    """
+    Generate samples for every risk in a register, reusing the samples of unchanged risks.
+
+    Parameters
+    ----------
+    register : RiskRegister
+        The risks to sample.
+    cache : SampleCache
+        The cache to read from and add new samples to.
+    iterations : int, optional
+        The number of samples to draw for each risk, by default `ITERATIONS`.
+    seed : int, SeedSequence, Generator or None, optional
+        The seed of the simulation, see `get_seed_sequence()`. Samples drawn with fresh entropy
+        (`None`) could never be found again, so they are neither looked up nor added to `cache`.
+
+    Returns
+    -------
+    np.ndarray
+        The samples, identical to `get_sample_matrix()` with the same seed. Only the risks that
+        are not in `cache` are sampled.
+
+    Example
+    -------
+    >>> cache = SampleCache(directory="samples")
+    >>> samples = get_cached_sample_matrix(register, cache, seed=42)
+    >>> revised = get_cached_sample_matrix(revised_register, cache, seed=42)
+    """
+    if seed is None:
+        return get_sample_matrix(register, iterations, seed)
+    seed = get_seed_sequence(seed)
+    keys = [
+        get_sample_key(*parameters, iterations, seed, name)
+        for name, *parameters in zip(*register)
+    ]
+    samples = np.empty((len(keys), iterations))
+    missing = []
+    for index, key in enumerate(keys):
+        cached = cache.get(key)
+        if cached is None:
+            missing.append(index)
+        else:
+            samples[index] = cached
+
+    if missing:
+        samples[missing] = get_sample_matrix(
+            get_register_subset(register, missing), iterations, seed
+        )
+        for index in missing:
+            cache.put(keys[index], samples[index])
+    return samples
@@ -0,0 +1,140 @@
+import numpy as np
+
+from darpi.config import (
+    CONVERGENCE_BATCH_SIZE,
+    ITERATIONS,
+    ConvergenceData,
+    RiskRegister,
+)
+from darpi.quantitative.correlation import get_correlation_groups
+from darpi.quantitative.probability import (
+    get_costs,
+    get_register_totals,
+    get_seed_sequence,
+)
+from darpi.quantitative.register import get_risk_register
+from darpi.quantitative.results import SimulationResult
+
+
+def get_batch_means_error(batch_costs: np.ndarray) -> np.ndarray:
+    """
+    Estimate the standard error of percentiles from their estimates in independent batches.
+
+    Parameters
+    ----------
+    batch_costs : np.ndarray
+        The percentile estimates of each batch, of shape `(number of batches, number of
+        percentiles)`.
+
+    Returns
+    -------
+    np.ndarray
+        The standard error of each percentile, for all batches taken together.
+    """
+    return batch_costs.std(axis=0, ddof=1) / np.sqrt(len(batch_costs))
+
+
+def get_converged_result(
+    risks: dict[str, dict[str, tuple[int, int, int] | float]] | RiskRegister,
+    p_values: np.ndarray | tuple[float, ...] = (0.5, 0.8, 0.9),
+    tolerance: float = 0.005,
+    seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+    batch_size: int = CONVERGENCE_BATCH_SIZE,
+    min_batches: int = 8,
+    max_iterations: int = 100 * ITERATIONS,
+    correlation: dict[str, dict] | np.ndarray | None = None,
+    correlation_method: str = "copula",
+) -> tuple[SimulationResult, ConvergenceData]:
+    """
+    Simulate a register in batches until the requested percentiles are precise enough.
+
+    Parameters
+    ----------
+    risks : dict of str to dict of str to tuple or float, or RiskRegister
+        The risks to simulate, structured as for `get_aggregate_data()`.
+    p_values : np.ndarray or tuple of float, optional
+        The non-exceedance probabilities that must converge, by default P50, P80 and P90.
+    tolerance : float, optional
+        The largest acceptable standard error, relative to the cost at each of `p_values`, by
+        default 0.005 (0.5%).
+    seed : int, SeedSequence, Generator or None, optional
+        The seed of the simulation, see `get_seed_sequence()`.
+    batch_size : int, optional
+        The number of iterations in each batch, by default `CONVERGENCE_BATCH_SIZE`.
+    min_batches : int, optional
+        The number of batches simulated before convergence is first checked, by default 8.
+    max_iterations : int, optional
+        The most iterations simulated, by default `100 * ITERATIONS`. The simulation stops after
+        the last whole batch within it even if it has not converged. It must allow at least
+        `min_batches` batches.
+    correlation : dict, np.ndarray or None, optional
+        The rank correlation between risks, see `get_correlation_groups()`, by default `None`
+        (independent risks).
+    correlation_method : str, optional
+        How correlation is induced, see `get_correlated_uniforms()`, by default "copula".
+
+    Returns
+    -------
+    tuple of SimulationResult and ConvergenceData
+        The result of all simulated iterations, and the cost, standard error and number of
+        iterations at which each of `p_values` was reached. The cost is the percentile of all
+        iterations pooled together, as from `result.get_costs()`, while the standard error is
+        the batch-means estimate used to stop.
+
+    Raises
+    ------
+    ValueError
+        If `min_batches` is less than 2, or `min_batches * batch_size` is more than
+        `max_iterations`.
+
+    Notes
+    -----
+    The standard error is estimated with batch means: every batch gives an independent estimate
+    of each percentile, and the spread of those estimates shrinks with the square root of the
+    number of batches. Batch `k` covers iterations `[k * batch_size, (k + 1) * batch_size)`, so
+    the totals are identical to `get_simulation_result()` with the same seed and the number of
+    iterations that was reached. Convergence is checked on the mean of the batch estimates,
+    but the reported cost pools all iterations, which avoids the small-sample bias of
+    percentiles estimated within each batch; the batch-means standard error is a slightly
+    conservative estimate of the error of the pooled percentile.
+
+    Example
+    -------
+    >>> result, convergence = get_converged_result(risks, tolerance=0.001, seed=42)
+    >>> convergence.iterations, convergence.standard_error
+    """
+    if min_batches < 2:
+        raise ValueError("`min_batches` must be at least 2.")
+    if min_batches * batch_size > max_iterations:
+        raise ValueError("`max_iterations` must allow at least `min_batches` batches.")
+    register = get_risk_register(risks)
+    seed = get_seed_sequence(seed)
+    groups = get_correlation_groups(register, correlation)
+    p_values = np.asarray(p_values, dtype=float)
+    max_batches = max_iterations // batch_size
+
+    batches = []
+    batch_costs = np.empty((max_batches, len(p_values)))
+    converged = False
+    for index in range(max_batches):
+        totals = get_register_totals(
+            register, batch_size, seed, index * batch_size, groups, correlation_method
+        )
+        batches.append(totals)
+        batch_costs[index] = get_costs(totals, p_values)
+        if index + 1 < min_batches:
+            continue
+        standard_error = get_batch_means_error(batch_costs[: index + 1])
+        cost = batch_costs[: index + 1].mean(axis=0)
+        if (standard_error <= tolerance * np.abs(cost)).all():
+            converged = True
+            break
+
+    result = SimulationResult(np.concatenate(batches), register=register, seed=seed)
+    return result, ConvergenceData(
+        p_values=p_values,
+        cost=result.get_costs(p_values),
+        standard_error=standard_error,
+        iterations=result.iterations,
+        converged=converged,
+    )
@@ -0,0 +1,150 @@
+import numpy as np
+
+from darpi.config import RiskRegister
+
+CORRELATION_METHODS = ("copula", "iman-conover")
+
+
+def get_correlation_groups(
+    register: RiskRegister,
+    correlation: dict[str, dict] | np.ndarray | list[tuple[np.ndarray, np.ndarray]] | None,
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """
+    Resolve a correlation specification into groups of correlated risks.
+
+    Parameters
+    ----------
+    register : RiskRegister
+        The register the specification refers to.
+    correlation : dict, np.ndarray, list or None
+        The rank correlation between risks, as one of:
+        - A dictionary of groups, where the keys are group names (str) and the values are
+          dictionaries containing "risks", a list of risk names, and "correlation", either a
+          single rank correlation shared by every pair of risks in the group or a matrix.
+        - A rank correlation matrix covering every risk of `register`, in its order.
+        - A list of groups as returned by this function, which is returned unchanged.
+        - `None`, for independent risks.
+
+    Returns
+    -------
+    list of tuple of np.ndarray
+        One `(names, correlation matrix)` pair for each group of correlated risks.
+
+    Raises
+    ------
+    ValueError
+        If a risk is unknown or in more than one group, a matrix is not a valid correlation
+        matrix, or a full matrix does not match the size of `register`.
+
+    Example
+    -------
+    >>> correlation = {
+    >>>     "Ground conditions": {"risks": ["Risk 1", "Risk 3"], "correlation": 0.6},
+    >>>     "Weather": {"risks": ["Risk 2", "Risk 4", "Risk 5"], "correlation": 0.4},
+    >>> }
+    >>> get_aggregate_data(risks, seed=42, correlation=correlation)
+    """
+    if correlation is None:
+        return []
+    if isinstance(correlation, list):
+        return correlation
+    if isinstance(correlation, np.ndarray):
+        if correlation.shape != (len(register.names),) * 2:
+            raise ValueError(
+                f"The correlation matrix must be of shape {(len(register.names),) * 2}, "
+                "one row and column for each risk in the register."
+            )
+        off_diagonal = correlation - np.diag(np.diag(correlation))
+        correlated = (off_diagonal != 0).any(axis=1)
+        groups = [
+            (
+                np.asarray(register.names)[correlated],
+                correlation[np.ix_(correlated, correlated)],
+            )
+        ]
+    else:
+        groups = []
+        for group in correlation.values():
+            names = np.asarray(group["risks"], dtype=object)
+            matrix = np.asarray(group["correlation"], dtype=float)
+            if matrix.ndim == 0:
+                matrix = np.full((len(names), len(names)), float(matrix))
+                np.fill_diagonal(matrix, 1)
+            groups.append((names, matrix))
+
+    known = set(register.names)
+    grouped = set()
+    for names, matrix in groups:
+        unknown = set(names) - known
+        if unknown:
+            raise ValueError(f"Unknown risks in correlation: {', '.join(map(str, unknown))}.")
+        if grouped & set(names):
+            raise ValueError("A risk can only be in one correlation group.")
+        grouped |= set(names)
+        if matrix.shape != (len(names), len(names)):
+            raise ValueError("Each correlation matrix must have one row per risk.")
+        if not (
+            np.allclose(matrix, matrix.T)
+            and np.allclose(np.diag(matrix), 1)
+            and (np.abs(matrix) <= 1).all()
+        ):
+            raise ValueError(
+                "Correlation matrices must be symmetric with ones on the diagonal."
+            )
+    return [(names, matrix) for names, matrix in groups if len(names) > 1]
+
+
+def get_correlated_uniforms(
+    uniforms: np.ndarray, correlation: np.ndarray, method: str = "copula"
+) -> np.ndarray:
+    """
+    Induce a rank correlation between rows of independent uniform draws.
+
+    Parameters
+    ----------
+    uniforms : np.ndarray
+        Independent uniform draws of shape `(number of risks, iterations)`.
+    correlation : np.ndarray
+        The target rank (Spearman) correlation matrix between the rows.
+    method : str, optional
+        Either "copula" (the default) or "iman-conover".
+
+    Returns
+    -------
+    np.ndarray
+        Uniform draws of the same shape with the requested rank correlation.
+
+    Raises
+    ------
+    ValueError
+        If `method` is unknown or `correlation` is not positive definite.
+
+    Notes
+    -----
+    Both methods turn the draws into normal scores and mix them with the Cholesky factor of the
+    normal correlation that gives the requested rank correlation, `2 * sin(pi * rho / 6)`.
+    - "copula" maps the mixed scores straight back to uniforms. Each iteration only depends on
+      its own draws, so results do not depend on how iterations are chunked.
+    - "iman-conover" reorders the original draws of each row to follow the ranks of the mixed
+      scores, after removing the sample correlation of the scores. The marginal draws are kept
+      exactly and the rank correlation is closer to the target, but the result depends on every
+      iteration in `uniforms`.
+    """
+    from scipy import linalg, special
+
+    if method not in CORRELATION_METHODS:
+        raise ValueError(f"`method` must be one of {', '.join(CORRELATION_METHODS)}.")
+    normal_correlation = 2 * np.sin(np.pi * correlation / 6)
+    try:
+        factor = linalg.cholesky(normal_correlation, lower=True)
+    except linalg.LinAlgError:
+        raise ValueError("The correlation matrix must be positive definite.")
+    clipped = np.clip(uniforms, np.finfo(float).tiny, np.nextafter(1, 0))
+    scores = special.ndtri(clipped)
+    if method == "copula":
+        return special.ndtr(factor @ scores)
+
+    sample_factor = linalg.cholesky(np.corrcoef(scores), lower=True)
+    scores = factor @ linalg.solve_triangular(sample_factor, scores, lower=True)
+    ranks = np.argsort(np.argsort(scores, axis=1), axis=1)
+    return np.take_along_axis(np.sort(uniforms, axis=1), ranks, axis=1)
@@ -0,0 +1,408 @@
+import numpy as np
+
+from darpi.config import ITERATIONS, RISK_BLOCK_SIZE, DistributionGroup, RiskRegister
+from darpi.quantitative.instrumentation import set_nbytes, stage
+from darpi.quantitative.probability import (
+    get_risk_generators,
+    get_sample_matrix,
+    get_seed_sequence,
+    sum_sample_matrix,
+)
+
+# The standard normal quantile at 0.9, which sets a lognormal from its P10 and P90
+LOGNORMAL_Z90 = 1.2815515655446004
+
+DISTRIBUTION_COSTS = {
+    "triangular": "(minimum, mode, maximum)",
+    "pert": "(minimum, mode, maximum)",
+    "uniform": "(minimum, maximum)",
+    "lognormal": "(P10, P90)",
+    "discrete": "a sequence of possible costs",
+}
+
+
+def get_pert_ppf(
+    q: np.ndarray, minimum: np.ndarray, mode: np.ndarray, maximum: np.ndarray
+) -> np.ndarray:
+    """
+    Evaluate the inverse CDF of PERT distributions, element-wise.
+
+    Parameters
+    ----------
+    q : np.ndarray
+        Non-exceedance probabilities, between `0` and `1`.
+    minimum : np.ndarray
+        The lower bound of each distribution.
+    mode : np.ndarray
+        The most likely value of each distribution.
+    maximum : np.ndarray
+        The upper bound of each distribution.
+
+    Returns
+    -------
+    np.ndarray
+        The costs at `q`, broadcast over all the inputs.
+
+    Notes
+    -----
+    A PERT distribution is a beta distribution on `[minimum, maximum]` with shape parameters
+    `1 + 4 (mode - minimum) / width` and `1 + 4 (maximum - mode) / width`, where `width` is
+    `maximum - minimum`, so its mean is `(minimum + 4 mode + maximum) / 6`. It is inverted with
+    `scipy.special.betaincinv`, which makes PERT the slowest family to sample, several times
+    slower per sample than the closed forms of the other families. A distribution with
+    `minimum == maximum` is a constant.
+    """
+    from scipy.special import betaincinv
+
+    minimum, mode, maximum = (
+        np.asarray(value, dtype=float) for value in (minimum, mode, maximum)
+    )
+    width = maximum - minimum
+    with np.errstate(divide="ignore", invalid="ignore"):
+        alpha = 1 + 4 * (mode - minimum) / width
+        beta = 1 + 4 * (maximum - mode) / width
+        cost = minimum + width * betaincinv(alpha, beta, q)
+    return np.where(width == 0, minimum, cost)
+
+
+def get_uniform_ppf(
+    q: np.ndarray, minimum: np.ndarray, maximum: np.ndarray
+) -> np.ndarray:
+    """
+    Evaluate the inverse CDF of uniform distributions, element-wise.
+
+    Parameters
+    ----------
+    q : np.ndarray
+        Non-exceedance probabilities, between `0` and `1`.
+    minimum : np.ndarray
+        The lower bound of each distribution.
+    maximum : np.ndarray
+        The upper bound of each distribution.
+
+    Returns
+    -------
+    np.ndarray
+        The costs at `q`, broadcast over all the inputs.
+    """
+    return minimum + q * (maximum - minimum)
+
+
+def get_lognormal_ppf(q: np.ndarray, p10: np.ndarray, p90: np.ndarray) -> np.ndarray:
+    """
+    Evaluate the inverse CDF of lognormal distributions given by their P10 and P90, element-wise.
+
+    Parameters
+    ----------
+    q : np.ndarray
+        Non-exceedance probabilities, between `0` and `1`.
+    p10 : np.ndarray
+        The cost that each distribution does not exceed with probability `0.1`, above `0`.
+    p90 : np.ndarray
+        The cost that each distribution does not exceed with probability `0.9`, above `p10`.
+
+    Returns
+    -------
+    np.ndarray
+        The costs at `q`, broadcast over all the inputs.
+
+    Notes
+    -----
+    The logarithm of the cost is normal, with mean `(ln p10 + ln p90) / 2` and standard
+    deviation `(ln p90 - ln p10) / (2 z)`, where `z` is the standard normal P90. The
+    distribution is unbounded above, so its tail reaches well beyond `p90`.
+    """
+    from scipy.special import ndtri
+
+    log_p10, log_p90 = np.log(p10), np.log(p90)
+    mean = (log_p10 + log_p90) / 2
+    sigma = (log_p90 - log_p10) / (2 * LOGNORMAL_Z90)
+    return np.exp(mean + sigma * ndtri(q))
+
+
+def get_discrete_ppf(
+    q: np.ndarray, costs: np.ndarray, weights: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Evaluate the inverse CDF of a discrete distribution over a list of costs.
+
+    Parameters
+    ----------
+    q : np.ndarray
+        Non-exceedance probabilities, between `0` and `1`.
+    costs : np.ndarray
+        The possible costs.
+    weights : np.ndarray or None, optional
+        The relative likelihood of each cost, by default `None` (equally likely).
+
+    Returns
+    -------
+    np.ndarray
+        The costs at `q`, each one of `costs`.
+
+    Notes
+    -----
+    `q` is split into consecutive intervals with lengths proportional to `weights`, one per
+    cost in the order given, and each value is located with a binary search.
+    """
+    costs = np.asarray(costs, dtype=float)
+    weights = np.ones(len(costs)) if weights is None else np.asarray(weights, dtype=float)
+    cumulative = np.cumsum(weights[:-1]) / weights.sum()
+    return costs[np.searchsorted(cumulative, q, side="right")]
+
+
+def _get_risk_errors(details: dict) -> str | None:
+    missing = [field for field in ("costs", "probability") if field not in details]
+    if missing:
+        return f"Missing {' and '.join(f'`{field}`' for field in missing)}."
+    family = details.get("distribution", "triangular")
+    if family not in DISTRIBUTION_COSTS:
+        return f"Unknown distribution: {family}."
+    try:
+        costs = np.asarray(details["costs"], dtype=float)
+    except (TypeError, ValueError):
+        return "All costs must be numbers."
+    shapes = {"triangular": (3,), "pert": (3,), "uniform": (2,), "lognormal": (2,)}
+    if family in shapes and costs.shape != shapes[family]:
+        return f"`costs` must be {DISTRIBUTION_COSTS[family]}."
+    if family == "discrete" and (costs.ndim != 1 or len(costs) == 0):
+        return f"`costs` must be {DISTRIBUTION_COSTS[family]}."
+    if not np.isfinite(costs).all():
+        return "All costs must be numbers."
+    if family in ("triangular", "pert") and not costs[0] <= costs[1] <= costs[2]:
+        return "The mode must be between the minimum and maximum."
+    if family == "uniform" and not costs[0] <= costs[1]:
+        return "The minimum must not be above the maximum."
+    if family == "lognormal" and not 0 < costs[0] < costs[1]:
+        return "The P10 must be above `0` and below the P90."
+    if family == "discrete" and "weights" in details:
+        weights = np.asarray(details["weights"], dtype=float)
+        if weights.shape != costs.shape:
+            return "`weights` must have one value per cost."
+        if not (np.isfinite(weights).all() and (weights >= 0).all() and weights.sum() > 0):
+            return "`weights` must be non-negative with a positive sum."
+    probability = details["probability"]
+    if not isinstance(probability, (int, float, np.number)) or not 0 <= probability <= 1:
+        return "`probability` must be between `0` and `1`."
+    return None
+
+
+def get_distribution_groups(
+    risks: dict[str, dict],
+) -> dict[str, DistributionGroup]:
+    """
+    Group the risks of a register by distribution family.
+
+    Parameters
+    ----------
+    risks : dict of str to dict
+        A dictionary where the keys are risk names and the values are dictionaries containing:
+        - "distribution": One of "triangular" (the default), "pert", "uniform", "lognormal"
+          or "discrete".
+        - "costs": The parameters of the distribution: `(minimum, mode, maximum)` for
+          "triangular" and "pert", `(minimum, maximum)` for "uniform", `(P10, P90)` for
+          "lognormal" and the possible costs for "discrete".
+        - "weights": For "discrete" only, the relative likelihood of each cost, by default
+          equally likely.
+        - "probability": The probability of the risk occurring.
+
+    Returns
+    -------
+    dict of str to DistributionGroup
+        One group for each family present, each containing:
+        - `family`: The name of the family.
+        - `rows`: The position of each risk of the group in `risks`.
+        - `names`: The names of the risks.
+        - `parameters`: An array of shape `(number of risks, number of costs)`, or for
+          "discrete" a list of `(costs, weights)` pairs.
+        - `probability`: The probability of each risk.
+        Triangular risks are grouped as a `RiskRegister` in `parameters`.
+
+    Raises
+    ------
+    ValueError
+        If the register is empty or any risk is not valid. The message lists every problem by
+        row and risk name.
+    """
+    if len(risks) == 0:
+        raise ValueError("`risks` must contain at least one risk.")
+    errors = []
+    members = {}
+    for row, (name, details) in enumerate(risks.items()):
+        message = "The name is empty." if str(name) == "" else _get_risk_errors(details)
+        if message is not None:
+            errors.append(f"- row {row} ({name}): {message}")
+            continue
+        members.setdefault(details.get("distribution", "triangular"), []).append(row)
+    if errors:
+        raise ValueError("The risk register is not valid:\n" + "\n".join(errors))
+
+    names = np.asarray(list(risks), dtype=object)
+    details = list(risks.values())
+    groups = {}
+    for family, rows in members.items():
+        probability = np.asarray([details[row]["probability"] for row in rows], dtype=float)
+        if family == "discrete":
+            parameters = [
+                (
+                    np.asarray(details[row]["costs"], dtype=float),
+                    details[row].get("weights"),
+                )
+                for row in rows
+            ]
+        else:
+            parameters = np.asarray([details[row]["costs"] for row in rows], dtype=float)
+        if family == "triangular":
+            parameters = RiskRegister(
+                names[rows], *parameters.T.copy(), probability=probability
+            )
+        groups[family] = DistributionGroup(
+            family=family,
+            rows=np.asarray(rows),
+            names=names[rows],
+            parameters=parameters,
+            probability=probability,
+        )
+    return groups
+
+
+def _get_group_samples(
+    group: DistributionGroup,
+    iterations: int,
+    seed: np.random.SeedSequence,
+    start: int,
+    dtype: np.dtype,
+) -> np.ndarray:
+    """
+    Sample the risks of a non-triangular group, `RISK_BLOCK_SIZE` risks at a time.
+    """
+    ppf = {"pert": get_pert_ppf, "uniform": get_uniform_ppf, "lognormal": get_lognormal_ppf}
+    generators = get_risk_generators(group.names, seed=seed, start=start)
+    samples = np.zeros((len(group.names), iterations), dtype=dtype)
+    uniforms = np.empty((min(RISK_BLOCK_SIZE, len(group.names)), iterations))
+    for block_start in range(0, len(group.names), RISK_BLOCK_SIZE):
+        block = slice(block_start, block_start + RISK_BLOCK_SIZE)
+        size = len(group.names[block])
+        for index in range(size):
+            generators[block_start + index].random(out=uniforms[index])
+        threshold = 1 - group.probability[block, np.newaxis]
+        risk, iteration = np.nonzero(uniforms[:size] >= threshold)
+        q = (uniforms[risk, iteration] - threshold[risk, 0]) / group.probability[block][risk]
+        if group.family == "discrete":
+            cost = np.empty(len(q))
+            bounds = np.searchsorted(risk, np.arange(size + 1))
+            for index, (costs, weights) in enumerate(group.parameters[block]):
+                occurred = slice(bounds[index], bounds[index + 1])
+                cost[occurred] = get_discrete_ppf(q[occurred], costs, weights)
+        else:
+            cost = ppf[group.family](q, *group.parameters[block][risk].T)
+        samples[block_start + risk, iteration] = cost
+    return samples
+
+
+def get_mixed_sample_matrix(
+    risks: dict[str, dict],
+    iterations: int = ITERATIONS,
+    seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+    start: int = 0,
+    dtype: np.dtype = np.float64,
+) -> np.ndarray:
+    """
+    Generate samples for every risk of a register that mixes distribution families.
+
+    Parameters
+    ----------
+    risks : dict of str to dict
+        The risks to sample, structured as for `get_distribution_groups()`.
+    iterations : int, optional
+        The number of samples to draw for each risk, by default `ITERATIONS`.
+    seed : int, SeedSequence, Generator or None, optional
+        The seed of the simulation, see `get_seed_sequence()`.
+    start : int, optional
+        The index of the first iteration to draw, by default `0`, see `get_sample_matrix()`.
+    dtype : np.dtype, optional
+        The floating point type of the samples, by default `np.float64`.
+
+    Returns
+    -------
+    np.ndarray
+        An array of shape `(number of risks, iterations)`, with one row per risk in the order
+        of `risks`.
+
+    Notes
+    -----
+    Risks are grouped by family with `get_distribution_groups()` and each group is sampled in
+    one pass. Triangular risks are sampled with `get_sample_matrix()`, so they draw exactly the
+    same samples as in a triangular-only register, at the same speed. For the other families,
+    the uniform draws of `RISK_BLOCK_SIZE` risks are taken from their own streams, as for
+    `get_sample_matrix()`, and the inverse CDF of the family is evaluated once for every
+    iteration where a risk of the block occurs. Discrete risks are inverted one risk at a time,
+    as their number of costs differs.
+
+    Example
+    -------
+    >>> risks = {
+    >>>     "Risk 1": {"costs": (1000, 2000, 5000), "probability": 1},
+    >>>     "Risk 2": {"distribution": "pert", "costs": (2000, 4000, 8000), "probability": 0.8},
+    >>>     "Risk 3": {"distribution": "lognormal", "costs": (1500, 9000), "probability": 0.3},
+    >>>     "Risk 4": {
+    >>>         "distribution": "discrete",
+    >>>         "costs": (5000, 20000),
+    >>>         "weights": (3, 1),
+    >>>         "probability": 0.1,
+    >>>     },
+    >>> }
+    >>> samples = get_mixed_sample_matrix(risks, seed=42)
+    """
+    groups = get_distribution_groups(risks)
+    seed = get_seed_sequence(seed)
+    if set(groups) == {"triangular"}:
+        return get_sample_matrix(
+            groups["triangular"].parameters, iterations, seed, start, dtype=dtype
+        )
+
+    with stage(
+        "get_mixed_sample_matrix", iterations=iterations, risks=len(risks)
+    ) as timer:
+        samples = np.empty((len(risks), iterations), dtype=dtype)
+        for family, group in groups.items():
+            if family == "triangular":
+                samples[group.rows] = get_sample_matrix(
+                    group.parameters, iterations, seed, start, dtype=dtype
+                )
+            else:
+                samples[group.rows] = _get_group_samples(
+                    group, iterations, seed, start, dtype
+                )
+        set_nbytes(timer, samples.nbytes)
+    return samples
+
+
+def get_mixed_aggregate_data(
+    risks: dict[str, dict],
+    iterations: int = ITERATIONS,
+    seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+    dtype: np.dtype = np.float64,
+) -> np.ndarray:
+    """
+    Generate the total cost of a register that mixes distribution families.
+
+    Parameters
+    ----------
+    risks : dict of str to dict
+        The risks to simulate, structured as for `get_distribution_groups()`.
+    iterations : int, optional
+        The number of iterations, by default `ITERATIONS`.
+    seed : int, SeedSequence, Generator or None, optional
+        The seed of the simulation, see `get_seed_sequence()`.
+    dtype : np.dtype, optional
+        The floating point type of the result, by default `np.float64`.
+
+    Returns
+    -------
+    np.ndarray
+        The total cost at each iteration. For a register of triangular risks only, this is
+        identical to `get_aggregate_data()` with the same seed.
+    """
+    samples = get_mixed_sample_matrix(risks, iterations, seed, dtype=dtype)
+    return sum_sample_matrix(samples, list(risks)).astype(dtype, copy=False)
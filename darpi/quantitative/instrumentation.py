@@ -0,0 +1,244 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
+from darpi.config import StageRecord
+
+_PROFILE = ContextVar("darpi_profile", default=None)
+_DISABLED = nullcontext()
+
+
+class Profile:
+    """
+    Record of the stages of the simulations run while it is active, see `profile()`.
+
+    Parameters
+    ----------
+    callback : callable or None, optional
+        A function called with each `StageRecord` as soon as its stage ends, by default `None`.
+    trace_memory : bool, optional
+        Whether to measure the peak memory allocated by each stage with `tracemalloc`, by
+        default `False`. Tracing slows allocations down, so it is off unless asked for.
+
+    Attributes
+    ----------
+    records : list of StageRecord
+        The stages, in the order they ended. Each contains:
+        - `stage`: The name of the stage, e.g. "get_sample_matrix" or "get_samples.rvs".
+        - `seconds`: The wall time of the stage.
+        - `nbytes`: The size of the arrays produced by the stage.
+        - `peak_bytes`: The peak memory allocated during the stage, or `None` unless
+          `trace_memory` is `True`.
+        - `iterations`: The number of iterations processed, or `None`.
+        - `risks`: The number of risks processed, or `None`.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[StageRecord], None] | None = None,
+        trace_memory: bool = False,
+    ):
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.records = []
+        self._peaks = []
+
+    def add(self, record: StageRecord) -> None:
+        """
+        Add the record of a stage that has ended.
+
+        Parameters
+        ----------
+        record : StageRecord
+            The record to add.
+        """
+        self.records.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+    def as_dict(self) -> dict:
+        """
+        Export the profile as plain Python types.
+
+        Returns
+        -------
+        dict
+            A dictionary containing "stages", the list of records as dictionaries, and "totals",
+            the number of calls, seconds and bytes of each stage summed over its calls.
+        """
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record.stage, {"calls": 0, "seconds": 0.0, "nbytes": 0})
+            total["calls"] += 1
+            total["seconds"] += record.seconds
+            total["nbytes"] += record.nbytes or 0
+        return {"stages": [record._asdict() for record in self.records], "totals": totals}
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Export the profile as JSON.
+
+        Parameters
+        ----------
+        **kwargs
+            Passed to `json.dumps()`, e.g. `indent=2`.
+
+        Returns
+        -------
+        str
+            The JSON form of `as_dict()`.
+        """
+        return json.dumps(self.as_dict(), **kwargs)
+
+
+class _Stage:
+    """
+    Context manager timing one stage of the active profile.
+    """
+
+    def __init__(
+        self, profile: Profile, name: str, iterations: int | None, risks: int | None
+    ):
+        self.profile = profile
+        self.name = name
+        self.iterations = iterations
+        self.risks = risks
+        self.nbytes = None
+
+    def __enter__(self) -> "_Stage":
+        if self.profile.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.profile._peaks:
+                self.profile._peaks[-1] = max(self.profile._peaks[-1], peak)
+            self.profile._peaks.append(0)
+            self._start_memory = current
+            tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        seconds = time.perf_counter() - self._start
+        peak_bytes = None
+        if self.profile.trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self.profile._peaks.pop())
+            if self.profile._peaks:
+                self.profile._peaks[-1] = max(self.profile._peaks[-1], peak)
+            peak_bytes = peak - self._start_memory
+        self.profile.add(
+            StageRecord(
+                stage=self.name,
+                seconds=seconds,
+                nbytes=self.nbytes,
+                peak_bytes=peak_bytes,
+                iterations=self.iterations,
+                risks=self.risks,
+            )
+        )
+
+
+def stage(name: str, iterations: int | None = None, risks: int | None = None):
+    """
+    Time a stage of a simulation if a profile is active.
+
+    Parameters
+    ----------
+    name : str
+        The name of the stage.
+    iterations : int or None, optional
+        The number of iterations the stage processes, by default `None`.
+    risks : int or None, optional
+        The number of risks the stage processes, by default `None`.
+
+    Returns
+    -------
+    context manager
+        A context manager around the stage, which binds the timer of the stage, or `None`
+        without an active profile; pass it to `set_nbytes()` to record the size of what the
+        stage produced. Without an active profile, a shared no-op context manager is returned,
+        so disabled instrumentation costs a single context variable lookup.
+
+    Example
+    -------
+    >>> with stage("get_sample_matrix", iterations=iterations, risks=len(names)) as timer:
+    >>>     samples = ...
+    >>>     set_nbytes(timer, samples.nbytes)
+    """
+    profile = _PROFILE.get()
+    if profile is None:
+        return _DISABLED
+    return _Stage(profile, name, iterations, risks)
+
+
+def set_nbytes(timer: "_Stage | None", nbytes: int) -> None:
+    """
+    Record the size of what a stage produced, if the stage is being timed.
+
+    Parameters
+    ----------
+    timer : _Stage or None
+        The value bound by `with stage(...) as timer`, which is `None` when disabled.
+    nbytes : int
+        The size in bytes.
+    """
+    if timer is not None:
+        timer.nbytes = nbytes
+
+
+@contextmanager
+def profile(
+    callback: Callable[[StageRecord], None] | None = None, trace_memory: bool = False
+) -> Iterator[Profile]:
+    """
+    Record the stages of every simulation run inside the `with` block.
+
+    Parameters
+    ----------
+    callback : callable or None, optional
+        A function called with each `StageRecord` as soon as its stage ends, e.g. to forward
+        it to a monitoring system, by default `None`.
+    trace_memory : bool, optional
+        Whether to measure the peak memory of each stage, by default `False`, see `Profile`.
+
+    Yields
+    ------
+    Profile
+        The profile, which holds the records of all stages once the block ends.
+
+    Notes
+    -----
+    Instrumentation is off unless a profile is active. The stages recorded are:
+    - `get_sample_matrix()` as a whole, and separately its generator setup, including any Sobol
+      draws ("get_sample_matrix.generators"), the draws of correlated groups
+      ("get_sample_matrix.correlated", only if there are any), and the uniform draws
+      ("get_sample_matrix.uniforms") and inverse CDF ("get_sample_matrix.ppf") of each block of
+      `RISK_BLOCK_SIZE` risks.
+    - The draws and shuffle of `get_samples()`.
+    - The sums of `sum_samples()` and `sum_sample_matrix()`.
+    - The sorts of `get_empirical_cdf()`, `get_empirical_ppf()` and `SimulationResult`.
+    - `get_histogram_data()` and the building of figures.
+    Profiles apply to the current thread or asynchronous task only; worker processes of
+    `get_parallel_aggregate_data()` are not profiled.
+
+    Example
+    -------
+    >>> with profile() as run:
+    >>>     result = get_simulation_result(risks, seed=42)
+    >>>     table = get_non_exceedance_table(result)
+    >>> run.as_dict()["totals"]
+    >>> run.to_json(indent=2)
+    """
+    run = Profile(callback=callback, trace_memory=trace_memory)
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    token = _PROFILE.set(run)
+    try:
+        yield run
+    finally:
+        _PROFILE.reset(token)
+        if started_tracing:
+            tracemalloc.stop()
@@ -0,0 +1,113 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from darpi.config import CHUNK_SIZE, ITERATIONS, RiskRegister
+from darpi.quantitative.correlation import get_correlation_groups
+from darpi.quantitative.probability import get_register_totals, get_seed_sequence
+from darpi.quantitative.register import get_risk_register
+
+
+def _simulate_chunk(
+    shared_name: str,
+    iterations: int,
+    register: RiskRegister,
+    seed: np.random.SeedSequence,
+    start: int,
+    stop: int,
+    correlation: list[tuple[np.ndarray, np.ndarray]],
+    correlation_method: str,
+) -> None:
+    """
+    Write the totals of iterations `[start, stop)` into the shared total buffer.
+    """
+    shared = shared_memory.SharedMemory(name=shared_name)
+    try:
+        totals = np.ndarray((iterations,), dtype=np.float64, buffer=shared.buf)
+        totals[start:stop] = get_register_totals(
+            register, stop - start, seed, start, correlation, correlation_method
+        )
+        del totals
+    finally:
+        shared.close()
+
+
+def get_parallel_aggregate_data(
+    risks: dict[str, dict[str, tuple[int, int, int] | float]] | RiskRegister,
+    iterations: int = ITERATIONS,
+    seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+    workers: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    correlation: dict[str, dict] | np.ndarray | None = None,
+    correlation_method: str = "copula",
+) -> np.ndarray:
+    """
+    Generate aggregate sample data on several processes.
+
+    Iterations are split into chunks of `chunk_size` and simulated by a pool of worker processes.
+    Every worker writes its totals straight into a shared memory buffer, so only the register and
+    the seed are sent to the workers and nothing large is sent back.
+
+    Parameters
+    ----------
+    risks : dict of str to dict of str to tuple or float, or RiskRegister
+        The risks to simulate, structured as for `get_aggregate_data()`.
+    iterations : int, optional
+        The number of iterations, by default `ITERATIONS`.
+    seed : int, SeedSequence, Generator or None, optional
+        The seed of the simulation, see `get_seed_sequence()`.
+    workers : int or None, optional
+        The number of worker processes, by default the number of CPUs.
+    chunk_size : int, optional
+        The number of iterations simulated by each task, by default `CHUNK_SIZE`.
+    correlation : dict, np.ndarray or None, optional
+        The rank correlation between risks, see `get_correlation_groups()`, by default `None`
+        (independent risks).
+    correlation_method : str, optional
+        How correlation is induced, see `get_correlated_uniforms()`, by default "copula". Only
+        "copula" gives results that do not depend on `chunk_size`.
+
+    Returns
+    -------
+    np.ndarray
+        The total cost at each iteration, bit-for-bit identical to `get_aggregate_data()` with the
+        same seed, whatever the number of workers.
+
+    Example
+    -------
+    >>> samples = get_parallel_aggregate_data(risks, iterations=int(1e7), seed=42, workers=8)
+    """
+    register = get_risk_register(risks)
+    seed = get_seed_sequence(seed)
+    groups = get_correlation_groups(register, correlation)
+    workers = workers or os.cpu_count()
+    starts = range(0, iterations, chunk_size)
+    stops = [min(start + chunk_size, iterations) for start in starts]
+    shared = shared_memory.SharedMemory(
+        create=True, size=max(iterations, 1) * np.dtype(np.float64).itemsize
+    )
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            tasks = [
+                executor.submit(
+                    _simulate_chunk,
+                    shared.name,
+                    iterations,
+                    register,
+                    seed,
+                    start,
+                    stop,
+                    groups,
+                    correlation_method,
+                )
+                for start, stop in zip(starts, stops)
+            ]
+            for task in tasks:
+                task.result()
+        samples = np.ndarray((iterations,), dtype=np.float64, buffer=shared.buf).copy()
+    finally:
+        shared.close()
+        shared.unlink()
+    return samples
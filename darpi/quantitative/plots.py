@@ -1,22 +1,80 @@
+from functools import cache
+from typing import TYPE_CHECKING
+
 import numpy as np
-import plotly.graph_objects as go
-import plotly.io as pio
 
-from darpi.config import ITERATIONS, CDFData, HistogramData, PPFData
+from darpi.config import (
+    ITERATIONS,
+    PLOT_MAX_POINTS,
+    PLOT_WEBGL_THRESHOLD,
+    CDFData,
+    HistogramData,
+    PPFData,
+)
+from darpi.quantitative.instrumentation import stage
 
-# Set plotting template
-pio.templates["simple_white"]["layout"]["xaxis"]["mirror"] = True
-pio.templates["simple_white"]["layout"]["yaxis"]["mirror"] = True
-pio.templates["simple_white"]["layout"]["xaxis"]["showgrid"] = True
-pio.templates["simple_white"]["layout"]["yaxis"]["showgrid"] = True
-pio.templates["simple_white"]["layout"]["font"]["family"] = "Helvetica"
-pio.templates.default = "simple_white"
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 # TODO Write a function to plot both the cdf/pdf curve and the ppf bars in the same fig (two subplots)
 # TODO make internal function to perform more of the operations for the PDF-CDF curve. The user should just put in min, ml, and max.
 
 
-def plot_histogram_and_cdf(hist_data: HistogramData, cdf_data: CDFData) -> go.Figure:
+@cache
+def _get_template() -> "go.layout.Template":
+    """
+    Get the plotting template: "simple_white" with mirrored axes, grid lines and Helvetica.
+    """
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    template = go.layout.Template(pio.templates["simple_white"])
+    template.layout.xaxis.mirror = True
+    template.layout.yaxis.mirror = True
+    template.layout.xaxis.showgrid = True
+    template.layout.yaxis.showgrid = True
+    template.layout.font.family = "Helvetica"
+    return template
+
+
+def get_downsampled_cdf(cdf_data: CDFData, max_points: int = PLOT_MAX_POINTS) -> CDFData:
+    """
+    Reduce a CDF to a bounded number of points that trace the same curve.
+
+    Parameters
+    ----------
+    cdf_data : CDFData
+        The CDF, with costs in ascending order, e.g. from `get_empirical_cdf()`.
+    max_points : int, optional
+        The most points to keep, by default `PLOT_MAX_POINTS`.
+
+    Returns
+    -------
+    CDFData
+        The CDF at no more than `max_points` of its points, including the first and last.
+        `cdf_data` is returned unchanged if it is already small enough.
+
+    Notes
+    -----
+    Half of the points are picked on an even grid of probabilities and half on an even grid of
+    costs, so both steep parts of the curve (many iterations at similar costs) and flat parts
+    (a few iterations spread over a wide range of costs, such as the tail) keep their shape.
+    """
+    cost, p = np.asarray(cdf_data.cost), np.asarray(cdf_data.p)
+    if len(cost) <= max_points:
+        return cdf_data
+    half = max_points // 2
+    by_probability = np.searchsorted(p, np.linspace(p[0], p[-1], half), side="left")
+    cost_grid = np.linspace(cost[0], cost[-1], max_points - half)
+    by_cost = np.searchsorted(cost, cost_grid, side="right") - 1
+    index = np.unique(np.concatenate([[0, len(cost) - 1], by_probability, by_cost]))
+    index = index[(index >= 0) & (index < len(cost))]
+    return CDFData(cost=cost[index], p=p[index])
+
+
+def plot_histogram_and_cdf(
+    hist_data: HistogramData, cdf_data: CDFData, max_points: int | None = PLOT_MAX_POINTS
+) -> "go.Figure":
     """
     Plot the histogram and cumulative distribution function using Plotly.
 
@@ -26,69 +84,84 @@ def plot_histogram_and_cdf(hist_data: HistogramData, cdf_data: CDFData) -> go.Fi
         Data for the histogram containing bin centers and relative frequencies.
     cdf_data : CDFData
         Data for the cumulative distribution function containing x and y values.
+    max_points : int or None, optional
+        The most points plotted for the CDF, by default `PLOT_MAX_POINTS`, see
+        `get_downsampled_cdf()`. Use `None` to plot every point.
 
     Returns
     -------
     go.Figure
         Plotly figure object with the histogram and CDF.
+
+    Notes
+    -----
+    With the default `max_points`, the size of the figure does not depend on the number of
+    iterations. A CDF with more than `PLOT_WEBGL_THRESHOLD` points is drawn with `Scattergl`,
+    which renders large traces with WebGL.
     """
-    hist_x, hist_y = hist_data
-    cdf_x, cdf_y = cdf_data
-    max_hist_y = max(hist_y)
-    min_hist_x, max_hist_x = min(hist_x), max(hist_x)
-    fig = go.Figure()
-
-    # Add histogram
-    fig.add_trace(
-        go.Bar(
-            x=hist_x,
-            y=hist_y,
-            name="Relative frequency",
-            opacity=0.75,
-            yaxis="y1",
+    import plotly.graph_objects as go
+
+    if max_points is not None:
+        cdf_data = get_downsampled_cdf(cdf_data, max_points)
+    with stage("plot_histogram_and_cdf", iterations=len(cdf_data.cost)):
+        hist_x, hist_y = hist_data
+        cdf_x, cdf_y = cdf_data
+        max_hist_y = max(hist_y)
+        min_hist_x, max_hist_x = min(hist_x), max(hist_x)
+        fig = go.Figure(layout=dict(template=_get_template()))
+
+        # Add histogram
+        fig.add_trace(
+            go.Bar(
+                x=hist_x,
+                y=hist_y,
+                name="Relative frequency",
+                opacity=0.75,
+                yaxis="y1",
+            )
+        )
+
+        # Add cumulative distribution line
+        scatter = go.Scattergl if len(cdf_x) > PLOT_WEBGL_THRESHOLD else go.Scatter
+        fig.add_trace(
+            scatter(
+                x=cdf_x,
+                y=cdf_y,
+                name="Cumulative distribution",
+                mode="lines",
+                yaxis="y2",
+            )
         )
-    )
-
-    # Add cumulative distribution line
-    fig.add_trace(
-        go.Scatter(
-            x=cdf_x,
-            y=cdf_y,
-            name="Cumulative distribution",
-            mode="lines",
-            yaxis="y2",
+
+        # Update layout
+        fig.update_layout(
+            height=500,
+            width=800,
+            title="Cumulative Distribution Function Curve",
+            xaxis=dict(title="Cost, $", range=[min_hist_x, max_hist_x], showgrid=False),
+            yaxis=dict(
+                title="Relative frequency",
+                side="left",
+                range=[0, max_hist_y * 1.1],
+                tickformat=".2%",
+                showgrid=False,
+            ),
+            yaxis2=dict(
+                title="Probability that value is not exceeded",
+                side="right",
+                overlaying="y",
+                range=[0, 1],
+                tickformat=".0%",
+                showgrid=False,
+            ),
+            showlegend=False,
+            bargap=0.1,
         )
-    )
-
-    # Update layout
-    fig.update_layout(
-        height=500,
-        width=800,
-        title="Cumulative Distribution Function Curve",
-        xaxis=dict(title="Cost, $", range=[min_hist_x, max_hist_x], showgrid=False),
-        yaxis=dict(
-            title="Relative frequency",
-            side="left",
-            range=[0, max_hist_y * 1.1],
-            tickformat=".2%",
-            showgrid=False,
-        ),
-        yaxis2=dict(
-            title="Probability that value is not exceeded",
-            side="right",
-            overlaying="y",
-            range=[0, 1],
-            tickformat=".0%",
-            showgrid=False,
-        ),
-        showlegend=False,
-        bargap=0.1,
-    )
-
-    return fig
-
-
-def plot_ppf_curve(data: PPFData) -> go.Figure:
+
+        return fig
+
+
+def plot_ppf_curve(data: PPFData) -> "go.Figure":
     """
     Plot the PPF (Percent-Point Function) curve using Plotly.
 
@@ -103,27 +176,30 @@ def plot_ppf_curve(data: PPFData) -> go.Figure:
         Plotly figure object with the PPF curve.
     """
     # TODO make function for user to input min, max, ml and plot this (instead of the intermediate steps)
-    p_bars = np.linspace(0, 1, 21)
-    default_bar_color = "#5799C6"
-    p_bar_color = "#FF7F0E"
-    colors = [p_bar_color if x in p_bars else default_bar_color for x in data.p]
-    fig = go.Figure()
-
-    fig.add_trace(
-        go.Bar(
-            x=data.p,
-            y=data.cost,
-            name="Percent-Point Function Curve",
-            marker_color=colors,
-            opacity=0.75,
+    import plotly.graph_objects as go
+
+    with stage("plot_ppf_curve", iterations=len(data.p)):
+        p_bars = np.linspace(0, 1, 21)
+        default_bar_color = "#5799C6"
+        p_bar_color = "#FF7F0E"
+        colors = [p_bar_color if x in p_bars else default_bar_color for x in data.p]
+        fig = go.Figure(layout=dict(template=_get_template()))
+
+        fig.add_trace(
+            go.Bar(
+                x=data.p,
+                y=data.cost,
+                name="Percent-Point Function Curve",
+                marker_color=colors,
+                opacity=0.75,
+            )
+        )
+        fig.update_layout(
+            height=500,
+            width=800,
+            title="Percent-Point Function Curve",
+            xaxis=dict(title="Probability that value is not exceeded", range=[0, 1]),
+            yaxis=dict(title="Cost, $"),
         )
-    )
-    fig.update_layout(
-        height=500,
-        width=800,
-        title="Percent-Point Function Curve",
-        xaxis=dict(title="Probability that value is not exceeded", range=[0, 1]),
-        yaxis=dict(title="Cost, $"),
-    )
-
-    return fig
+
+        return fig
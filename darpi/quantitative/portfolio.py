@@ -0,0 +1,114 @@
+import numpy as np
+
+from darpi.config import CHUNK_SIZE, ITERATIONS, PortfolioData, RiskRegister
+from darpi.quantitative.correlation import get_correlation_groups
+from darpi.quantitative.probability import get_sample_matrix, get_seed_sequence
+from darpi.quantitative.register import get_register_subset, get_risk_register
+
+
+def get_portfolio_data(
+    risks: dict[str, dict[str, tuple[int, int, int] | float]] | RiskRegister,
+    paths: dict[str, tuple[str, ...]],
+    iterations: int = ITERATIONS,
+    seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    correlation: dict[str, dict] | np.ndarray | None = None,
+    correlation_method: str = "copula",
+) -> PortfolioData:
+    """
+    Simulate a portfolio of risks and roll the costs up a hierarchy of nodes.
+
+    Parameters
+    ----------
+    risks : dict of str to dict of str to tuple or float, or RiskRegister
+        The risks of the whole portfolio, structured as for `get_aggregate_data()`.
+    paths : dict of str to tuple of str
+        The position of each risk in the hierarchy, from the top level down, e.g.
+        `{"Risk 1": ("Project A", "Work package 1")}`. All paths must have the same length.
+    iterations : int, optional
+        The number of iterations, by default `ITERATIONS`.
+    seed : int, SeedSequence, Generator or None, optional
+        The seed of the simulation, see `get_seed_sequence()`.
+    chunk_size : int, optional
+        The number of iterations simulated at a time, by default `CHUNK_SIZE`.
+    correlation : dict, np.ndarray or None, optional
+        The rank correlation between risks, see `get_correlation_groups()`, by default `None`
+        (independent risks).
+    correlation_method : str, optional
+        How correlation is induced, see `get_correlated_uniforms()`, by default "copula".
+
+    Returns
+    -------
+    PortfolioData
+        An object containing:
+        - `nodes`: The path of every node, starting with the whole portfolio, `()`, followed by
+          each level of the hierarchy in turn, sorted.
+        - `totals`: The total cost of each node at each iteration, of shape
+          `(number of nodes, iterations)`.
+
+    Raises
+    ------
+    ValueError
+        If a risk has no path, a path names an unknown risk, or the paths differ in length.
+
+    Notes
+    -----
+    Every risk is sampled once, on the iteration axis shared by the whole portfolio. The risks
+    are sorted by path, so the risks of each node are contiguous and all the nodes of a level
+    are summed with one `np.add.reduceat()` over the level below. Node totals are equal to
+    simulating the risks of the node on their own with the same seed, up to floating point
+    rounding.
+
+    Example
+    -------
+    >>> paths = {
+    >>>     "Risk 1": ("Project A", "Earthworks"),
+    >>>     "Risk 2": ("Project A", "Structures"),
+    >>>     "Risk 3": ("Project B", "Earthworks"),
+    >>> }
+    >>> portfolio = get_portfolio_data(risks, paths, seed=42)
+    >>> get_portfolio_table(portfolio)
+    """
+    register = get_risk_register(risks)
+    seed = get_seed_sequence(seed)
+    names = list(register.names)
+    missing = set(names) - set(paths)
+    if missing:
+        raise ValueError(f"Risks without a path: {', '.join(map(str, missing))}.")
+    unknown = set(paths) - set(names)
+    if unknown:
+        raise ValueError(f"Paths of unknown risks: {', '.join(map(str, unknown))}.")
+    risk_paths = [tuple(paths[name]) for name in names]
+    depth = len(risk_paths[0])
+    if depth == 0 or any(len(path) != depth for path in risk_paths):
+        raise ValueError("All paths must have the same, non-zero, number of levels.")
+
+    order = sorted(range(len(names)), key=lambda index: risk_paths[index])
+    register = get_register_subset(register, order)
+    risk_paths = [risk_paths[index] for index in order]
+    groups = get_correlation_groups(register, correlation)
+
+    # For each level, from the leaves up: the node paths and where each starts in the level below
+    levels = []
+    below = risk_paths
+    for level in range(depth, -1, -1):
+        prefixes = [path[:level] for path in below]
+        starts = [0] + [
+            index for index in range(1, len(prefixes)) if prefixes[index] != prefixes[index - 1]
+        ]
+        levels.append(([prefixes[start] for start in starts], np.asarray(starts)))
+        below = levels[-1][0]
+
+    nodes = [node for level_nodes, _ in reversed(levels) for node in level_nodes]
+    totals = np.empty((len(nodes), iterations))
+    for start in range(0, iterations, chunk_size):
+        stop = min(start + chunk_size, iterations)
+        level_totals = get_sample_matrix(
+            register, stop - start, seed, start, groups, correlation_method
+        )
+        row = len(nodes)
+        for level_nodes, starts in levels:
+            level_totals = np.add.reduceat(level_totals, starts, axis=0)
+            row -= len(level_nodes)
+            totals[row : row + len(level_nodes), start:stop] = level_totals
+    return PortfolioData(nodes=nodes, totals=totals)
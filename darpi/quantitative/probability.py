@@ -1,17 +1,40 @@
+import hashlib
 import warnings
 from collections import namedtuple
+from typing import TYPE_CHECKING
 
 import numpy as np
-from scipy import stats
-from scipy.stats import rv_continuous
 
-from darpi.config import ITERATIONS, CDFData, HistogramData, PPFData
+from darpi.config import (
+    ITERATIONS,
+    RISK_BLOCK_SIZE,
+    CDFData,
+    HistogramData,
+    PPFData,
+    RiskRegister,
+    SparseSamples,
+)
+from darpi.quantitative.correlation import (
+    get_correlated_uniforms,
+    get_correlation_groups,
+)
+from darpi.quantitative.instrumentation import set_nbytes, stage
+from darpi.quantitative.register import get_register_subset, get_risk_register
+
+if TYPE_CHECKING:
+    from scipy.stats import rv_continuous
+
+    from darpi.quantitative.analytic import AnalyticDistribution
+    from darpi.quantitative.results import SimulationResult
+    from darpi.quantitative.streaming import StreamingSummary
+
+SAMPLING_METHODS = ("random", "latin-hypercube", "sobol")
 
 # TODO combine multiple distributions into a single (so if there are multiple risks, the total cost can be determined)
 # TODO do more exception/error handling
 
 
-def get_triangular_distribution(a: float, b: float, c: float) -> rv_continuous:
+def get_triangular_distribution(a: float, b: float, c: float) -> "rv_continuous":
     """
     Generate a triangular distribution given the mode and the range.
 
@@ -40,12 +63,104 @@ def get_triangular_distribution(a: float, b: float, c: float) -> rv_continuous:
         raise TypeError("All inputs must be either float or int.")
     if not (a <= c <= b):
         raise ValueError(f"Value {c} is out of range. It must be between {a} and {b}.")
+    from scipy import stats
+
     range_val = b - a
     c_shape = (c - a) / range_val
     return stats.triang(c=c_shape, loc=a, scale=range_val)
 
 
-def get_samples(distribution: rv_continuous, risk_probability: float) -> np.ndarray:
+def get_seed_sequence(
+    seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+) -> np.random.SeedSequence:
+    """
+    Resolve a seed into the `SeedSequence` that all random streams of a simulation derive from.
+
+    Parameters
+    ----------
+    seed : int, SeedSequence, Generator or None, optional
+        The seed of the simulation. A `SeedSequence` is returned as is, a `Generator` is used to
+        draw fresh entropy, and `None` (the default) uses fresh entropy from the operating system.
+
+    Returns
+    -------
+    np.random.SeedSequence
+        The root seed sequence of the simulation.
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    if isinstance(seed, np.random.Generator):
+        return np.random.SeedSequence(seed.integers(2**32, size=4))
+    return np.random.SeedSequence(seed)
+
+
+def get_stream_key(name: str) -> int:
+    """
+    Get the stable integer that identifies the random stream of a risk.
+
+    Parameters
+    ----------
+    name : str
+        The name of the risk.
+
+    Returns
+    -------
+    int
+        A 64-bit key derived from `name`, identical across runs, platforms and Python sessions.
+    """
+    digest = hashlib.blake2b(str(name).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def get_risk_generators(
+    names: list[str],
+    seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+    start: int = 0,
+) -> list[np.random.Generator]:
+    """
+    Create an independent random generator for each risk.
+
+    Parameters
+    ----------
+    names : list of str
+        The names of the risks.
+    seed : int, SeedSequence, Generator or None, optional
+        The seed of the simulation, see `get_seed_sequence()`.
+    start : int, optional
+        The iteration each generator starts at, by default `0`.
+
+    Returns
+    -------
+    list of np.random.Generator
+        One generator per risk, in the order of `names`.
+
+    Notes
+    -----
+    Each risk gets a child of the root `SeedSequence`, built the same way as `SeedSequence.spawn`
+    but with the spawn key taken from `get_stream_key()` rather than from the position of the
+    risk. A risk therefore draws the same samples whatever the order or content of the rest of
+    the register. Each sample consumes one draw of the stream, so generators are advanced to
+    `start` to produce any chunk of iterations without drawing the ones before it.
+    """
+    root = get_seed_sequence(seed)
+    generators = []
+    for name in names:
+        sequence = np.random.SeedSequence(
+            root.entropy,
+            spawn_key=root.spawn_key + (get_stream_key(name),),
+            pool_size=root.pool_size,
+        )
+        bit_generator = np.random.PCG64(sequence)
+        bit_generator.advance(start)
+        generators.append(np.random.Generator(bit_generator))
+    return generators
+
+
+def get_samples(
+    distribution: "rv_continuous",
+    risk_probability: float,
+    seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+) -> np.ndarray:
     """
     Generate samples from a given distribution based on a risk probability.
 
@@ -55,6 +170,8 @@ def get_samples(distribution: rv_continuous, risk_probability: float) -> np.ndar
         A frozen `rv_continuous` object from which samples are to be drawn.
     risk_probability : float
         The probability of risk occurrence, determining the proportion of non-zero samples.
+    seed : int, SeedSequence, Generator or None, optional
+        The seed used to draw and shuffle the samples, by default `None` (not reproducible).
 
     Returns
     -------
@@ -72,13 +189,57 @@ def get_samples(distribution: rv_continuous, risk_probability: float) -> np.ndar
     if not 0 <= risk_probability <= 1:
         raise ValueError("`risk_probability` must be between `0` and `1`")
 
+    rng = np.random.default_rng(seed)
     samples = np.zeros(ITERATIONS)
     occurrences = int(ITERATIONS * risk_probability)
-    samples[0:occurrences] = distribution.rvs(occurrences)
-    np.random.shuffle(samples)
+    with stage("get_samples.rvs", iterations=occurrences, risks=1):
+        samples[0:occurrences] = distribution.rvs(occurrences, random_state=rng)
+    with stage("get_samples.shuffle", iterations=ITERATIONS, risks=1):
+        rng.shuffle(samples)
     return samples
 
 
+def get_sparse_samples(
+    distribution: "rv_continuous",
+    risk_probability: float,
+    seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+) -> SparseSamples:
+    """
+    Generate samples from a given distribution, storing only the iterations where the risk occurs.
+
+    Parameters
+    ----------
+    distribution : rv_continuous
+        A frozen `rv_continuous` object from which samples are to be drawn.
+    risk_probability : float
+        The probability of risk occurrence, determining the proportion of non-zero samples.
+    seed : int, SeedSequence, Generator or None, optional
+        The seed used to draw the samples, by default `None` (not reproducible).
+
+    Returns
+    -------
+    SparseSamples
+        An object containing the iterations where the risk occurs, the cost at each of them and
+        the total number of iterations. Equivalent to the non-zero entries of `get_samples()`.
+
+    Notes
+    -----
+    Memory and time scale with `ITERATIONS * risk_probability` rather than with `ITERATIONS`,
+    which suits low-probability risks. Use `sum_sparse_samples()` to aggregate them.
+    """
+    if isinstance(risk_probability, (float, int)) == False:
+        raise TypeError("All inputs must be either float or int.")
+
+    if not 0 <= risk_probability <= 1:
+        raise ValueError("`risk_probability` must be between `0` and `1`")
+
+    rng = np.random.default_rng(seed)
+    occurrences = int(ITERATIONS * risk_probability)
+    index = rng.choice(ITERATIONS, size=occurrences, replace=False, shuffle=False)
+    cost = distribution.rvs(occurrences, random_state=rng)
+    return SparseSamples(index=index, cost=cost, iterations=ITERATIONS)
+
+
 def sum_samples(sample_sets: list[np.ndarray]) -> np.ndarray:
     """
     Sum multiple sets of samples element-wise.
@@ -107,10 +268,320 @@ def sum_samples(sample_sets: list[np.ndarray]) -> np.ndarray:
             raise ValueError(
                 f"Not all lists have the same length (sample {index+1} is different than the first)."
             )
-    return np.add.reduce(sample_sets)
+    with stage("sum_samples", iterations=length, risks=len(sample_sets)):
+        return np.add.reduce(sample_sets)
+
+
+def sum_sparse_samples(
+    sample_sets: list[SparseSamples], total: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Sum multiple sets of sparse samples element-wise.
+
+    Parameters
+    ----------
+    sample_sets : list of SparseSamples
+        A list of sparse samples to be summed, all with the same number of iterations.
+    total : np.ndarray or None, optional
+        Dense samples to add the sparse samples into, by default `None` (start from zero).
+
+    Returns
+    -------
+    np.ndarray
+        An array representing the element-wise sum of the samples.
+
+    Notes
+    -----
+    The costs of all sets are scattered into the total with a single `np.bincount`, in the
+    order of `sample_sets`.
+    """
+    iterations = sample_sets[0].iterations
+    if not all(samples.iterations == iterations for samples in sample_sets):
+        raise ValueError("Not all sparse samples have the same number of iterations.")
+    summed = np.bincount(
+        np.concatenate([samples.index for samples in sample_sets]),
+        weights=np.concatenate([samples.cost for samples in sample_sets]),
+        minlength=iterations,
+    )
+    if total is not None:
+        summed += total
+    return summed
+
+
+def get_triangular_ppf(
+    q: np.ndarray, minimum: np.ndarray, mode: np.ndarray, maximum: np.ndarray
+) -> np.ndarray:
+    """
+    Evaluate the inverse CDF of triangular distributions, element-wise.
+
+    Parameters
+    ----------
+    q : np.ndarray
+        Non-exceedance probabilities, between `0` and `1`.
+    minimum : np.ndarray
+        The lower bound of each distribution.
+    mode : np.ndarray
+        The mode of each distribution.
+    maximum : np.ndarray
+        The upper bound of each distribution.
+
+    Returns
+    -------
+    np.ndarray
+        The costs at `q`, broadcast over all the inputs.
+
+    Notes
+    -----
+    This is the closed form of `get_triangular_distribution(a, b, c).ppf(q)`, so a whole
+    register can be evaluated at once rather than one frozen distribution at a time.
+    """
+    width = maximum - minimum
+    with np.errstate(divide="ignore", invalid="ignore"):
+        split = (mode - minimum) / width
+        lower = minimum + np.sqrt(q * width * (mode - minimum))
+        upper = maximum - np.sqrt((1 - q) * width * (maximum - mode))
+    return np.where(q < split, lower, upper)
+
+
+def get_triangular_cdf(
+    x: np.ndarray, minimum: np.ndarray, mode: np.ndarray, maximum: np.ndarray
+) -> np.ndarray:
+    """
+    Evaluate the CDF of triangular distributions, element-wise.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        The costs to evaluate.
+    minimum : np.ndarray
+        The lower bound of each distribution.
+    mode : np.ndarray
+        The mode of each distribution.
+    maximum : np.ndarray
+        The upper bound of each distribution.
+
+    Returns
+    -------
+    np.ndarray
+        The probability that each cost is not exceeded, broadcast over all the inputs.
+
+    Notes
+    -----
+    This is the closed form of `get_triangular_distribution(a, b, c).cdf(x)`, the inverse of
+    `get_triangular_ppf()`. A distribution with `minimum == maximum` is a step at `minimum`.
+    """
+    width = maximum - minimum
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lower = (x - minimum) ** 2 / (width * (mode - minimum))
+        upper = 1 - (maximum - x) ** 2 / (width * (maximum - mode))
+    cdf = np.where(x <= mode, lower, upper)
+    cdf = np.where(x <= minimum, 0.0, np.where(x >= maximum, 1.0, cdf))
+    return np.where(width == 0, (x >= minimum).astype(float), cdf)
+
+
+def get_risk_ppf(
+    q: np.ndarray,
+    minimum: np.ndarray,
+    mode: np.ndarray,
+    maximum: np.ndarray,
+    probability: np.ndarray,
+) -> np.ndarray:
+    """
+    Evaluate the inverse CDF of risks that occur with a given probability, element-wise.
+
+    Parameters
+    ----------
+    q : np.ndarray
+        Non-exceedance probabilities, between `0` and `1`.
+    minimum : np.ndarray
+        The minimum cost of each risk.
+    mode : np.ndarray
+        The most likely cost of each risk.
+    maximum : np.ndarray
+        The maximum cost of each risk.
+    probability : np.ndarray
+        The probability of each risk occurring.
+
+    Returns
+    -------
+    np.ndarray
+        The costs at `q`, broadcast over all the inputs.
+
+    Notes
+    -----
+    A risk costs nothing with probability `1 - probability` and otherwise follows its triangular
+    distribution. The lowest `1 - probability` of `q` therefore maps to zero cost and the rest is
+    rescaled onto the triangular distribution, so a single uniform draw decides both whether the
+    risk occurs and what it costs.
+    """
+    threshold = 1 - probability
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q_cost = np.clip((q - threshold) / probability, 0, 1)
+    return np.where(q >= threshold, get_triangular_ppf(q_cost, minimum, mode, maximum), 0.0)
 
 
-def get_empirical_cdf(data: np.ndarray) -> np.ndarray:
+def _draw_uniforms(
+    risk: int,
+    out: np.ndarray,
+    generators: list[np.random.Generator],
+    sampling: str,
+    sobol_uniforms: np.ndarray | None,
+) -> None:
+    """
+    Fill `out` with the uniform draws of the risk at position `risk`.
+    """
+    if sampling == "sobol":
+        out[:] = sobol_uniforms[:, risk]
+    elif sampling == "latin-hypercube":
+        out[:] = generators[risk].permutation(len(out))
+        out += generators[risk].random(len(out))
+        out /= len(out)
+    else:
+        generators[risk].random(out=out)
+
+
+def get_sample_matrix(
+    register: RiskRegister,
+    iterations: int = ITERATIONS,
+    seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+    start: int = 0,
+    correlation: dict[str, dict] | np.ndarray | list | None = None,
+    correlation_method: str = "copula",
+    sampling: str = "random",
+    dtype: np.dtype = np.float64,
+) -> np.ndarray:
+    """
+    Generate samples for every risk in a register at once.
+
+    Parameters
+    ----------
+    register : RiskRegister
+        The risks to sample. Use `get_risk_register()` to build one from a dictionary of risks.
+    iterations : int, optional
+        The number of samples to draw for each risk, by default `ITERATIONS`.
+    seed : int, SeedSequence, Generator or None, optional
+        The seed of the simulation, see `get_seed_sequence()`.
+    start : int, optional
+        The index of the first iteration to draw, by default `0`. With "random" and "sobol"
+        `sampling`, drawing iterations `[0, n)` and `[n, 2n)` gives exactly the same samples as
+        drawing `[0, 2n)`. Latin hypercube strata span the whole draw, so "latin-hypercube"
+        requires `start == 0`.
+    correlation : dict, np.ndarray, list or None, optional
+        The rank correlation between risks, see `get_correlation_groups()`, by default `None`
+        (independent risks). All the risks of a group must be in `register`.
+    correlation_method : str, optional
+        How correlation is induced, see `get_correlated_uniforms()`, by default "copula".
+    sampling : str, optional
+        How the uniform draws behind the samples are generated, by default "random":
+        - "random": Independent pseudo-random draws.
+        - "latin-hypercube": Each risk gets exactly one draw in each of `iterations` equal
+          strata of `[0, 1)`, in a random order from its own stream.
+        - "sobol": A scrambled Sobol sequence from `scipy.stats.qmc`, with one dimension per
+          risk in the order of `register`. `iterations` must be a power of 2, which keeps the
+          balance properties of the sequence, and `start` skips ahead in the sequence.
+        On a 50-risk register, both alternatives roughly halve the RMS error of the P50, P80
+        and P90 at 1024 to 16384 iterations (e.g. from 2.8e-3 to 1.6e-3 at 4096), which is
+        worth about twice as many random iterations, see `benchmarks/bench_sampling.py`.
+    dtype : np.dtype, optional
+        The floating point type of the samples, by default `np.float64`. With `np.float32` the
+        samples take half the memory; they are computed in double precision and rounded, so
+        each is within a relative `6e-8` of its double precision value.
+
+    Returns
+    -------
+    np.ndarray
+        An array of shape `(number of risks, iterations)`, where each row holds the samples for
+        the corresponding risk in `register`.
+
+    Raises
+    ------
+    ValueError
+        If `sampling` is unknown, is "sobol" and `iterations` is not a power of 2, or is
+        "latin-hypercube" and `start` is not `0`.
+
+    Notes
+    -----
+    Each row is drawn with a single uniform array pushed through `get_risk_ppf()`, so risks occur
+    in `probability` of the iterations on average rather than in exactly `probability * iterations`
+    as with `get_samples()`. The occurrence mask is taken for `RISK_BLOCK_SIZE` risks at a time and
+    only the draws where a risk occurs are rescaled and pushed through `get_triangular_ppf()`,
+    which gives the same costs as `get_risk_ppf()` without its zero branch. Every risk draws from
+    its own stream, see `get_risk_generators()`. The draws of each correlated group are transformed together,
+    with one matrix product per group, before being pushed through the inverse CDF.
+    """
+    if sampling not in SAMPLING_METHODS:
+        raise ValueError(f"`sampling` must be one of {', '.join(SAMPLING_METHODS)}.")
+    if sampling == "sobol" and iterations & (iterations - 1) != 0:
+        raise ValueError("`iterations` must be a power of 2 with Sobol sampling.")
+    if sampling == "latin-hypercube" and start != 0:
+        raise ValueError("`start` must be 0 with latin hypercube sampling.")
+    n_risks = len(register.names)
+    with stage("get_sample_matrix", iterations=iterations, risks=n_risks) as timer:
+        with stage("get_sample_matrix.generators", risks=n_risks):
+            seed = get_seed_sequence(seed)
+            generators = get_risk_generators(register.names, seed=seed, start=start)
+            sobol_uniforms = None
+            if sampling == "sobol" and n_risks > 0:
+                from scipy.stats import qmc
+
+                sobol = qmc.Sobol(d=n_risks, scramble=True, seed=np.random.default_rng(seed))
+                if start > 0:
+                    sobol.fast_forward(start)
+                sobol_uniforms = sobol.random(iterations)
+
+        groups = get_correlation_groups(register, correlation)
+        positions = {name: index for index, name in enumerate(register.names)}
+        correlated_uniforms = {}
+        if groups:
+            n_correlated = sum(len(names) for names, _ in groups)
+            with stage(
+                "get_sample_matrix.correlated", iterations=iterations, risks=n_correlated
+            ):
+                for names, group_correlation in groups:
+                    group = [positions[name] for name in names]
+                    group_uniforms = np.empty((len(group), iterations))
+                    for index, risk in enumerate(group):
+                        _draw_uniforms(
+                            risk, group_uniforms[index], generators, sampling, sobol_uniforms
+                        )
+                    group_uniforms = get_correlated_uniforms(
+                        group_uniforms, group_correlation, method=correlation_method
+                    )
+                    correlated_uniforms.update(zip(group, group_uniforms))
+
+        samples = np.zeros((n_risks, iterations), dtype=dtype)
+        uniforms = np.empty((min(RISK_BLOCK_SIZE, n_risks), iterations))
+        for block_start in range(0, n_risks, RISK_BLOCK_SIZE):
+            block = slice(block_start, block_start + RISK_BLOCK_SIZE)
+            size = len(register.names[block])
+            with stage("get_sample_matrix.uniforms", iterations=iterations, risks=size):
+                for index in range(size):
+                    risk = block_start + index
+                    if risk in correlated_uniforms:
+                        uniforms[index] = correlated_uniforms[risk]
+                    else:
+                        _draw_uniforms(
+                            risk, uniforms[index], generators, sampling, sobol_uniforms
+                        )
+            with stage("get_sample_matrix.ppf", iterations=iterations, risks=size):
+                threshold = 1 - register.probability[block]
+                occurred = uniforms[:size] >= threshold[:, np.newaxis]
+                for index in range(size):
+                    risk = block_start + index
+                    iteration = np.flatnonzero(occurred[index])
+                    # As in get_risk_ppf(), where the draws that occur need no zero branch
+                    q_cost = uniforms[index, iteration]
+                    q_cost -= threshold[index]
+                    q_cost /= register.probability[risk]
+                    np.minimum(q_cost, 1, out=q_cost)
+                    samples[risk, iteration] = get_triangular_ppf(
+                        q_cost, register.minimum[risk], register.mode[risk], register.maximum[risk]
+                    )
+        set_nbytes(timer, samples.nbytes)
+        return samples
+
+
+def get_empirical_cdf(data: np.ndarray, is_sorted: bool = False) -> CDFData:
     """
     Calculate the empirical cumulative distribution function (CDF) for a dataset.
 
@@ -118,6 +589,8 @@ def get_empirical_cdf(data: np.ndarray) -> np.ndarray:
     ----------
     data : np.ndarray
         The data array for which to compute the empirical CDF.
+    is_sorted : bool, optional
+        Whether `data` is already sorted in ascending order, by default `False`.
 
     Returns
     -------
@@ -130,10 +603,13 @@ def get_empirical_cdf(data: np.ndarray) -> np.ndarray:
     """
     n = len(data)
     p = np.arange(1, n + 1) / n
-    return CDFData(cost=np.sort(data), p=p)
+    if not is_sorted:
+        with stage("get_empirical_cdf.sort", iterations=n):
+            data = np.sort(data)
+    return CDFData(cost=data, p=p)
 
 
-def get_empirical_ppf(samples: np.ndarray) -> PPFData:
+def get_empirical_ppf(samples: np.ndarray, is_sorted: bool = False) -> PPFData:
     """
     Calculate the empirical percent-point function (PPF) for a dataset.
 
@@ -141,6 +617,8 @@ def get_empirical_ppf(samples: np.ndarray) -> PPFData:
     ---------
     samples : np.ndarray
         The data array for which to compute the empirical PPF. Use `get_samples()`
+    is_sorted : bool, optional
+        Whether `samples` is already sorted in ascending order, by default `False`.
 
     Returns
     -------
@@ -152,7 +630,10 @@ def get_empirical_ppf(samples: np.ndarray) -> PPFData:
     The empirical PPF is the inverse of the empirical CDF, mapping percentiles to samples values.
     """
     p_values = np.linspace(start=0, stop=1, num=101)
-    sorted_data = np.sort(samples)
+    sorted_data = samples
+    if not is_sorted:
+        with stage("get_empirical_ppf.sort", iterations=len(samples)):
+            sorted_data = np.sort(samples)
     cumulative_probs = np.linspace(0, 1, len(sorted_data), endpoint=False)
     cumulative_probs += 1 / len(sorted_data)
 
@@ -162,8 +643,9 @@ def get_empirical_ppf(samples: np.ndarray) -> PPFData:
 
     # Add the `1-risk_probability` value to the array as the lower bound
     lower_limit_index = len(cost[cost == 0]) - 1
-
-    cost[lower_limit_index] = samples[samples != 0].min()
+    if lower_limit_index >= 0:
+        non_zero_index = np.searchsorted(sorted_data, 0, side="right")
+        cost[lower_limit_index] = sorted_data[non_zero_index]
 
     return PPFData(cost=cost, p=p_values)
 
@@ -187,16 +669,184 @@ def get_histogram_data(data: np.ndarray) -> HistogramData:
     The histogram is computed excluding zero values in the data.
     Frequencies are normalized by the total number of data points.
     """
-    non_zero_data = data[data != 0]
-    num_bins = 40
-    hist, bin_edges = np.histogram(non_zero_data, bins=num_bins)
+    with stage("get_histogram_data", iterations=len(data)):
+        non_zero_data = data[data != 0]
+        num_bins = 40
+        hist, bin_edges = np.histogram(non_zero_data, bins=num_bins)
     total_data_points = len(data)
     frequency_including_zeros = hist / total_data_points
     return HistogramData(cost=bin_edges, frequency=frequency_including_zeros)
 
 
+def get_sparse_sample_sets(
+    register: RiskRegister,
+    iterations: int = ITERATIONS,
+    seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+) -> list[SparseSamples]:
+    """
+    Generate sparse samples for every risk in a register.
+
+    Parameters
+    ----------
+    register : RiskRegister
+        The risks to sample.
+    iterations : int, optional
+        The number of iterations, by default `ITERATIONS`.
+    seed : int, SeedSequence, Generator or None, optional
+        The seed of the simulation, see `get_seed_sequence()`.
+
+    Returns
+    -------
+    list of SparseSamples
+        The iterations where each risk occurs and its cost at each of them, in the order of
+        `register`.
+
+    Notes
+    -----
+    Each risk draws the number of iterations it occurs in from a binomial distribution, picks
+    those iterations at random and draws a cost for each from `get_triangular_ppf()`. The
+    result has the same distribution as a row of `get_sample_matrix()` but, as it uses its
+    stream differently, not the same values.
+    """
+    generators = get_risk_generators(register.names, seed=seed)
+    sample_sets = []
+    for risk, generator in enumerate(generators):
+        occurrences = generator.binomial(iterations, register.probability[risk])
+        index = generator.choice(iterations, size=occurrences, replace=False, shuffle=False)
+        cost = get_triangular_ppf(
+            generator.random(occurrences),
+            register.minimum[risk],
+            register.mode[risk],
+            register.maximum[risk],
+        )
+        sample_sets.append(SparseSamples(index=index, cost=cost, iterations=iterations))
+    return sample_sets
+
+
+def sum_sample_matrix(samples: np.ndarray, names: list[str]) -> np.ndarray:
+    """
+    Sum the rows of a sample matrix in an order that does not depend on the order of the risks.
+
+    Parameters
+    ----------
+    samples : np.ndarray
+        An array of shape `(number of risks, iterations)`, as from `get_sample_matrix()`.
+    names : list of str
+        The name of the risk in each row of `samples`.
+
+    Returns
+    -------
+    np.ndarray
+        The element-wise sum of the rows of `samples`.
+
+    Notes
+    -----
+    Floating point addition is not associative, so rows are added one at a time, ordered by
+    `get_stream_key()`. Reordering a register therefore gives bit-for-bit identical totals.
+    Rows are always added in double precision, whatever the type of `samples`.
+    """
+    with stage(
+        "sum_sample_matrix", iterations=samples.shape[1], risks=len(names)
+    ) as timer:
+        order = np.argsort([get_stream_key(name) for name in names], kind="stable")
+        total = np.zeros(samples.shape[1])
+        for index in order:
+            total += samples[index]
+        set_nbytes(timer, total.nbytes)
+    return total
+
+
+def get_register_totals(
+    register: RiskRegister,
+    iterations: int = ITERATIONS,
+    seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+    start: int = 0,
+    correlation: dict[str, dict] | np.ndarray | list | None = None,
+    correlation_method: str = "copula",
+    dtype: np.dtype = np.float64,
+) -> np.ndarray:
+    """
+    Generate the total cost of a register for a range of iterations.
+
+    Parameters
+    ----------
+    register : RiskRegister
+        The risks to sample.
+    iterations : int, optional
+        The number of iterations to draw, by default `ITERATIONS`.
+    seed : int, SeedSequence, Generator or None, optional
+        The seed of the simulation, see `get_seed_sequence()`.
+    start : int, optional
+        The index of the first iteration to draw, by default `0`.
+    correlation : dict, np.ndarray, list or None, optional
+        The rank correlation between risks, see `get_correlation_groups()`, by default `None`.
+    correlation_method : str, optional
+        How correlation is induced, see `get_correlated_uniforms()`, by default "copula".
+    dtype : np.dtype, optional
+        The floating point type of the samples and of the returned totals, by default
+        `np.float64`. The totals are accumulated in double precision either way.
+
+    Returns
+    -------
+    np.ndarray
+        The total cost of all risks at each iteration. Identical to summing
+        `get_sample_matrix()` with `sum_sample_matrix()`.
+
+    Notes
+    -----
+    Risks are sampled `RISK_BLOCK_SIZE` at a time and added into the total, so memory use is
+    bounded by `RISK_BLOCK_SIZE * iterations` rather than by the size of the register. Correlated
+    risks are sampled together first and kept until they are added.
+    """
+    seed = get_seed_sequence(seed)
+    groups = get_correlation_groups(register, correlation)
+    correlated = np.isin(register.names, [name for names, _ in groups for name in names])
+    correlated_register = get_register_subset(register, correlated)
+    correlated_samples = dict(
+        zip(
+            correlated_register.names,
+            get_sample_matrix(
+                correlated_register,
+                iterations,
+                seed,
+                start,
+                groups,
+                correlation_method,
+                dtype=dtype,
+            ),
+        )
+    )
+    order = np.argsort([get_stream_key(name) for name in register.names], kind="stable")
+    total = np.zeros(iterations)
+    for block_start in range(0, len(order), RISK_BLOCK_SIZE):
+        block = order[block_start : block_start + RISK_BLOCK_SIZE]
+        block_register = get_register_subset(register, block)
+        independent = ~correlated[block]
+        independent_samples = iter(
+            get_sample_matrix(
+                get_register_subset(block_register, independent),
+                iterations,
+                seed,
+                start,
+                dtype=dtype,
+            )
+        )
+        for name, is_independent in zip(block_register.names, independent):
+            if is_independent:
+                total += next(independent_samples)
+            else:
+                total += correlated_samples[name]
+    return total.astype(dtype, copy=False)
+
+
 def get_aggregate_data(
-    risks: dict[str, dict[str, tuple[int, int, int] | float]]
+    risks: dict[str, dict[str, tuple[int, int, int] | float]] | RiskRegister,
+    seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+    sparse_probability: float | None = None,
+    correlation: dict[str, dict] | np.ndarray | None = None,
+    correlation_method: str = "copula",
+    sampling: str = "random",
+    dtype: np.dtype = np.float64,
 ) -> np.ndarray:
     """
     Generate aggregate sample data based on multiple risk scenarios.
@@ -207,10 +857,29 @@ def get_aggregate_data(
 
     Parameters
     ----------
-    risks : dict of str to dict of str to tuple or float
+    risks : dict of str to dict of str to tuple or float, or RiskRegister
         A dictionary where the keys are risk names (str), and the values are dictionaries containing:
         - "costs": A tuple of three integers representing the minimum cost, mode, and maximum cost.
         - "probability": A float representing the probability of the risk occurring.
+        Or a `RiskRegister`, e.g. from `read_risk_register()`, which is used directly.
+    seed : int, SeedSequence, Generator or None, optional
+        The seed of the simulation, by default `None` (not reproducible). Each risk draws from its
+        own stream, so a given seed reproduces the samples of every risk exactly.
+    sparse_probability : float or None, optional
+        Risks with a probability at or below this value are sampled with `get_sparse_sample_sets()`,
+        by default `None` (all risks are sampled densely).
+        Correlated risks are always sampled densely.
+    correlation : dict, np.ndarray or None, optional
+        The rank correlation between risks, see `get_correlation_groups()`, by default `None`
+        (independent risks).
+    correlation_method : str, optional
+        How correlation is induced, see `get_correlated_uniforms()`, by default "copula".
+    sampling : str, optional
+        How the dense samples are drawn, see `get_sample_matrix()`, by default "random". With
+        "sobol", the number of iterations is rounded up from `ITERATIONS` to the next power of 2.
+    dtype : np.dtype, optional
+        The floating point type of the dense samples and of the result, by default
+        `np.float64`. Samples are summed in double precision and the result is rounded once.
 
     Returns
     -------
@@ -224,8 +893,10 @@ def get_aggregate_data(
       - `a` is the minimum cost,
       - `c` is the mode (most likely cost),
       - `b` is the maximum cost.
-    - The number of samples generated for each risk is proportional to the risk's probability.
-    - The samples from all risks are summed element-wise to produce the final aggregated data.
+    - Each risk occurs in a proportion of the samples equal to the risk's probability, on average.
+    - All risks are sampled together with `get_sample_matrix()` and the samples from all risks are
+      summed element-wise to produce the final aggregated data.
+    - `risks` is not modified. Use `get_simulation_result()` to keep the samples of each risk.
 
     Example
     -------
@@ -236,48 +907,76 @@ def get_aggregate_data(
     >>>     "Risk 2": {"costs": (2000, 4000, 8000), "probability": 0.8},
     >>>     "Risk 3": {"costs": (2800, 4000, 10000), "probability": 0.5},
     >>> }
-    >>> samples = get_aggregate_data(risks)
-    """
-    for risk, details in risks.items():
-        a, c, b = details["costs"]
-        risk_probability = details["probability"]
-        distribution = get_triangular_distribution(a, b, c)
-        data = get_samples(distribution=distribution, risk_probability=risk_probability)
-        risks[risk]["samples"] = data
-    samples = sum_samples([risk["samples"] for risk in risks.values()])
-    return samples
+    >>> samples = get_aggregate_data(risks, seed=42)
+    """
+    register = get_risk_register(risks)
+    seed = get_seed_sequence(seed)
+    groups = get_correlation_groups(register, correlation)
+    if sparse_probability is None:
+        sparse = np.zeros(len(register.names), dtype=bool)
+    else:
+        sparse = register.probability <= sparse_probability
+        sparse &= ~np.isin(register.names, [name for names, _ in groups for name in names])
+    dense_register = get_register_subset(register, ~sparse)
+    iterations = ITERATIONS
+    if sampling == "sobol":
+        iterations = 1 << (ITERATIONS - 1).bit_length()
+    sample_matrix = get_sample_matrix(
+        dense_register,
+        iterations,
+        seed=seed,
+        correlation=groups,
+        correlation_method=correlation_method,
+        sampling=sampling,
+        dtype=dtype,
+    )
+    samples = sum_sample_matrix(sample_matrix, dense_register.names)
+    if sparse.any():
+        sparse_register = get_register_subset(register, sparse)
+        order = np.argsort(
+            [get_stream_key(name) for name in sparse_register.names], kind="stable"
+        )
+        sparse_register = get_register_subset(sparse_register, order)
+        sample_sets = get_sparse_sample_sets(sparse_register, iterations, seed)
+        samples = sum_sparse_samples(sample_sets, total=samples)
+    return samples.astype(dtype, copy=False)
 
 
-def get_p_value(data: np.ndarray, p_value: float) -> float:
+def get_p_value(
+    data: "np.ndarray | SimulationResult | StreamingSummary | AnalyticDistribution",
+    p_value: float,
+    is_sorted: bool = False,
+) -> float:
     """
     Retrieve the cost associated with a specific non-exceedance probability (p-value).
 
-    This function calculates the empirical percent-point function (PPF) from the provided data
-    and returns the cost value corresponding to a specified non-exceedance probability (p-value).
-
     Parameters
     ----------
-    data : np.ndarray
-        An array of data points from which to compute the empirical PPF.
+    data : np.ndarray, SimulationResult, StreamingSummary or AnalyticDistribution
+        An array of data points, or an object that provides its own `get_costs()`, such as from
+        `get_simulation_result()`, `get_streaming_summary()` or `get_analytic_distribution()`.
     p_value : float
         The non-exceedance probability (p-value) for which to retrieve the corresponding cost value.
         This should be a value between 0 and 1.
+    is_sorted : bool, optional
+        Whether `data` is already sorted in ascending order, by default `False`. Only used for
+        arrays.
 
     Returns
     -------
     float
         The cost value corresponding to the specified p-value, rounded to two decimal places.
 
-    Raises
-    ------
-    IndexError
-        If the specified p-value is not found in the calculated PPF data.
-
     Notes
     -----
     - The p-value represents the probability that a randomly selected value from the distribution
       will be less than or equal to the corresponding cost.
     - This function is useful for identifying the threshold cost for a given probability in risk analysis.
+    - P-values on the percentile grid of `get_empirical_ppf()` return the value in that table,
+      so they always agree with `get_non_exceedance_table()`; any other p-value is interpolated
+      with `get_costs()`. The table adjusts its end points and the first non-zero percentile,
+      so p-values just off the grid can differ from their neighbours on it.
+    - The result classes answer `get_p_value()` with this function.
 
     Example
     -------
@@ -291,7 +990,96 @@ def get_p_value(data: np.ndarray, p_value: float) -> float:
     This might output `3000.0`, representing the cost value at the 50th percentile (median) of the data.
 
     """
-    ppf_data = get_empirical_ppf(data)
-    cost = ppf_data.cost
-    p = ppf_data.p
-    return cost[np.where(p == p_value)][0].round(2)
+    percentile = np.rint(p_value * 100)
+    on_grid = np.isclose(p_value * 100, percentile)
+    if hasattr(data, "get_costs"):
+        if on_grid:
+            return data.get_empirical_ppf().cost[int(percentile)].round(2)
+        return data.get_costs(p_value).round(2)
+    sorted_data = data if is_sorted else np.sort(data)
+    if on_grid:
+        ppf_data = get_empirical_ppf(sorted_data, is_sorted=True)
+        return ppf_data.cost[int(percentile)].round(2)
+    return get_costs(sorted_data, p_value, is_sorted=True).round(2)
+
+
+def get_costs(
+    data: np.ndarray, p_values: np.ndarray | float, is_sorted: bool = False
+) -> np.ndarray:
+    """
+    Retrieve the costs at any number of non-exceedance probabilities.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        An array of data points.
+    p_values : np.ndarray or float
+        The non-exceedance probabilities, between `0` and `1`, in any order.
+    is_sorted : bool, optional
+        Whether `data` is already sorted in ascending order, by default `False`.
+
+    Returns
+    -------
+    np.ndarray
+        The cost at each of `p_values`, with the shape of `p_values`.
+
+    Raises
+    ------
+    ValueError
+        If any p-value is not between `0` and `1`.
+
+    Notes
+    -----
+    The i-th smallest of `n` data points is taken to have a non-exceedance probability of
+    `i / n`, as in `get_empirical_cdf()`, and costs in between are linearly interpolated. Once
+    `data` is sorted, each p-value costs a constant amount of work.
+
+    Example
+    -------
+    >>> get_costs(data, np.linspace(0.5, 0.99, 1000))
+    """
+    p_values = np.asarray(p_values, dtype=float)
+    if ((p_values < 0) | (p_values > 1)).any():
+        raise ValueError("`p_values` must be between `0` and `1`")
+    sorted_data = data if is_sorted else np.sort(data)
+    n = len(sorted_data)
+    position = np.clip(p_values * n - 1, 0, n - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, n - 1)
+    fraction = position - lower
+    return sorted_data[lower] + fraction * (sorted_data[upper] - sorted_data[lower])
+
+
+def get_non_exceedance_probabilities(
+    data: np.ndarray, costs: np.ndarray | float, is_sorted: bool = False
+) -> np.ndarray:
+    """
+    Retrieve the probability that each of any number of costs is not exceeded.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        An array of data points.
+    costs : np.ndarray or float
+        The costs (e.g. budgets) to evaluate, in any order.
+    is_sorted : bool, optional
+        Whether `data` is already sorted in ascending order, by default `False`.
+
+    Returns
+    -------
+    np.ndarray
+        The proportion of `data` less than or equal to each of `costs`, with the shape of `costs`.
+        The probability of exceeding a cost is one minus this value.
+
+    Notes
+    -----
+    Each cost is located in the sorted data with a binary search.
+
+    Example
+    -------
+    >>> budgets = np.linspace(10000, 20000, 5000)
+    >>> 1 - get_non_exceedance_probabilities(data, budgets)
+    """
+    sorted_data = data if is_sorted else np.sort(data)
+    index = np.searchsorted(sorted_data, costs, side="right")
+    return index / len(sorted_data)
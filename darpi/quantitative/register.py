@@ -0,0 +1,234 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from darpi.config import RegisterError, RiskRegister
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def get_risk_register(
+    risks: dict[str, dict[str, tuple[int, int, int] | float]] | RiskRegister
+) -> RiskRegister:
+    """
+    Convert a dictionary of risks into a columnar risk register.
+
+    Parameters
+    ----------
+    risks : dict of str to dict of str to tuple or float, or RiskRegister
+        A dictionary where the keys are risk names (str), and the values are dictionaries containing:
+        - "costs": A tuple of three numbers representing the minimum cost, mode, and maximum cost.
+        - "probability": A float representing the probability of the risk occurring.
+        A `RiskRegister` is returned unchanged.
+
+    Returns
+    -------
+    RiskRegister
+        An object containing the risk names and arrays of the minimum, mode, maximum and probability
+        of each risk, in the order of `risks`.
+
+    Raises
+    ------
+    TypeError
+        If any cost or probability is not a number.
+    ValueError
+        If the register is empty, or any risk fails the checks in `validate_risk_register()`.
+    """
+    if isinstance(risks, RiskRegister):
+        return risks
+    if len(risks) == 0:
+        raise ValueError("`risks` must contain at least one risk.")
+    costs = np.asarray([details["costs"] for details in risks.values()])
+    probability = np.asarray([details["probability"] for details in risks.values()])
+    if not (
+        np.issubdtype(costs.dtype, np.number)
+        and np.issubdtype(probability.dtype, np.number)
+    ):
+        raise TypeError("All inputs must be either float or int.")
+    if costs.ndim != 2 or costs.shape[1] != 3:
+        raise ValueError("All `costs` must be a tuple of (minimum, mode, maximum).")
+    costs = costs.astype(float)
+    register = RiskRegister(
+        names=np.asarray(list(risks), dtype=object),
+        minimum=costs[:, 0],
+        mode=costs[:, 1],
+        maximum=costs[:, 2],
+        probability=probability.astype(float),
+    )
+    validate_risk_register(register)
+    return register
+
+
+def get_register_errors(register: RiskRegister) -> list[RegisterError]:
+    """
+    Check every risk in a register in a single vectorized pass and report each problem.
+
+    Parameters
+    ----------
+    register : RiskRegister
+        The register to check.
+
+    Returns
+    -------
+    list of RegisterError
+        One entry for each problem, ordered by row, containing:
+        - `row`: The position of the risk in the register.
+        - `name`: The name of the risk.
+        - `message`: What is wrong with it.
+        The list is empty if the register is valid.
+    """
+    names = np.asarray(register.names, dtype=object)
+    costs = np.stack([register.minimum, register.mode, register.maximum])
+    probability = np.asarray(register.probability)
+    _, first, counts = np.unique(names.astype(str), return_index=True, return_counts=True)
+    duplicated = np.zeros(len(names), dtype=bool)
+    duplicated[first[counts > 1]] = True
+    duplicated |= ~np.isin(np.arange(len(names)), first)
+
+    checks = [
+        (names.astype(str) == "", "The name is empty."),
+        (duplicated, "The name is not unique."),
+        (~np.isfinite(costs).all(axis=0), "All costs must be numbers."),
+        (
+            np.isfinite(costs).all(axis=0)
+            & ~((register.minimum <= register.mode) & (register.mode <= register.maximum)),
+            "The mode must be between the minimum and maximum.",
+        ),
+        (
+            ~((probability >= 0) & (probability <= 1)),
+            "`probability` must be between `0` and `1`.",
+        ),
+    ]
+    errors = [
+        RegisterError(row=int(row), name=names[row], message=message)
+        for mask, message in checks
+        for row in np.flatnonzero(mask)
+    ]
+    return sorted(errors, key=lambda error: error.row)
+
+
+def validate_risk_register(register: RiskRegister) -> None:
+    """
+    Check every risk in a register in a single vectorized pass.
+
+    Parameters
+    ----------
+    register : RiskRegister
+        The register to check.
+
+    Raises
+    ------
+    ValueError
+        If any risk fails the checks in `get_register_errors()`, such as a mode that is not
+        between its minimum and maximum or a probability that is not between `0` and `1`. The
+        message lists every problem by row and risk name.
+    """
+    errors = get_register_errors(register)
+    if errors:
+        report = "\n".join(
+            f"- row {error.row} ({error.name}): {error.message}" for error in errors
+        )
+        raise ValueError(f"The risk register is not valid:\n{report}")
+
+
+def get_register_subset(register: RiskRegister, index: np.ndarray) -> RiskRegister:
+    """
+    Select some of the risks of a register.
+
+    Parameters
+    ----------
+    register : RiskRegister
+        The register to select from.
+    index : np.ndarray
+        The positions, or a boolean mask, of the risks to keep.
+
+    Returns
+    -------
+    RiskRegister
+        A register containing only the selected risks, in the order of `index`.
+    """
+    return RiskRegister(*(np.asarray(field)[index] for field in register))
+
+
+def get_risk_register_from_frame(
+    frame: "pd.DataFrame",
+    name: str = "name",
+    minimum: str = "minimum",
+    mode: str = "mode",
+    maximum: str = "maximum",
+    probability: str = "probability",
+) -> RiskRegister:
+    """
+    Build a risk register from the columns of a table.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        A table with one row per risk.
+    name, minimum, mode, maximum, probability : str, optional
+        The columns holding the name, minimum cost, mode, maximum cost and probability of each
+        risk, by default the names of the fields of `RiskRegister`.
+
+    Returns
+    -------
+    RiskRegister
+        The register, in the order of the rows of `frame`.
+
+    Raises
+    ------
+    KeyError
+        If a column is missing.
+    ValueError
+        If the table is empty, or any row fails the checks in `get_register_errors()`. Values
+        that are not numbers are reported against their row.
+    """
+    import pandas as pd
+
+    if len(frame) == 0:
+        raise ValueError("`frame` must contain at least one risk.")
+    columns = {"minimum": minimum, "mode": mode, "maximum": maximum, "probability": probability}
+    register = RiskRegister(
+        names=frame[name].to_numpy(dtype=object),
+        **{
+            field: pd.to_numeric(frame[column], errors="coerce").to_numpy(dtype=float)
+            for field, column in columns.items()
+        },
+    )
+    validate_risk_register(register)
+    return register
+
+
+def read_risk_register(path: str, **columns: str) -> RiskRegister:
+    """
+    Read a risk register from a CSV file.
+
+    Parameters
+    ----------
+    path : str
+        The path of the CSV file, with a header row and one row per risk.
+    **columns : str
+        The columns to read each field from, see `get_risk_register_from_frame()`.
+
+    Returns
+    -------
+    RiskRegister
+        The register, in the order of the rows of the file.
+
+    Raises
+    ------
+    ValueError
+        If any row fails the checks in `get_register_errors()`.
+
+    Example
+    -------
+    >>> register = read_risk_register("register.csv", name="Risk ID", probability="Likelihood")
+    >>> samples = get_aggregate_data(register, seed=42)
+    """
+    import pandas as pd
+
+    name = columns.get("name", "name")
+    return get_risk_register_from_frame(
+        pd.read_csv(path, dtype={name: str}, keep_default_na=False),
+        **columns,
+    )
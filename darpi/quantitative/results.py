@@ -0,0 +1,261 @@
+from functools import cached_property
+
+import numpy as np
+
+from darpi.config import ITERATIONS, CDFData, HistogramData, PPFData, RiskRegister
+from darpi.quantitative.cache import SampleCache, get_cached_sample_matrix
+from darpi.quantitative.instrumentation import set_nbytes, stage
+from darpi.quantitative.probability import (
+    get_costs,
+    get_empirical_cdf,
+    get_empirical_ppf,
+    get_histogram_data,
+    get_non_exceedance_probabilities,
+    get_p_value,
+    get_register_totals,
+    get_sample_matrix,
+    get_seed_sequence,
+    sum_sample_matrix,
+)
+from darpi.quantitative.register import get_risk_register
+
+
+class SimulationResult:
+    """
+    Result of simulating a risk register.
+
+    The totals are sorted once, on first use, and the CDF, PPF and histogram are computed from
+    them once and then served from the cache, so any number of queries costs a single sort.
+
+    Parameters
+    ----------
+    totals : np.ndarray
+        The total cost at each iteration.
+    samples : np.ndarray or None, optional
+        The per-risk samples, of shape `(number of risks, iterations)`, by default `None`.
+    register : RiskRegister or None, optional
+        The register that was simulated, by default `None`.
+    seed : np.random.SeedSequence or None, optional
+        The seed of the simulation, by default `None`.
+    sorted_totals : np.ndarray or None, optional
+        The totals already sorted in ascending order, by default `None` (sorted on first use).
+    """
+
+    def __init__(
+        self,
+        totals: np.ndarray,
+        samples: np.ndarray | None = None,
+        register: RiskRegister | None = None,
+        seed: np.random.SeedSequence | None = None,
+        sorted_totals: np.ndarray | None = None,
+    ):
+        self.totals = totals
+        self.samples = samples
+        self.register = register
+        self.seed = seed
+        if sorted_totals is not None:
+            self.sorted_totals = sorted_totals
+
+    @property
+    def iterations(self) -> int:
+        """The number of iterations."""
+        return len(self.totals)
+
+    @cached_property
+    def sorted_totals(self) -> np.ndarray:
+        """The totals sorted in ascending order."""
+        with stage("SimulationResult.sort", iterations=len(self.totals)) as timer:
+            sorted_totals = np.sort(self.totals)
+            set_nbytes(timer, sorted_totals.nbytes)
+        return sorted_totals
+
+    @cached_property
+    def _cdf_data(self) -> CDFData:
+        return get_empirical_cdf(self.sorted_totals, is_sorted=True)
+
+    @cached_property
+    def _ppf_data(self) -> PPFData:
+        return get_empirical_ppf(self.sorted_totals, is_sorted=True)
+
+    @cached_property
+    def _histogram_data(self) -> HistogramData:
+        return get_histogram_data(self.sorted_totals)
+
+    def get_empirical_cdf(self) -> CDFData:
+        """
+        Get the empirical CDF of the totals, see `get_empirical_cdf()`.
+
+        Returns
+        -------
+        CDFData
+            An object containing the sorted totals and corresponding cumulative probabilities.
+        """
+        return self._cdf_data
+
+    def get_empirical_ppf(self) -> PPFData:
+        """
+        Get the empirical PPF of the totals, see `get_empirical_ppf()`.
+
+        Returns
+        -------
+        PPFData
+            An object containing the cost values at each percentile and the corresponding percentiles.
+        """
+        return self._ppf_data
+
+    def get_histogram_data(self) -> HistogramData:
+        """
+        Get the histogram of the non-zero totals, see `get_histogram_data()`.
+
+        Returns
+        -------
+        HistogramData
+            An object containing the histogram bin edges and the normalized frequency.
+        """
+        return self._histogram_data
+
+    def get_p_value(self, p_value: float) -> float:
+        """
+        Retrieve the cost associated with a specific non-exceedance probability (p-value).
+
+        Parameters
+        ----------
+        p_value : float
+            The non-exceedance probability, see `get_p_value()`.
+
+        Returns
+        -------
+        float
+            The cost value corresponding to the specified p-value, rounded to two decimal places.
+        """
+        return get_p_value(self, p_value)
+
+    def get_costs(self, p_values: np.ndarray | float) -> np.ndarray:
+        """
+        Retrieve the costs at any number of non-exceedance probabilities, see `get_costs()`.
+
+        Parameters
+        ----------
+        p_values : np.ndarray or float
+            The non-exceedance probabilities, between `0` and `1`.
+
+        Returns
+        -------
+        np.ndarray
+            The cost at each of `p_values`.
+        """
+        return get_costs(self.sorted_totals, p_values, is_sorted=True)
+
+    def get_non_exceedance_probabilities(self, costs: np.ndarray | float) -> np.ndarray:
+        """
+        Retrieve the probability that each of any number of costs is not exceeded, see
+        `get_non_exceedance_probabilities()`.
+
+        Parameters
+        ----------
+        costs : np.ndarray or float
+            The costs to evaluate.
+
+        Returns
+        -------
+        np.ndarray
+            The non-exceedance probability of each of `costs`.
+        """
+        return get_non_exceedance_probabilities(self.sorted_totals, costs, is_sorted=True)
+
+
+def get_simulation_result(
+    risks: dict[str, dict[str, tuple[int, int, int] | float]] | RiskRegister,
+    iterations: int = ITERATIONS,
+    seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+    keep_samples: bool = True,
+    correlation: dict[str, dict] | np.ndarray | None = None,
+    correlation_method: str = "copula",
+    sampling: str = "random",
+    cache: SampleCache | None = None,
+    dtype: np.dtype = np.float64,
+) -> SimulationResult:
+    """
+    Simulate a register and return the result with its post-processing cached.
+
+    Parameters
+    ----------
+    risks : dict of str to dict of str to tuple or float, or RiskRegister
+        The risks to simulate, structured as for `get_aggregate_data()`.
+    iterations : int, optional
+        The number of iterations, by default `ITERATIONS`.
+    seed : int, SeedSequence, Generator or None, optional
+        The seed of the simulation, see `get_seed_sequence()`.
+    keep_samples : bool, optional
+        Whether to keep the per-risk samples in the result, by default `True`. Without them
+        the totals are built with `get_register_totals()`, which needs far less memory.
+    correlation : dict, np.ndarray or None, optional
+        The rank correlation between risks, see `get_correlation_groups()`, by default `None`
+        (independent risks).
+    correlation_method : str, optional
+        How correlation is induced, see `get_correlated_uniforms()`, by default "copula".
+    sampling : str, optional
+        How the samples are drawn, see `get_sample_matrix()`, by default "random". Other
+        methods need the whole sample matrix, so it is built even if `keep_samples` is `False`.
+    cache : SampleCache or None, optional
+        A cache of per-risk samples, by default `None`. Only the risks that are not in it are
+        sampled, see `get_cached_sample_matrix()`. It cannot be combined with correlation or
+        other sampling methods than "random".
+    dtype : np.dtype, optional
+        The floating point type of the samples and totals, by default `np.float64`. Use
+        `np.float32` to halve memory use and bandwidth, see Notes.
+
+    Returns
+    -------
+    SimulationResult
+        The result of the simulation. Its totals are identical to `get_aggregate_data()` with the
+        same seed.
+
+    Raises
+    ------
+    ValueError
+        If `cache` is combined with correlation or another sampling method than "random".
+
+    Notes
+    -----
+    With `dtype=np.float32`, every sample is computed in double precision and rounded, the
+    samples are summed in double precision, and each total is rounded once. The relative error
+    of a total is therefore at most `(number of risks + 1) * 2**-24`, where `2**-24` is about
+    `6e-8`, or one cent in $170,000, and rounding errors mostly cancel in practice. Percentiles
+    are interpolated in double precision from the rounded totals. Against the double precision
+    path with the same seed, P10 to P99 of the test registers agree to within `1e-7`
+    relatively (see `test_get_simulation_result_float32`), far below the sampling error of any
+    practical number of iterations.
+
+    Example
+    -------
+    >>> result = get_simulation_result(risks, seed=42)
+    >>> [result.get_p_value(p) for p in (0.5, 0.8, 0.9)]
+    """
+    register = get_risk_register(risks)
+    seed = get_seed_sequence(seed)
+    if cache is not None:
+        if correlation is not None or sampling != "random":
+            raise ValueError(
+                "A cache can only be used for independent risks with random sampling."
+            )
+        samples = get_cached_sample_matrix(register, cache, iterations, seed)
+        samples = samples.astype(dtype, copy=False)
+        totals = sum_sample_matrix(samples, register.names)
+        if not keep_samples:
+            samples = None
+    elif keep_samples or sampling != "random":
+        samples = get_sample_matrix(
+            register, iterations, seed, 0, correlation, correlation_method, sampling, dtype
+        )
+        totals = sum_sample_matrix(samples, register.names)
+        if not keep_samples:
+            samples = None
+    else:
+        samples = None
+        totals = get_register_totals(
+            register, iterations, seed, 0, correlation, correlation_method, dtype
+        )
+    return SimulationResult(
+        totals.astype(dtype, copy=False), samples=samples, register=register, seed=seed
+    )
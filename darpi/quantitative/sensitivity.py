@@ -0,0 +1,76 @@
+import numpy as np
+
+from darpi.config import RISK_BLOCK_SIZE, SensitivityData
+from darpi.quantitative.results import SimulationResult
+from darpi.quantitative.tail import get_value_at_risk
+
+
+def get_sensitivity_data(result: SimulationResult, p_value: float = 0.8) -> SensitivityData:
+    """
+    Measure how much each risk drives the upper tail of the total cost.
+
+    Parameters
+    ----------
+    result : SimulationResult
+        A result that kept its per-risk samples, e.g. from `get_simulation_result()`.
+    p_value : float, optional
+        The non-exceedance probability defining the tail, by default 0.8.
+
+    Returns
+    -------
+    SensitivityData
+        An object containing, for each risk of the register:
+        - `risk`: The name of the risk.
+        - `tail_contribution`: The mean cost of the risk over the iterations where the total is at
+          or above its cost at `p_value`. These sum to the mean total in that tail (the
+          conditional tail expectation).
+        - `rank_correlation`: The Spearman rank correlation between the risk and the total.
+        - `removal_delta`: How much the total cost at `p_value` drops when the risk is removed.
+
+    Raises
+    ------
+    ValueError
+        If `result` has no per-risk samples.
+
+    Notes
+    -----
+    Everything is computed from the samples already drawn, `RISK_BLOCK_SIZE` risks at a time, so
+    no risk is re-simulated. Removing a risk subtracts its row from the totals, and the new cost
+    at `p_value` is found by partial selection with `get_value_at_risk()` rather than by sorting.
+    """
+    from scipy import stats
+
+    if result.samples is None:
+        raise ValueError("`result` must keep its per-risk samples (`keep_samples=True`).")
+    samples, totals = result.samples, result.totals
+    total_cost = result.get_costs(p_value)
+    tail = (totals >= total_cost).astype(float)
+    total_ranks = stats.rankdata(totals)
+    total_ranks -= total_ranks.mean()
+
+    tail_contribution = np.empty(len(samples))
+    rank_correlation = np.empty(len(samples))
+    removal_delta = np.empty(len(samples))
+    for start in range(0, len(samples), RISK_BLOCK_SIZE):
+        block = slice(start, start + RISK_BLOCK_SIZE)
+        tail_contribution[block] = samples[block] @ tail / tail.sum()
+
+        ranks = stats.rankdata(samples[block], axis=1)
+        ranks -= ranks.mean(axis=1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rank_correlation[block] = (ranks @ total_ranks) / (
+                np.linalg.norm(ranks, axis=1) * np.linalg.norm(total_ranks)
+            )
+
+        removal_delta[block] = total_cost - get_value_at_risk(totals - samples[block], p_value)
+
+    if result.register is not None:
+        risk = np.asarray(result.register.names)
+    else:
+        risk = np.arange(len(samples))
+    return SensitivityData(
+        risk=risk,
+        tail_contribution=tail_contribution,
+        rank_correlation=np.nan_to_num(rank_correlation),
+        removal_delta=removal_delta,
+    )
@@ -0,0 +1,124 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from darpi.config import RiskRegister
+from darpi.quantitative.results import SimulationResult
+
+FORMAT_VERSION = 1
+
+
+def save_simulation_result(result: SimulationResult, directory: str | Path) -> Path:
+    """
+    Save a simulation result as a directory of `.npy` files and a `metadata.json` file.
+
+    Parameters
+    ----------
+    result : SimulationResult
+        The result to save, e.g. from `get_simulation_result()`. Totals from
+        `get_aggregate_data()` can be saved as `SimulationResult(totals)`.
+    directory : str or Path
+        The directory to save to. It is created if needed, and existing files are replaced.
+
+    Returns
+    -------
+    Path
+        The directory.
+
+    Notes
+    -----
+    The directory contains `totals.npy`, `sorted_totals.npy`, `samples.npy` if the result kept
+    its per-risk samples, and `metadata.json` with the number of iterations, the register and
+    the seed. Each array is a separate `.npy` file, rather than a `.npz` archive, so that it can
+    be memory-mapped by `load_simulation_result()`.
+
+    Example
+    -------
+    >>> result = get_simulation_result(risks, iterations=int(1e7), seed=42)
+    >>> save_simulation_result(result, "runs/2024-06")
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    np.save(directory / "totals.npy", result.totals)
+    np.save(directory / "sorted_totals.npy", result.sorted_totals)
+    if result.samples is not None:
+        np.save(directory / "samples.npy", result.samples)
+    elif (directory / "samples.npy").exists():
+        (directory / "samples.npy").unlink()
+
+    metadata = {"version": FORMAT_VERSION, "iterations": result.iterations}
+    if result.register is not None:
+        metadata["register"] = {
+            field: np.asarray(values).tolist()
+            for field, values in result.register._asdict().items()
+        }
+    if result.seed is not None:
+        metadata["seed"] = {
+            "entropy": np.asarray(result.seed.entropy).tolist(),
+            "spawn_key": [int(key) for key in result.seed.spawn_key],
+            "pool_size": result.seed.pool_size,
+        }
+    (directory / "metadata.json").write_text(json.dumps(metadata, indent=2))
+    return directory
+
+
+def load_simulation_result(
+    directory: str | Path, mmap_mode: str | None = "r"
+) -> SimulationResult:
+    """
+    Load a simulation result saved by `save_simulation_result()`.
+
+    Parameters
+    ----------
+    directory : str or Path
+        The directory the result was saved to.
+    mmap_mode : str or None, optional
+        How the arrays are memory-mapped, see `numpy.load()`, by default "r" (read-only). Opening
+        a mapped result is instant whatever its size, and only the parts that are used are read
+        from disk. Use `None` to read the arrays into memory.
+
+    Returns
+    -------
+    SimulationResult
+        The result, with its sorted totals already in place, so no query needs to sort.
+
+    Raises
+    ------
+    ValueError
+        If the directory was saved in an unknown format version.
+    """
+    directory = Path(directory)
+    metadata = json.loads((directory / "metadata.json").read_text())
+    if metadata.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unknown simulation format version: {metadata.get('version')}.")
+
+    register = None
+    if "register" in metadata:
+        fields = metadata["register"]
+        register = RiskRegister(
+            names=np.asarray(fields["names"], dtype=object),
+            **{
+                field: np.asarray(values, dtype=float)
+                for field, values in fields.items()
+                if field != "names"
+            },
+        )
+    seed = None
+    if "seed" in metadata:
+        seed = np.random.SeedSequence(
+            metadata["seed"]["entropy"],
+            spawn_key=tuple(metadata["seed"]["spawn_key"]),
+            pool_size=metadata["seed"]["pool_size"],
+        )
+    samples = None
+    if (directory / "samples.npy").exists():
+        samples = np.load(directory / "samples.npy", mmap_mode=mmap_mode)
+
+    return SimulationResult(
+        np.load(directory / "totals.npy", mmap_mode=mmap_mode),
+        samples=samples,
+        register=register,
+        seed=seed,
+        sorted_totals=np.load(directory / "sorted_totals.npy", mmap_mode=mmap_mode),
+    )
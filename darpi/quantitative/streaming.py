@@ -0,0 +1,284 @@
+import numpy as np
+
+from darpi.config import (
+    CHUNK_SIZE,
+    ITERATIONS,
+    QUANTILE_BINS,
+    CDFData,
+    HistogramData,
+    PPFData,
+    RiskRegister,
+)
+from darpi.quantitative.correlation import get_correlation_groups
+from darpi.quantitative.probability import (
+    get_p_value,
+    get_register_totals,
+    get_seed_sequence,
+)
+from darpi.quantitative.register import get_risk_register
+
+
+class StreamingSummary:
+    """
+    Running summary of simulated total costs, updated one chunk of iterations at a time.
+
+    The summary keeps a fixed-bin histogram over `[0, upper]`, the number of zero-cost
+    iterations and the exact smallest non-zero and largest totals. Its size depends on `bins`
+    only, so any number of iterations can be summarized in bounded memory.
+
+    Parameters
+    ----------
+    upper : float
+        The largest total that can occur, e.g. the sum of the maximum cost of every risk. It
+        must be positive.
+    bins : int, optional
+        The number of histogram bins, by default `QUANTILE_BINS`. Quantiles are interpolated
+        within a bin, so their error is at most `upper / bins`.
+
+    Attributes
+    ----------
+    counts : np.ndarray
+        The number of non-zero totals in each bin.
+    zeros : int
+        The number of totals equal to zero.
+    iterations : int
+        The number of totals summarized so far.
+    minimum : float
+        The smallest non-zero total.
+    maximum : float
+        The largest total.
+
+    Raises
+    ------
+    ValueError
+        If `upper` is not positive.
+    """
+
+    def __init__(self, upper: float, bins: int = QUANTILE_BINS):
+        if not upper > 0:
+            raise ValueError("`upper` must be positive.")
+        self.upper = float(upper)
+        self.edges = np.linspace(0, self.upper, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.zeros = 0
+        self.iterations = 0
+        self.minimum = np.inf
+        self.maximum = 0.0
+
+    def update(self, totals: np.ndarray) -> None:
+        """
+        Add a chunk of totals to the summary.
+
+        Parameters
+        ----------
+        totals : np.ndarray
+            The total cost at each iteration of the chunk.
+
+        Raises
+        ------
+        ValueError
+            If any total is negative, as the histogram starts at zero.
+        """
+        non_zero = totals[totals != 0]
+        if (non_zero < 0).any():
+            raise ValueError("Negative totals cannot be summarized.")
+        self.iterations += len(totals)
+        self.zeros += len(totals) - len(non_zero)
+        if len(non_zero) == 0:
+            return
+        self.minimum = min(self.minimum, non_zero.min())
+        self.maximum = max(self.maximum, non_zero.max())
+        bins = len(self.counts)
+        index = np.minimum((non_zero * (bins / self.upper)).astype(np.int64), bins - 1)
+        self.counts += np.bincount(index, minlength=bins)
+
+    def _get_edge_probabilities(self) -> np.ndarray:
+        return (
+            self.zeros + np.concatenate([[0], np.cumsum(self.counts)])
+        ) / self.iterations
+
+    def get_empirical_cdf(self) -> CDFData:
+        """
+        Calculate the cumulative distribution function at the upper edge of each occupied bin.
+
+        Returns
+        -------
+        CDFData
+            An object containing the bin edges and corresponding cumulative probabilities.
+        """
+        occupied = self.counts != 0
+        p = (self.zeros + np.cumsum(self.counts)) / self.iterations
+        cost = np.minimum(self.edges[1:], self.maximum)
+        return CDFData(cost=cost[occupied], p=p[occupied])
+
+    def get_empirical_ppf(self) -> PPFData:
+        """
+        Calculate the percent-point function (PPF) at every percentile.
+
+        Returns
+        -------
+        PPFData
+            An object containing the cost values at each percentile and the corresponding
+            percentiles, laid out as by `get_empirical_ppf()`.
+        """
+        p_values = np.linspace(start=0, stop=1, num=101)
+        cumulative_probs = self._get_edge_probabilities()
+        cost = np.interp(p_values, cumulative_probs, self.edges)
+        cost[-1] = self.maximum
+        non_zero = cost != 0
+        cost[non_zero] = np.clip(cost[non_zero], self.minimum, self.maximum)
+
+        # Add the `1-risk_probability` value to the array as the lower bound
+        lower_limit_index = len(cost[cost == 0]) - 1
+        if lower_limit_index >= 0:
+            cost[lower_limit_index] = self.minimum
+
+        return PPFData(cost=cost, p=p_values)
+
+    def get_histogram_data(self, num_bins: int = 40) -> HistogramData:
+        """
+        Calculate histogram data, excluding zero values and normalizing by total iterations.
+
+        Parameters
+        ----------
+        num_bins : int, optional
+            The number of bins, by default 40, spanning the non-zero totals as in
+            `get_histogram_data()`.
+
+        Returns
+        -------
+        HistogramData
+            An object containing the histogram bin edges and the normalized frequency.
+        """
+        centers = (self.edges[:-1] + self.edges[1:]) / 2
+        hist, bin_edges = np.histogram(
+            np.clip(centers, self.minimum, self.maximum),
+            bins=num_bins,
+            range=(self.minimum, self.maximum),
+            weights=self.counts,
+        )
+        return HistogramData(cost=bin_edges, frequency=hist / self.iterations)
+
+    def get_p_value(self, p_value: float) -> float:
+        """
+        Retrieve the cost associated with a specific non-exceedance probability (p-value).
+
+        Parameters
+        ----------
+        p_value : float
+            The non-exceedance probability, see `get_p_value()`.
+
+        Returns
+        -------
+        float
+            The cost value corresponding to the specified p-value, rounded to two decimal places.
+        """
+        return get_p_value(self, p_value)
+
+    def get_costs(self, p_values: np.ndarray | float) -> np.ndarray:
+        """
+        Retrieve the costs at any number of non-exceedance probabilities.
+
+        Parameters
+        ----------
+        p_values : np.ndarray or float
+            The non-exceedance probabilities, between `0` and `1`.
+
+        Returns
+        -------
+        np.ndarray
+            The cost at each of `p_values`, interpolated within histogram bins.
+        """
+        cumulative_probs = self._get_edge_probabilities()
+        cost = np.interp(p_values, cumulative_probs, self.edges)
+        return np.where(cost != 0, np.clip(cost, self.minimum, self.maximum), 0.0)
+
+    def get_non_exceedance_probabilities(self, costs: np.ndarray | float) -> np.ndarray:
+        """
+        Retrieve the probability that each of any number of costs is not exceeded.
+
+        Parameters
+        ----------
+        costs : np.ndarray or float
+            The costs to evaluate.
+
+        Returns
+        -------
+        np.ndarray
+            The non-exceedance probability of each of `costs`, interpolated within histogram bins.
+        """
+        cumulative_probs = self._get_edge_probabilities()
+        return np.interp(costs, self.edges, cumulative_probs, left=0.0)
+
+
+def get_streaming_summary(
+    risks: dict[str, dict[str, tuple[int, int, int] | float]] | RiskRegister,
+    iterations: int = ITERATIONS,
+    seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    bins: int = QUANTILE_BINS,
+    correlation: dict[str, dict] | np.ndarray | None = None,
+    correlation_method: str = "copula",
+) -> StreamingSummary:
+    """
+    Simulate a register in fixed-size chunks of iterations, keeping only a running summary.
+
+    Parameters
+    ----------
+    risks : dict of str to dict of str to tuple or float, or RiskRegister
+        The risks to simulate, structured as for `get_aggregate_data()`.
+    iterations : int, optional
+        The total number of iterations, by default `ITERATIONS`.
+    seed : int, SeedSequence, Generator or None, optional
+        The seed of the simulation, see `get_seed_sequence()`.
+    chunk_size : int, optional
+        The number of iterations simulated at a time, by default `CHUNK_SIZE`.
+    bins : int, optional
+        The number of histogram bins of the summary, by default `QUANTILE_BINS`.
+    correlation : dict, np.ndarray or None, optional
+        The rank correlation between risks, see `get_correlation_groups()`, by default `None`
+        (independent risks).
+    correlation_method : str, optional
+        How correlation is induced, see `get_correlated_uniforms()`, by default "copula". Only
+        "copula" gives results that do not depend on `chunk_size`.
+
+    Returns
+    -------
+    StreamingSummary
+        The summary of all iterations, which provides the PPF, CDF, histogram and p-values.
+
+    Raises
+    ------
+    ValueError
+        If any cost is negative, or no risk can cost anything. The histogram of the summary
+        starts at zero, so registers with savings (negative costs) must be simulated, e.g.
+        with `get_simulation_result()`.
+
+    Notes
+    -----
+    The totals of each chunk are identical to the corresponding slice of `get_aggregate_data()`
+    with the same seed, but are discarded once added to the summary, so memory use does not grow
+    with `iterations`.
+
+    Example
+    -------
+    >>> summary = get_streaming_summary(risks, iterations=int(1e8), seed=42)
+    >>> summary.get_p_value(0.9)
+    """
+    register = get_risk_register(risks)
+    if (register.minimum < 0).any():
+        raise ValueError("Negative costs are not supported by the streaming summary.")
+    seed = get_seed_sequence(seed)
+    groups = get_correlation_groups(register, correlation)
+    summary = StreamingSummary(upper=register.maximum.sum(), bins=bins)
+    for start in range(0, iterations, chunk_size):
+        totals = get_register_totals(
+            register,
+            min(chunk_size, iterations - start),
+            seed,
+            start,
+            groups,
+            correlation_method,
+        )
+        summary.update(totals)
+    return summary
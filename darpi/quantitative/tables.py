@@ -1,10 +1,21 @@
+from typing import TYPE_CHECKING
+
 import numpy as np
-import pandas as pd
 
-from darpi.quantitative.probability import get_empirical_ppf
+from darpi.config import PortfolioData
+from darpi.quantitative.analytic import AnalyticDistribution
+from darpi.quantitative.probability import get_costs, get_empirical_ppf
+from darpi.quantitative.results import SimulationResult
+from darpi.quantitative.sensitivity import get_sensitivity_data
+from darpi.quantitative.streaming import StreamingSummary
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
-def get_non_exceedance_table(data: np.ndarray) -> pd.DataFrame:
+def get_non_exceedance_table(
+    data: np.ndarray | SimulationResult | StreamingSummary | AnalyticDistribution,
+) -> "pd.DataFrame":
     """
     Generate a non-exceedance probability table from empirical data.
 
@@ -14,8 +25,10 @@ def get_non_exceedance_table(data: np.ndarray) -> pd.DataFrame:
 
     Parameters
     ----------
-    data : np.ndarray
-        An array of data points from which to compute the empirical PPF.
+    data : np.ndarray, SimulationResult, StreamingSummary or AnalyticDistribution
+        An array of data points from which to compute the empirical PPF, or a result that
+        provides its own, such as from `get_simulation_result()`, `get_streaming_summary()` or
+        `get_analytic_distribution()`.
 
     Returns
     -------
@@ -44,5 +57,84 @@ def get_non_exceedance_table(data: np.ndarray) -> pd.DataFrame:
     data value at that quantile.
 
     """
-    ppf_data = get_empirical_ppf(data)
+    import pandas as pd
+
+    if isinstance(data, np.ndarray):
+        ppf_data = get_empirical_ppf(data)
+    else:
+        ppf_data = data.get_empirical_ppf()
     return pd.DataFrame({field: getattr(ppf_data, field) for field in ppf_data._fields})
+
+
+def get_sensitivity_table(
+    result: SimulationResult, p_value: float = 0.8
+) -> "pd.DataFrame":
+    """
+    Generate a table ranking how much each risk drives the upper tail of the total cost.
+
+    Parameters
+    ----------
+    result : SimulationResult
+        A result that kept its per-risk samples, e.g. from `get_simulation_result()`.
+    p_value : float, optional
+        The non-exceedance probability defining the tail, by default 0.8.
+
+    Returns
+    -------
+    pd.DataFrame
+        A DataFrame with one row per risk and the columns of the `SensitivityData` namedtuple
+        (see `get_sensitivity_data()`), sorted by `removal_delta` in descending order so it can
+        be plotted directly as a tornado chart.
+
+    Example
+    -------
+    >>> result = get_simulation_result(risks, seed=42)
+    >>> get_sensitivity_table(result, p_value=0.9).head(10)
+    """
+    import pandas as pd
+
+    sensitivity_data = get_sensitivity_data(result, p_value=p_value)
+    table = pd.DataFrame(
+        {field: getattr(sensitivity_data, field) for field in sensitivity_data._fields}
+    )
+    return table.sort_values("removal_delta", ascending=False, ignore_index=True)
+
+
+def get_portfolio_table(
+    portfolio: PortfolioData, p_values: np.ndarray | None = None
+) -> "pd.DataFrame":
+    """
+    Generate a table of the non-exceedance costs of every node of a portfolio.
+
+    Parameters
+    ----------
+    portfolio : PortfolioData
+        The node totals, from `get_portfolio_data()`.
+    p_values : np.ndarray or None, optional
+        The non-exceedance probabilities to tabulate, by default `None`, for the same
+        percentiles as `get_non_exceedance_table()`.
+
+    Returns
+    -------
+    pd.DataFrame
+        A DataFrame with one row per node, in the order of `portfolio.nodes`, containing:
+        - `node`: The path of the node joined with " / ", or "Total" for the whole portfolio.
+        - `level`: The depth of the node, `0` for the whole portfolio.
+        - One column for each of `p_values`, holding the cost of the node at that probability.
+
+    Notes
+    -----
+    The totals of all nodes are sorted together in a single call.
+    """
+    import pandas as pd
+
+    sorted_totals = np.sort(portfolio.totals, axis=1)
+    if p_values is None:
+        p_values = get_empirical_ppf(sorted_totals[0], is_sorted=True).p
+        costs = [get_empirical_ppf(row, is_sorted=True).cost for row in sorted_totals]
+    else:
+        costs = [get_costs(row, p_values, is_sorted=True) for row in sorted_totals]
+    table = pd.DataFrame(np.asarray(costs), columns=p_values)
+    table.insert(0, "node", [" / ".join(node) or "Total" for node in portfolio.nodes])
+    table.insert(1, "level", [len(node) for node in portfolio.nodes])
+    return table
@@ -0,0 +1,199 @@
+import numpy as np
+
+
+def _get_levels(levels: np.ndarray | float, name: str = "levels") -> np.ndarray:
+    levels = np.asarray(levels, dtype=float)
+    if ((levels < 0) | (levels > 1)).any():
+        raise ValueError(f"`{name}` must be between `0` and `1`")
+    return levels
+
+
+def get_value_at_risk(data: np.ndarray, levels: np.ndarray | float) -> np.ndarray:
+    """
+    Calculate the cost that is not exceeded with each of any number of probabilities.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        The samples, along the last axis. Leading axes hold separate simulations, e.g. an
+        array of shape `(number of registers, iterations)`.
+    levels : np.ndarray or float
+        The non-exceedance probabilities, between `0` and `1`, e.g. `0.9` for the P90.
+
+    Returns
+    -------
+    np.ndarray
+        The cost at each level, of shape `data.shape[:-1] + np.shape(levels)`.
+
+    Raises
+    ------
+    ValueError
+        If any level is not between `0` and `1`.
+
+    Notes
+    -----
+    The costs are those of `get_costs()`, but the samples are only partially ordered with a
+    single `np.partition()` around the positions the levels need, which takes linear time
+    rather than the `n log n` of a full sort.
+
+    Example
+    -------
+    >>> get_value_at_risk(result.totals, [0.5, 0.8, 0.9])
+    """
+    data = np.asarray(data)
+    levels = _get_levels(levels)
+    n = data.shape[-1]
+    position = np.clip(levels * n - 1, 0, n - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, n - 1)
+    partitioned = np.partition(data, np.unique(np.concatenate([lower.ravel(), upper.ravel()])))
+    fraction = position - lower
+    return partitioned[..., lower] + fraction * (
+        partitioned[..., upper] - partitioned[..., lower]
+    )
+
+
+def get_expected_shortfall(data: np.ndarray, levels: np.ndarray | float) -> np.ndarray:
+    """
+    Calculate the mean cost of the worst outcomes beyond each of any number of probabilities,
+    also known as the conditional value at risk (CVaR).
+
+    Parameters
+    ----------
+    data : np.ndarray
+        The samples, along the last axis, see `get_value_at_risk()`.
+    levels : np.ndarray or float
+        The non-exceedance probabilities, between `0` and `1`, e.g. `0.9` for the mean of the
+        costliest 10% of iterations.
+
+    Returns
+    -------
+    np.ndarray
+        The expected shortfall at each level, of shape `data.shape[:-1] + np.shape(levels)`.
+
+    Raises
+    ------
+    ValueError
+        If any level is not between `0` and `1`.
+
+    Notes
+    -----
+    The expected shortfall at `level` is the mean of the largest `n - floor(level * n)` of
+    `n` samples, or the largest sample at `level == 1`. Unlike `get_tail_mean()` at the cost
+    at `level`, it always averages the same number of samples, however many are tied. One
+    `np.partition()` splits the samples at every level at once, and the means are read from a
+    cumulative sum over the tail beyond the lowest level.
+
+    Example
+    -------
+    >>> contingency = get_expected_shortfall(result.totals, 0.9)
+    """
+    data = np.asarray(data)
+    levels = _get_levels(levels)
+    n = data.shape[-1]
+    count = np.maximum(n - np.floor(levels * n).astype(np.int64), 1)
+    partitioned = np.partition(data, np.unique(n - count))
+    tail = partitioned[..., n - count.max() :]
+    # Sum of the largest k samples is the sum of the last k entries of the tail
+    tail_sums = np.cumsum(tail[..., ::-1], axis=-1, dtype=np.float64)
+    return tail_sums[..., count - 1] / count
+
+
+def _search_sorted(
+    data: np.ndarray, costs: np.ndarray, side: str
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sort the samples once and find the position of every cost among them.
+
+    Returns the sorted samples and, for each cost, the number of samples below it (`side`
+    "left") or at or below it (`side` "right"), of shape `data.shape[:-1] + costs.shape`.
+    """
+    sorted_data = np.sort(data, axis=-1)
+    rows = sorted_data.reshape(-1, data.shape[-1])
+    positions = np.stack([np.searchsorted(row, costs.ravel(), side=side) for row in rows])
+    return sorted_data, positions.reshape(data.shape[:-1] + costs.shape)
+
+
+def get_tail_mean(data: np.ndarray, costs: np.ndarray | float) -> np.ndarray:
+    """
+    Calculate the mean cost of the iterations that reach each of any number of costs.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        The samples, along the last axis, see `get_value_at_risk()`.
+    costs : np.ndarray or float
+        The thresholds, e.g. a budget.
+
+    Returns
+    -------
+    np.ndarray
+        The mean of the samples at or above each cost, of shape
+        `data.shape[:-1] + np.shape(costs)`, or `nan` where no sample reaches the cost.
+
+    Notes
+    -----
+    A single cost takes one linear pass over the samples. An array of costs sorts the samples
+    once, finds every cost with `np.searchsorted()` and reads the sums of the tails from one
+    cumulative sum, so many budgets cost little more than one. With the cost at a given level,
+    e.g. from `get_value_at_risk()`, this is the conditional tail expectation used by
+    `get_sensitivity_data()`.
+
+    Example
+    -------
+    >>> get_tail_mean(result.totals, budget)
+    """
+    data = np.asarray(data)
+    costs = np.asarray(costs, dtype=float)
+    n = data.shape[-1]
+    if costs.ndim == 0:
+        reached = data >= costs
+        count = np.count_nonzero(reached, axis=-1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.sum(data, axis=-1, where=reached, dtype=np.float64) / count
+    sorted_data, positions = _search_sorted(data, costs, side="left")
+    # tail_sums[..., i] is the sum of the samples from sorted position i onwards
+    tail_sums = np.zeros(data.shape[:-1] + (n + 1,))
+    reversed_sums = tail_sums[..., n - 1 :: -1]
+    np.cumsum(sorted_data[..., ::-1], axis=-1, dtype=np.float64, out=reversed_sums)
+    sums = np.take_along_axis(
+        tail_sums.reshape(-1, n + 1), positions.reshape(-1, costs.size), axis=-1
+    ).reshape(positions.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return sums / (n - positions)
+
+
+def get_exceedance_probability(data: np.ndarray, costs: np.ndarray | float) -> np.ndarray:
+    """
+    Calculate the probability that each of any number of costs is exceeded.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        The samples, along the last axis, see `get_value_at_risk()`.
+    costs : np.ndarray or float
+        The costs to evaluate, e.g. a budget.
+
+    Returns
+    -------
+    np.ndarray
+        The proportion of samples above each cost, of shape
+        `data.shape[:-1] + np.shape(costs)`.
+
+    Notes
+    -----
+    This is `1 - get_non_exceedance_probabilities()`. A single cost is counted in one linear
+    pass, so one-off questions about unsorted samples need no sort; an array of costs sorts
+    the samples once and finds every cost with `np.searchsorted()`.
+
+    Example
+    -------
+    >>> get_exceedance_probability(result.totals, budget)
+    """
+    data = np.asarray(data)
+    costs = np.asarray(costs, dtype=float)
+    n = data.shape[-1]
+    if costs.ndim == 0:
+        return np.count_nonzero(data > costs, axis=-1) / n
+    _, positions = _search_sorted(data, costs, side="right")
+    return (n - positions) / n
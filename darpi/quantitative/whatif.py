@@ -0,0 +1,157 @@
+import numpy as np
+
+from darpi.config import ITERATIONS, RiskRegister
+from darpi.quantitative.probability import (
+    get_sample_matrix,
+    get_seed_sequence,
+    sum_sample_matrix,
+)
+from darpi.quantitative.register import get_register_subset, get_risk_register
+from darpi.quantitative.results import SimulationResult
+
+
+class RegisterSimulation:
+    """
+    Simulation of a risk register that can be edited one risk at a time.
+
+    The per-risk samples and their total are kept, so editing, adding or removing a risk
+    samples only that risk and updates the total by subtracting its old samples and adding the
+    new ones.
+
+    Parameters
+    ----------
+    risks : dict of str to dict of str to tuple or float, or RiskRegister
+        The risks to simulate, structured as for `get_aggregate_data()`.
+    iterations : int, optional
+        The number of iterations, by default `ITERATIONS`.
+    seed : int, SeedSequence, Generator or None, optional
+        The seed of the simulation, see `get_seed_sequence()`.
+
+    Attributes
+    ----------
+    register : RiskRegister
+        The current risks.
+    samples : np.ndarray
+        The samples of each risk of `register`, of shape `(number of risks, iterations)`.
+    totals : np.ndarray
+        The total cost at each iteration.
+
+    Notes
+    -----
+    Every risk is drawn from its own stream, keyed on its name, so an edited risk reuses the
+    uniform draws it had before and the change in the total is due to the edit alone. After
+    edits, the totals match a fresh simulation of the same register up to floating point
+    rounding; use `resum()` to make them bit-for-bit identical again.
+
+    Example
+    -------
+    >>> simulation = RegisterSimulation(risks, seed=42)
+    >>> simulation.set_risk("Risk 2", costs=(2000, 3000, 6000), probability=0.5)
+    >>> simulation.get_result().get_p_value(0.8)
+    """
+
+    def __init__(
+        self,
+        risks: dict[str, dict[str, tuple[int, int, int] | float]] | RiskRegister,
+        iterations: int = ITERATIONS,
+        seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+    ):
+        self.register = get_risk_register(risks)
+        self.iterations = iterations
+        self.seed = get_seed_sequence(seed)
+        self.samples = get_sample_matrix(self.register, iterations, self.seed)
+        self.totals = sum_sample_matrix(self.samples, self.register.names)
+        self._result = None
+
+    def _get_index(self, name: str) -> int:
+        index = np.flatnonzero(np.asarray(self.register.names) == name)
+        if len(index) == 0:
+            raise KeyError(f"Unknown risk: {name}.")
+        return int(index[0])
+
+    def set_risk(
+        self, name: str, costs: tuple[float, float, float], probability: float
+    ) -> None:
+        """
+        Edit a risk, or add it if it is not in the register.
+
+        Parameters
+        ----------
+        name : str
+            The name of the risk.
+        costs : tuple of float
+            The minimum, mode and maximum cost of the risk.
+        probability : float
+            The probability that the risk occurs, between `0` and `1`.
+
+        Raises
+        ------
+        ValueError
+            If the risk is not valid, see `validate_risk_register()`.
+        """
+        row = get_risk_register({name: {"costs": costs, "probability": probability}})
+        samples = get_sample_matrix(row, self.iterations, self.seed)
+        if name in self.register.names:
+            index = self._get_index(name)
+            self.totals -= self.samples[index]
+            self.samples[index] = samples[0]
+            self.register = RiskRegister(
+                *(
+                    np.concatenate([field[:index], new, field[index + 1 :]])
+                    for field, new in zip(self.register, row)
+                )
+            )
+        else:
+            self.samples = np.concatenate([self.samples, samples])
+            self.register = RiskRegister(
+                *(np.concatenate([field, new]) for field, new in zip(self.register, row))
+            )
+        self.totals += samples[0]
+        self._result = None
+
+    def remove_risk(self, name: str) -> None:
+        """
+        Remove a risk from the register.
+
+        Parameters
+        ----------
+        name : str
+            The name of the risk.
+
+        Raises
+        ------
+        KeyError
+            If the risk is not in the register.
+        """
+        index = self._get_index(name)
+        self.totals -= self.samples[index]
+        keep = np.arange(len(self.register.names)) != index
+        self.samples = self.samples[keep]
+        self.register = get_register_subset(self.register, keep)
+        self._result = None
+
+    def resum(self) -> None:
+        """
+        Recalculate the totals from the per-risk samples, removing accumulated rounding error.
+        """
+        self.totals = sum_sample_matrix(self.samples, self.register.names)
+        self._result = None
+
+    def get_result(self) -> SimulationResult:
+        """
+        Get the result of the current register.
+
+        Returns
+        -------
+        SimulationResult
+            The result, cached until the next edit. It shares the samples of the simulation, so
+            it should be taken again after an edit.
+        """
+        if self._result is None:
+            self._result = SimulationResult(
+                self.totals.copy(),
+                samples=self.samples,
+                register=self.register,
+                seed=self.seed,
+            )
+        return self._result
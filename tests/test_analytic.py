@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from darpi.config import CDFData, HistogramData, PPFData
+from darpi.quantitative.analytic import (
+    AnalyticDistribution,
+    get_analytic_distribution,
+    get_risk_pmfs,
+)
+from darpi.quantitative.register import get_risk_register
+from darpi.quantitative.results import get_simulation_result
+from darpi.quantitative.tables import get_non_exceedance_table
+
+risks = {
+    "Risk 1": {"costs": (1000, 2000, 5000), "probability": 0.6},
+    "Risk 2": {"costs": (2000, 4000, 8000), "probability": 0.8},
+    "Risk 3": {"costs": (2800, 4000, 10000), "probability": 0.5},
+}
+
+
+def test_get_risk_pmfs():
+    register = get_risk_register(risks)
+    pmfs = get_risk_pmfs(register, step=10.0, length=2000)
+    assert pmfs.shape == (3, 2000)
+    assert np.allclose(pmfs.sum(axis=1), 1)
+    assert np.allclose(pmfs[:, 0], 1 - register.probability)
+    mean = (pmfs * np.arange(2000) * 10.0).sum(axis=1)
+    expected = register.probability * (register.minimum + register.mode + register.maximum) / 3
+    assert np.allclose(mean, expected, rtol=1e-4)
+
+
+def test_get_analytic_distribution():
+    distribution = get_analytic_distribution(risks)
+    assert isinstance(distribution, AnalyticDistribution)
+    assert np.isclose(distribution.pmf.sum(), 1)
+    assert np.isclose(distribution.pmf[0], 0.4 * 0.2 * 0.5)
+    assert distribution.minimum == 1000
+
+    result = get_simulation_result(risks, iterations=int(1e6), seed=1, keep_samples=False)
+    p_values = np.asarray([0.1, 0.5, 0.8, 0.9, 0.99])
+    assert np.allclose(distribution.get_costs(p_values), result.get_costs(p_values), rtol=5e-3)
+    costs = result.get_costs(p_values)
+    assert np.allclose(distribution.get_non_exceedance_probabilities(costs), p_values, atol=2e-3)
+    assert (distribution.get_costs([0, 0.04]) == 0).all()
+
+
+def test_analytic_distribution_outputs():
+    distribution = get_analytic_distribution(risks)
+    assert isinstance(distribution.get_empirical_cdf(), CDFData)
+    assert isinstance(distribution.get_histogram_data(), HistogramData)
+    assert np.isclose(distribution.get_histogram_data().frequency.sum(), 1 - 0.04)
+
+    ppf_data = distribution.get_empirical_ppf()
+    assert isinstance(ppf_data, PPFData)
+    assert (ppf_data.cost[:4] == 0).all()
+    assert ppf_data.cost[4] == distribution.minimum
+    assert (np.diff(ppf_data.cost) >= 0).all()
+    assert distribution.get_p_value(0.8) == ppf_data.cost[80].round(2)
+
+    table = get_non_exceedance_table(distribution)
+    assert np.allclose(table["cost"], ppf_data.cost)
+
+
+def test_get_analytic_distribution_negative_costs():
+    risks = {"Saving": {"costs": (-500, -100, 200), "probability": 1}}
+    with pytest.raises(ValueError, match="Negative costs"):
+        get_analytic_distribution(risks)
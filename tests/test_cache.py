@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from darpi.quantitative.cache import (
+    SampleCache,
+    get_cached_sample_matrix,
+    get_sample_key,
+)
+from darpi.quantitative.probability import get_sample_matrix, get_seed_sequence
+from darpi.quantitative.register import get_risk_register
+from darpi.quantitative.results import get_simulation_result
+
+risks = {
+    "Risk 1": {"costs": (1000, 2000, 5000), "probability": 0.6},
+    "Risk 2": {"costs": (2000, 4000, 8000), "probability": 0.8},
+    "Risk 3": {"costs": (2800, 4000, 10000), "probability": 0.5},
+}
+
+
+def test_get_sample_key():
+    seed = get_seed_sequence(1)
+    key = get_sample_key(1000, 2000, 5000, 0.6, 100, seed, "Risk 1")
+    assert key == get_sample_key(1000.0, 2000.0, 5000.0, 0.6, 100, get_seed_sequence(1), "Risk 1")
+    assert key != get_sample_key(1000, 2000, 5000, 0.5, 100, seed, "Risk 1")
+    assert key != get_sample_key(1000, 2000, 5000, 0.6, 100, get_seed_sequence(2), "Risk 1")
+    assert key != get_sample_key(1000, 2000, 5000, 0.6, 100, seed, "Risk 2")
+
+
+def test_sample_cache_eviction():
+    cache = SampleCache(max_bytes=2 * 800)
+    for key in "abc":
+        cache.put(key, np.zeros(100))
+    assert len(cache) == 2
+    assert cache.nbytes == 1600
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    cache.put("d", np.zeros(100))
+    assert cache.get("c") is None
+    assert cache.get("b") is not None
+    assert (cache.hits, cache.misses) == (2, 2)
+    with pytest.raises(ValueError):
+        cache.get("b")[0] = 1
+
+
+def test_get_cached_sample_matrix(tmp_path):
+    register = get_risk_register(risks)
+    cache = SampleCache(directory=tmp_path)
+    samples = get_cached_sample_matrix(register, cache, iterations=1000, seed=1)
+    assert (samples == get_sample_matrix(register, 1000, seed=1)).all()
+    assert (cache.hits, cache.misses) == (0, 3)
+    assert len(list(tmp_path.glob("*.npy"))) == 3
+
+    revised = {**risks, "Risk 2": {"costs": (2000, 3000, 8000), "probability": 0.8}}
+    result = get_simulation_result(revised, iterations=1000, seed=1, cache=cache)
+    assert (result.totals == get_simulation_result(revised, iterations=1000, seed=1).totals).all()
+    assert (cache.hits, cache.misses) == (2, 4)
+
+    reloaded = SampleCache(directory=tmp_path)
+    assert (get_cached_sample_matrix(register, reloaded, iterations=1000, seed=1) == samples).all()
+    assert reloaded.misses == 0
+    key = get_sample_key(1000, 2000, 5000, 0.6, 1000, get_seed_sequence(1), "Risk 1")
+    assert isinstance(reloaded.get(key), np.memmap)
+
+    with pytest.raises(ValueError):
+        get_simulation_result(risks, iterations=1000, seed=1, cache=cache, sampling="sobol")
+
+
+def test_get_cached_sample_matrix_fresh_entropy(tmp_path):
+    cache = SampleCache(directory=tmp_path)
+    samples = get_cached_sample_matrix(get_risk_register(risks), cache, iterations=100)
+    assert samples.shape == (3, 100)
+    assert len(cache) == 0
+    assert cache.misses == 0
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from darpi.config import ConvergenceData
+from darpi.quantitative.convergence import get_batch_means_error, get_converged_result
+from darpi.quantitative.results import SimulationResult, get_simulation_result
+
+risks = {
+    "Risk 1": {"costs": (1000, 2000, 5000), "probability": 0.6},
+    "Risk 2": {"costs": (2000, 4000, 8000), "probability": 0.8},
+    "Risk 3": {"costs": (2800, 4000, 10000), "probability": 0.5},
+}
+
+
+def test_get_batch_means_error():
+    batch_costs = np.asarray([[1.0, 10.0], [3.0, 10.0]])
+    assert np.allclose(get_batch_means_error(batch_costs), [1.0, 0.0])
+
+
+def test_get_converged_result():
+    result, convergence = get_converged_result(risks, tolerance=0.01, seed=1, batch_size=1000)
+    assert isinstance(result, SimulationResult)
+    assert isinstance(convergence, ConvergenceData)
+    assert convergence.converged
+    assert convergence.iterations == result.iterations
+    assert result.iterations % 1000 == 0
+    assert (convergence.standard_error <= 0.01 * convergence.cost).all()
+
+    expected = get_simulation_result(
+        risks, iterations=result.iterations, seed=1, keep_samples=False
+    )
+    assert (result.totals == expected.totals).all()
+
+    tighter, tighter_convergence = get_converged_result(
+        risks, tolerance=0.002, seed=1, batch_size=1000
+    )
+    assert tighter_convergence.iterations > convergence.iterations
+
+
+def test_get_converged_result_max_iterations():
+    result, convergence = get_converged_result(
+        risks, tolerance=1e-6, seed=1, batch_size=1000, max_iterations=10000
+    )
+    assert not convergence.converged
+    assert result.iterations == 10000
+    result, _ = get_converged_result(
+        risks, tolerance=1e-6, seed=1, batch_size=1000, max_iterations=10500
+    )
+    assert result.iterations == 10000
+
+
+def test_get_converged_result_invalid_batches():
+    with pytest.raises(ValueError, match="min_batches"):
+        get_converged_result(risks, batch_size=1000, min_batches=1)
+    with pytest.raises(ValueError, match="max_iterations"):
+        get_converged_result(risks, batch_size=1000, min_batches=8, max_iterations=4000)
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from darpi.quantitative.correlation import get_correlated_uniforms, get_correlation_groups
+from darpi.quantitative.probability import (
+    get_aggregate_data,
+    get_register_totals,
+    get_sample_matrix,
+)
+from darpi.quantitative.register import get_risk_register
+
+risks = {
+    "Risk 1": {"costs": (1000, 2000, 5000), "probability": 1},
+    "Risk 2": {"costs": (2000, 4000, 8000), "probability": 1},
+    "Risk 3": {"costs": (2800, 4000, 10000), "probability": 0.5},
+    "Risk 4": {"costs": (100, 400, 1000), "probability": 0.02},
+}
+register = get_risk_register(risks)
+correlation = {"Ground": {"risks": ["Risk 1", "Risk 2"], "correlation": 0.7}}
+
+
+def test_get_correlation_groups():
+    ((names, matrix),) = get_correlation_groups(register, correlation)
+    assert list(names) == ["Risk 1", "Risk 2"]
+    assert (matrix == [[1, 0.7], [0.7, 1]]).all()
+
+    full = np.eye(4)
+    full[0, 2] = full[2, 0] = 0.5
+    ((names, matrix),) = get_correlation_groups(register, full)
+    assert list(names) == ["Risk 1", "Risk 3"]
+
+    assert get_correlation_groups(register, None) == []
+    with pytest.raises(ValueError, match="shape"):
+        get_correlation_groups(register, np.eye(2))
+    with pytest.raises(ValueError):
+        get_correlation_groups(register, {"Bad": {"risks": ["Risk 9", "Risk 1"], "correlation": 0.5}})
+    with pytest.raises(ValueError):
+        get_correlation_groups(register, {"Bad": {"risks": ["Risk 1", "Risk 2"], "correlation": [[1, 0.5], [0.2, 1]]}})
+
+
+@pytest.mark.parametrize("method", ["copula", "iman-conover"])
+def test_get_correlated_uniforms(method):
+    rng = np.random.default_rng(1)
+    uniforms = rng.random((3, 50000))
+    target = np.asarray([[1, 0.6, 0.3], [0.6, 1, 0.2], [0.3, 0.2, 1]])
+    correlated = get_correlated_uniforms(uniforms, target, method=method)
+    assert correlated.shape == uniforms.shape
+    assert np.allclose(stats.spearmanr(correlated, axis=1).statistic, target, atol=0.02)
+    assert np.allclose(correlated.mean(axis=1), 0.5, atol=0.01)
+    if method == "iman-conover":
+        assert (np.sort(correlated, axis=1) == np.sort(uniforms, axis=1)).all()
+
+
+def test_get_correlated_uniforms_not_positive_definite():
+    target = np.asarray([[1, 0.9, -0.9], [0.9, 1, 0.9], [-0.9, 0.9, 1]])
+    with pytest.raises(ValueError):
+        get_correlated_uniforms(np.random.rand(3, 10), target)
+
+
+def test_get_sample_matrix_correlation():
+    samples = get_sample_matrix(register, iterations=50000, seed=1, correlation=correlation)
+    assert np.isclose(stats.spearmanr(samples[0], samples[1]).statistic, 0.7, atol=0.02)
+    independent = get_sample_matrix(register, iterations=50000, seed=1)
+    assert (samples[2:] == independent[2:]).all()
+
+
+def test_get_register_totals_correlation():
+    samples = get_aggregate_data(
+        {risk: dict(details) for risk, details in risks.items()},
+        seed=2,
+        sparse_probability=0.05,
+        correlation=correlation,
+    )
+    totals = get_register_totals(register, iterations=len(samples), seed=2, correlation=correlation)
+    first = get_register_totals(register, iterations=400, seed=2, correlation=correlation)
+    second = get_register_totals(register, iterations=600, seed=2, start=400, correlation=correlation)
+    assert (np.concatenate([first, second]) == totals[:1000]).all()
+    assert np.isclose(samples.mean(), totals.mean(), rtol=0.01)
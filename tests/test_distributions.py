@@ -0,0 +1,140 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from darpi.quantitative.distributions import (
+    get_discrete_ppf,
+    get_distribution_groups,
+    get_lognormal_ppf,
+    get_mixed_aggregate_data,
+    get_mixed_sample_matrix,
+    get_pert_ppf,
+    get_uniform_ppf,
+)
+from darpi.quantitative.probability import get_aggregate_data
+
+TRIANGULAR_RISKS = {
+    "Risk 1": {"costs": (1000, 2000, 5000), "probability": 1},
+    "Risk 2": {"costs": (2000, 4000, 8000), "probability": 0.8},
+    "Risk 3": {"costs": (2800, 4000, 10000), "probability": 0.5},
+}
+MIXED_RISKS = {
+    "Risk 1": {"costs": (1000, 2000, 5000), "probability": 1},
+    "Risk 2": {"distribution": "pert", "costs": (2000, 4000, 8000), "probability": 0.8},
+    "Risk 3": {"distribution": "uniform", "costs": (500, 1500), "probability": 0.5},
+    "Risk 4": {"distribution": "lognormal", "costs": (1500, 9000), "probability": 0.3},
+    "Risk 5": {
+        "distribution": "discrete",
+        "costs": (5000, 20000),
+        "weights": (3, 1),
+        "probability": 0.2,
+    },
+}
+
+
+def test_get_pert_ppf():
+    q = np.array([0.05, 0.5, 0.95])
+    expected = stats.beta(1 + 4 * 2 / 6, 1 + 4 * 4 / 6, loc=2, scale=6).ppf(q)
+    np.testing.assert_allclose(get_pert_ppf(q, 2.0, 4.0, 8.0), expected)
+    np.testing.assert_array_equal(get_pert_ppf(q, 3.0, 3.0, 3.0), 3.0)
+
+
+def test_get_uniform_ppf():
+    np.testing.assert_allclose(get_uniform_ppf(np.array([0, 0.25, 1]), 2, 6), [2, 3, 6])
+
+
+def test_get_lognormal_ppf():
+    np.testing.assert_allclose(get_lognormal_ppf(np.array([0.1, 0.9]), 100, 400), [100, 400])
+    assert get_lognormal_ppf(0.5, 100, 400) == pytest.approx(200)
+
+
+def test_get_discrete_ppf():
+    q = np.array([0, 0.74, 0.75, 0.99])
+    np.testing.assert_array_equal(get_discrete_ppf(q, [10, 20], [3, 1]), [10, 10, 20, 20])
+    np.testing.assert_array_equal(get_discrete_ppf(q, [7]), [7, 7, 7, 7])
+
+
+def test_get_distribution_groups():
+    groups = get_distribution_groups(MIXED_RISKS)
+    assert set(groups) == {"triangular", "pert", "uniform", "lognormal", "discrete"}
+    np.testing.assert_array_equal(groups["lognormal"].rows, [3])
+    np.testing.assert_array_equal(groups["pert"].parameters, [[2000, 4000, 8000]])
+
+
+@pytest.mark.parametrize(
+    "details",
+    [
+        {"distribution": "gamma", "costs": (1, 2), "probability": 1},
+        {"distribution": "pert", "costs": (1, 2), "probability": 1},
+        {"distribution": "pert", "costs": (3, 2, 4), "probability": 1},
+        {"distribution": "uniform", "costs": (2, 1), "probability": 1},
+        {"distribution": "lognormal", "costs": (0, 10), "probability": 1},
+        {"distribution": "discrete", "costs": (1, 2), "weights": (1,), "probability": 1},
+        {"distribution": "uniform", "costs": (1, 2), "probability": 2},
+        {"distribution": "uniform", "costs": (1, 2), "probability": "high"},
+        {"distribution": "uniform", "probability": 1},
+        {"distribution": "uniform", "costs": (1, 2)},
+    ],
+)
+def test_get_distribution_groups_invalid(details):
+    with pytest.raises(ValueError, match=r"row 1 \(Bad\)"):
+        get_distribution_groups({"Good": TRIANGULAR_RISKS["Risk 1"], "Bad": details})
+
+
+def test_get_mixed_sample_matrix():
+    samples = get_mixed_sample_matrix(MIXED_RISKS, iterations=200000, seed=42)
+    assert samples.shape == (5, 200000)
+    occurred = samples > 0
+    np.testing.assert_allclose(occurred.mean(axis=1), [1, 0.8, 0.5, 0.3, 0.2], atol=0.005)
+    pert = samples[1][occurred[1]]
+    assert pert.mean() == pytest.approx((2000 + 4 * 4000 + 8000) / 6, rel=0.01)
+    uniform = samples[2][occurred[2]]
+    assert 500 <= uniform.min() and uniform.max() <= 1500
+    lognormal = samples[3][occurred[3]]
+    np.testing.assert_allclose(np.percentile(lognormal, [10, 90]), [1500, 9000], rtol=0.02)
+    discrete = samples[4][occurred[4]]
+    assert set(np.unique(discrete)) == {5000, 20000}
+    assert (discrete == 5000).mean() == pytest.approx(0.75, abs=0.01)
+
+
+def test_get_mixed_sample_matrix_streams_are_per_risk():
+    samples = get_mixed_sample_matrix(MIXED_RISKS, iterations=1000, seed=42)
+    subset = {name: MIXED_RISKS[name] for name in ("Risk 4", "Risk 2")}
+    np.testing.assert_array_equal(
+        get_mixed_sample_matrix(subset, iterations=1000, seed=42), samples[[3, 1]]
+    )
+    chunks = [get_mixed_sample_matrix(MIXED_RISKS, 500, 42, start) for start in (0, 500)]
+    np.testing.assert_array_equal(np.hstack(chunks), samples)
+
+
+def test_get_mixed_aggregate_data_triangular_only():
+    np.testing.assert_array_equal(
+        get_mixed_aggregate_data(TRIANGULAR_RISKS, seed=42),
+        get_aggregate_data(TRIANGULAR_RISKS, seed=42),
+    )
+
+
+def test_get_distribution_groups_reports_every_row():
+    risks = {
+        "Good": TRIANGULAR_RISKS["Risk 1"],
+        "No costs": {"probability": 1},
+        "No probability": {"distribution": "lognormal", "costs": (1, 2)},
+    }
+    with pytest.raises(ValueError) as error:
+        get_distribution_groups(risks)
+    assert "row 1 (No costs): Missing `costs`." in str(error.value)
+    assert "row 2 (No probability): Missing `probability`." in str(error.value)
+
+
+def test_get_distribution_groups_reports_triangular_rows():
+    risks = {
+        "A": MIXED_RISKS["Risk 2"],
+        "B": {"costs": (5, 1, 3), "probability": 1},
+        "C": {"distribution": "uniform", "costs": (3, 1), "probability": 1},
+    }
+    with pytest.raises(ValueError) as error:
+        get_distribution_groups(risks)
+    assert "row 1 (B): The mode must be between the minimum and maximum." in str(error.value)
+    assert "row 2 (C)" in str(error.value)
+    with pytest.raises(ValueError, match=r"row 1 \(B\)"):
+        get_distribution_groups({name: risks[name] for name in ("A", "B")})
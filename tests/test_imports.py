@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+import pytest
+
+CORE_MODULES = [
+    "analytic",
+    "cache",
+    "convergence",
+    "correlation",
+    "distributions",
+    "instrumentation",
+    "parallel",
+    "plots",
+    "portfolio",
+    "probability",
+    "register",
+    "results",
+    "sensitivity",
+    "storage",
+    "streaming",
+    "tables",
+    "tail",
+    "whatif",
+]
+
+
+@pytest.mark.parametrize("module", CORE_MODULES)
+def test_import_is_lazy(module):
+    code = (
+        "import sys\n"
+        f"import darpi.quantitative.{module}\n"
+        "print(sorted({name.split('.')[0] for name in sys.modules} & {'scipy', 'pandas', 'plotly'}))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
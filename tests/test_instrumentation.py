@@ -0,0 +1,97 @@
+import json
+
+import numpy as np
+
+from darpi.config import StageRecord
+from darpi.quantitative.instrumentation import profile, set_nbytes, stage
+from darpi.quantitative.probability import get_empirical_ppf, get_sample_matrix
+from darpi.quantitative.register import get_risk_register
+from darpi.quantitative.results import get_simulation_result
+
+RISKS = {
+    "Risk 1": {"costs": (1000, 2000, 5000), "probability": 1},
+    "Risk 2": {"costs": (2000, 4000, 8000), "probability": 0.8},
+    "Risk 3": {"costs": (2800, 4000, 10000), "probability": 0.5},
+}
+
+
+def test_stage_without_profile_is_shared_no_op():
+    assert stage("a") is stage("b", iterations=10, risks=2)
+    with stage("a") as timer:
+        set_nbytes(timer, 100)
+    assert timer is None
+
+
+def test_profile_records_pipeline_stages():
+    with profile() as run:
+        result = get_simulation_result(RISKS, iterations=1000, seed=42)
+        result.get_p_value(0.8)
+    stages = {record.stage: record for record in run.records}
+    assert {"get_sample_matrix", "sum_sample_matrix", "SimulationResult.sort"} <= set(stages)
+    sampling = stages["get_sample_matrix"]
+    assert sampling.iterations == 1000
+    assert sampling.risks == 3
+    assert sampling.nbytes == 3 * 1000 * 8
+    assert sampling.seconds >= 0
+    assert sampling.peak_bytes is None
+
+    parts = [
+        record
+        for record in run.records
+        if record.stage.startswith("get_sample_matrix.")
+    ]
+    assert {record.stage for record in parts} == {
+        "get_sample_matrix.generators",
+        "get_sample_matrix.uniforms",
+        "get_sample_matrix.ppf",
+    }
+    assert sum(record.seconds for record in parts) <= sampling.seconds
+
+    with stage("outside"):
+        pass
+    assert "outside" not in {record.stage for record in run.records}
+
+
+def test_profile_records_correlated_stage():
+    register = get_risk_register(RISKS)
+    correlation = {"Ground": {"risks": ["Risk 1", "Risk 3"], "correlation": 0.5}}
+    with profile() as run:
+        get_sample_matrix(register, iterations=100, seed=1, correlation=correlation)
+    (correlated,) = [
+        record for record in run.records if record.stage == "get_sample_matrix.correlated"
+    ]
+    assert correlated.risks == 2
+
+
+def test_profile_results_are_unchanged():
+    with profile():
+        profiled = get_simulation_result(RISKS, iterations=1000, seed=42)
+    result = get_simulation_result(RISKS, iterations=1000, seed=42)
+    np.testing.assert_array_equal(profiled.totals, result.totals)
+
+
+def test_profile_callback_and_export():
+    received = []
+    with profile(callback=received.append) as run:
+        get_empirical_ppf(np.arange(10.0)[::-1])
+        get_empirical_ppf(np.arange(10.0)[::-1])
+    assert received == run.records
+    assert all(isinstance(record, StageRecord) for record in received)
+
+    exported = json.loads(run.to_json())
+    assert exported == json.loads(json.dumps(run.as_dict()))
+    assert len(exported["stages"]) == 2
+    assert exported["totals"]["get_empirical_ppf.sort"]["calls"] == 2
+
+
+def test_profile_trace_memory_nested_stages():
+    with profile(trace_memory=True) as run:
+        with stage("outer"):
+            with stage("inner"):
+                inner = np.ones(10**6)
+            del inner
+            outer = np.ones(10**5)
+    records = {record.stage: record for record in run.records}
+    assert records["inner"].peak_bytes >= 8 * 10**6
+    assert records["outer"].peak_bytes >= records["inner"].peak_bytes
+    assert outer.nbytes == 8 * 10**5
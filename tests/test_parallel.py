@@ -0,0 +1,17 @@
+from darpi.quantitative.parallel import get_parallel_aggregate_data
+from darpi.quantitative.probability import get_aggregate_data
+
+risks = {
+    "Risk 1": {"costs": (1000, 2000, 5000), "probability": 0.6},
+    "Risk 2": {"costs": (2000, 4000, 8000), "probability": 0.8},
+    "Risk 3": {"costs": (2800, 4000, 10000), "probability": 0.5},
+}
+
+
+def test_get_parallel_aggregate_data():
+    samples = get_aggregate_data({risk: dict(details) for risk, details in risks.items()}, seed=9)
+    parallel_samples = get_parallel_aggregate_data(
+        risks, iterations=len(samples), seed=9, workers=2, chunk_size=30000
+    )
+    assert (parallel_samples == samples).all()
+    assert "samples" not in risks["Risk 1"]
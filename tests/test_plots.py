@@ -2,8 +2,13 @@ import numpy as np
 import pytest
 from plotly.graph_objects import Figure
 
-from darpi.config import CDFData, HistogramData, PPFData
-from darpi.plots import plot_histogram_and_cdf, plot_ppf_curve
+from darpi.config import PLOT_MAX_POINTS, CDFData, HistogramData, PPFData
+from darpi.quantitative.plots import (
+    get_downsampled_cdf,
+    plot_histogram_and_cdf,
+    plot_ppf_curve,
+)
+from darpi.quantitative.probability import get_empirical_cdf
 
 
 def test_plot_histogram_and_cdf():
@@ -39,6 +44,33 @@ def test_plot_histogram_and_cdf():
     assert layout.yaxis2.title.text == "Probability that value is not exceeded"
 
 
+def test_get_downsampled_cdf():
+    cdf_data = get_empirical_cdf(np.random.default_rng(1).lognormal(size=100000))
+    downsampled = get_downsampled_cdf(cdf_data, max_points=500)
+    assert len(downsampled.cost) <= 500
+    assert downsampled.cost[0] == cdf_data.cost[0]
+    assert downsampled.cost[-1] == cdf_data.cost[-1]
+    assert (np.diff(downsampled.p) > 0).all()
+    interpolated = np.interp(cdf_data.cost, downsampled.cost, downsampled.p)
+    assert np.abs(interpolated - cdf_data.p).max() < 0.01
+
+    small = CDFData(cost=np.arange(10.0), p=np.linspace(0.1, 1, 10))
+    assert get_downsampled_cdf(small) is small
+
+
+def test_plot_histogram_and_cdf_large():
+    data = np.random.default_rng(2).lognormal(size=100000)
+    hist_data = HistogramData(*np.histogram(data, bins=40)[::-1])
+    cdf_data = get_empirical_cdf(data)
+
+    fig = plot_histogram_and_cdf(hist_data, cdf_data)
+    assert fig.data[1].type == "scattergl"
+    assert len(fig.data[1].x) <= PLOT_MAX_POINTS
+
+    fig = plot_histogram_and_cdf(hist_data, cdf_data, max_points=None)
+    assert len(fig.data[1].x) == len(data)
+
+
 def test_plot_ppf_curve():
     # Mock data for PPF
     p_values = np.linspace(0, 100, 13)
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from darpi.config import PortfolioData
+from darpi.quantitative.portfolio import get_portfolio_data
+from darpi.quantitative.results import get_simulation_result
+from darpi.quantitative.tables import get_non_exceedance_table, get_portfolio_table
+
+risks = {
+    "Risk 1": {"costs": (1000, 2000, 5000), "probability": 0.6},
+    "Risk 2": {"costs": (2000, 4000, 8000), "probability": 0.8},
+    "Risk 3": {"costs": (2800, 4000, 10000), "probability": 0.5},
+    "Risk 4": {"costs": (100, 400, 1000), "probability": 0.5},
+}
+paths = {
+    "Risk 1": ("Project B", "Earthworks"),
+    "Risk 2": ("Project A", "Structures"),
+    "Risk 3": ("Project A", "Earthworks"),
+    "Risk 4": ("Project B", "Earthworks"),
+}
+
+
+def test_get_portfolio_data():
+    portfolio = get_portfolio_data(risks, paths, iterations=10000, seed=1, chunk_size=3000)
+    assert isinstance(portfolio, PortfolioData)
+    assert portfolio.nodes == [
+        (),
+        ("Project A",),
+        ("Project B",),
+        ("Project A", "Earthworks"),
+        ("Project A", "Structures"),
+        ("Project B", "Earthworks"),
+    ]
+    assert portfolio.totals.shape == (6, 10000)
+    expected = get_simulation_result(risks, iterations=10000, seed=1)
+    assert np.allclose(portfolio.totals[0], expected.totals)
+    project_b = {risk: risks[risk] for risk in ("Risk 1", "Risk 4")}
+    expected = get_simulation_result(project_b, iterations=10000, seed=1)
+    assert np.allclose(portfolio.totals[2], expected.totals)
+    assert np.allclose(portfolio.totals[2], portfolio.totals[5])
+    assert np.allclose(portfolio.totals[0], portfolio.totals[1] + portfolio.totals[2])
+
+
+def test_get_portfolio_data_errors():
+    with pytest.raises(ValueError, match="without a path"):
+        get_portfolio_data(risks, {"Risk 1": ("A",)})
+    with pytest.raises(ValueError, match="same"):
+        get_portfolio_data(risks, {**paths, "Risk 1": ("Project B",)})
+
+
+def test_get_portfolio_table():
+    portfolio = get_portfolio_data(risks, paths, iterations=10000, seed=1)
+    table = get_portfolio_table(portfolio)
+    assert list(table["node"]) == [
+        "Total",
+        "Project A",
+        "Project B",
+        "Project A / Earthworks",
+        "Project A / Structures",
+        "Project B / Earthworks",
+    ]
+    assert list(table["level"]) == [0, 1, 1, 2, 2, 2]
+    assert np.allclose(
+        table.iloc[0, 2:].to_numpy(dtype=float),
+        get_non_exceedance_table(portfolio.totals[0])["cost"],
+    )
+    table = get_portfolio_table(portfolio, p_values=[0.5, 0.9])
+    assert list(table.columns) == ["node", "level", 0.5, 0.9]
+    assert (table[0.9] >= table[0.5]).all()
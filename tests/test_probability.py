@@ -4,20 +4,39 @@ import numpy as np
 import pytest
 from scipy.stats import triang
 
-from darpi.config import ITERATIONS, CDFData, HistogramData, PPFData
-from darpi.probability import (  # create_cdf_data,; create_histogram_data,; create_ppf_curve_data,
+from darpi.config import ITERATIONS, CDFData, HistogramData, PPFData, SparseSamples
+from darpi.quantitative.probability import (  # create_cdf_data,; create_histogram_data,; create_ppf_curve_data,
     get_empirical_cdf,
     get_empirical_ppf,
+    get_aggregate_data,
+    get_costs,
     get_histogram_data,
+    get_non_exceedance_probabilities,
+    get_p_value,
+    get_risk_generators,
+    get_risk_ppf,
+    get_sample_matrix,
     get_samples,
+    get_sparse_sample_sets,
+    get_sparse_samples,
     get_triangular_distribution,
+    get_triangular_cdf,
+    get_triangular_ppf,
+    sum_sample_matrix,
     sum_samples,
+    sum_sparse_samples,
 )
+from darpi.quantitative.register import get_register_subset, get_risk_register
 
 minimum, maximum, most_likely = 1, 3, 2
 risk_probability = 0.5
 distribution = get_triangular_distribution(a=minimum, b=maximum, c=most_likely)
 distribution_type = type(triang(c=1))
+risks = {
+    "Risk 1": {"costs": (1000, 2000, 5000), "probability": 1},
+    "Risk 2": {"costs": (2000, 4000, 8000), "probability": 0.8},
+    "Risk 3": {"costs": (2800, 4000, 10000), "probability": 0.05},
+}
 
 
 def test_get_triangular_distribution():
@@ -62,3 +81,159 @@ def test_get_histogram_data():
     assert isinstance(histogram_data, HistogramData)
     assert len(histogram_data.cost) == 41
     assert len(histogram_data.frequency) == 40  # histogram returns len(bins) - 1
+
+
+def test_get_triangular_ppf():
+    q = np.linspace(0, 1, 11)
+    cost = get_triangular_ppf(q, minimum, most_likely, maximum)
+    assert np.allclose(cost, distribution.ppf(q))
+
+
+def test_get_triangular_cdf():
+    x = np.linspace(0, 4, 17)
+    p = get_triangular_cdf(x, minimum, most_likely, maximum)
+    assert np.allclose(p, distribution.cdf(x))
+    assert (get_triangular_cdf(x, 2, 2, 2) == (x >= 2)).all()
+
+
+def test_get_risk_ppf():
+    q = np.asarray([0, 0.49, 0.5, 0.75, 0.999])
+    cost = get_risk_ppf(q, minimum, most_likely, maximum, risk_probability)
+    assert (cost[:2] == 0).all()
+    assert np.allclose(cost[2:], distribution.ppf([0, 0.5, 0.998]))
+
+
+def test_get_sample_matrix():
+    register = get_risk_register(risks)
+    samples = get_sample_matrix(register, iterations=ITERATIONS)
+    assert samples.shape == (3, ITERATIONS)
+    occurred = (samples != 0).mean(axis=1)
+    assert np.allclose(occurred, register.probability, atol=0.01)
+    nonzero = samples[samples != 0]
+    assert nonzero.min() >= 1000
+    assert nonzero.max() <= 10000
+
+
+def test_get_aggregate_data():
+    register_risks = {risk: dict(details) for risk, details in risks.items()}
+    samples = get_aggregate_data(register_risks, seed=2)
+    assert samples.shape == (ITERATIONS,)
+    register = get_risk_register(risks)
+    expected = sum_sample_matrix(get_sample_matrix(register, seed=2), register.names)
+    assert (samples == expected).all()
+    assert register_risks == risks
+    assert (get_aggregate_data(register, seed=2) == samples).all()
+
+
+def test_get_samples_seed():
+    first = get_samples(distribution=distribution, risk_probability=risk_probability, seed=1)
+    second = get_samples(distribution=distribution, risk_probability=risk_probability, seed=1)
+    assert (first == second).all()
+
+
+def test_get_risk_generators():
+    first, second = get_risk_generators(["Risk 1", "Risk 2"], seed=1)
+    (swapped,) = get_risk_generators(["Risk 2"], seed=1)
+    assert (second.random(10) == swapped.random(10)).all()
+    assert (first.random(10) != second.random(10)).all()
+    (offset,) = get_risk_generators(["Risk 1"], seed=1, start=5)
+    (full,) = get_risk_generators(["Risk 1"], seed=1)
+    assert (full.random(10)[5:] == offset.random(5)).all()
+
+
+def test_get_sample_matrix_chunks():
+    register = get_risk_register(risks)
+    full = get_sample_matrix(register, iterations=1000, seed=7)
+    first = get_sample_matrix(register, iterations=400, seed=7)
+    second = get_sample_matrix(register, iterations=600, seed=7, start=400)
+    assert (full == np.hstack([first, second])).all()
+
+
+def test_get_aggregate_data_seed():
+    reordered = {risk: dict(risks[risk]) for risk in reversed(risks)}
+    first = get_aggregate_data({risk: dict(details) for risk, details in risks.items()}, seed=3)
+    second = get_aggregate_data(reordered, seed=3)
+    assert (first == second).all()
+
+
+def test_sum_sample_matrix():
+    samples = np.asarray([[1.0, 2.0], [3.0, 4.0]])
+    assert (sum_sample_matrix(samples, ["a", "b"]) == [4, 6]).all()
+
+
+def test_get_sparse_samples():
+    sparse_samples = get_sparse_samples(
+        distribution=distribution, risk_probability=0.02, seed=1
+    )
+    assert isinstance(sparse_samples, SparseSamples)
+    assert len(sparse_samples.index) == len(sparse_samples.cost) == 0.02 * ITERATIONS
+    assert len(np.unique(sparse_samples.index)) == len(sparse_samples.index)
+    assert ((sparse_samples.cost >= minimum) & (sparse_samples.cost <= maximum)).all()
+
+
+def test_sum_sparse_samples():
+    sample_sets = [
+        SparseSamples(index=np.asarray([0, 2]), cost=np.asarray([1.0, 2.0]), iterations=4),
+        SparseSamples(index=np.asarray([2, 3]), cost=np.asarray([3.0, 4.0]), iterations=4),
+    ]
+    assert (sum_sparse_samples(sample_sets) == [1, 0, 5, 4]).all()
+    assert (sum_sparse_samples(sample_sets, total=np.ones(4)) == [2, 1, 6, 5]).all()
+
+
+def test_get_sparse_sample_sets():
+    register = get_risk_register(risks)
+    sample_sets = get_sparse_sample_sets(register, seed=4)
+    occurred = [len(samples.index) / ITERATIONS for samples in sample_sets]
+    assert np.allclose(occurred, register.probability, atol=0.01)
+
+
+def test_get_aggregate_data_sparse():
+    samples = get_aggregate_data(risks, seed=5, sparse_probability=0.1)
+    register = get_risk_register(risks)
+    dense_register = get_register_subset(register, [0, 1])
+    dense = sum_sample_matrix(get_sample_matrix(dense_register, seed=5), dense_register.names)
+    sparse = get_sparse_sample_sets(get_register_subset(register, [2]), seed=5)
+    assert np.allclose(samples, sum_sparse_samples(sparse, dense))
+
+
+def test_get_p_value():
+    data = np.random.rand(ITERATIONS)
+    assert get_p_value(data, 0.07) == get_empirical_ppf(data).cost[7].round(2)
+    assert get_p_value(data, 0.875) == get_costs(data, 0.875).round(2)
+
+
+def test_get_costs():
+    data = np.asarray([4.0, 1.0, 3.0, 2.0])
+    costs = get_costs(data, [0.25, 0.5, 0.625, 1, 0])
+    assert np.allclose(costs, [1, 2, 2.5, 4, 1])
+    with pytest.raises(ValueError):
+        get_costs(data, 1.5)
+
+
+def test_get_non_exceedance_probabilities():
+    data = np.asarray([4.0, 1.0, 3.0, 2.0])
+    p = get_non_exceedance_probabilities(data, [0, 1, 2.5, 4, 5])
+    assert np.allclose(p, [0, 0.25, 0.5, 1, 1])
+
+
+def test_get_sample_matrix_latin_hypercube():
+    register = get_risk_register(risks)
+    samples = get_sample_matrix(register, iterations=1000, seed=1, sampling="latin-hypercube")
+    occurred = (samples != 0).sum(axis=1)
+    # Every stratum is drawn once, so occurrences match the probability to within one draw
+    assert (np.abs(occurred - register.probability * 1000) <= 1).all()
+    with pytest.raises(ValueError, match="start"):
+        get_sample_matrix(register, iterations=500, seed=1, start=500, sampling="latin-hypercube")
+
+
+def test_get_sample_matrix_sobol():
+    register = get_risk_register(risks)
+    samples = get_sample_matrix(register, iterations=1024, seed=2, sampling="sobol")
+    first = get_sample_matrix(register, iterations=512, seed=2, sampling="sobol")
+    second = get_sample_matrix(register, iterations=512, seed=2, start=512, sampling="sobol")
+    assert (samples == np.hstack([first, second])).all()
+    with pytest.raises(ValueError):
+        get_sample_matrix(register, iterations=8, sampling="halton")
+    with pytest.raises(ValueError, match="power of 2"):
+        get_sample_matrix(register, iterations=1000, seed=2, sampling="sobol")
+    assert len(get_aggregate_data(risks, seed=2, sampling="sobol")) == 2**17
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from darpi.config import HeatMapData
+from darpi.qualitative.plots import add_scatter_to_heat_map, plot_heat_map
+from darpi.qualitative.scoring import get_heat_map_data, get_score_centroid
+
+RISK_SCORE_COUNTS = [
+    {"probability": 1, "impact": 2, "counts": 1},
+    {"probability": 3, "impact": 4, "counts": 2},
+    {"probability": 5, "impact": 5, "counts": 1},
+]
+
+
+def test_get_heat_map_data():
+    probability = np.array([3, 1, 3, 5])
+    impact = np.array([4, 2, 4, 5])
+    data = get_heat_map_data(probability, impact)
+    np.testing.assert_array_equal(data.probability, [1, 3, 5])
+    np.testing.assert_array_equal(data.impact, [2, 4, 5])
+    np.testing.assert_array_equal(data.counts, [1, 2, 1])
+    assert get_score_centroid(data) == pytest.approx((probability.mean(), impact.mean()))
+
+
+def test_get_heat_map_data_large_register():
+    rng = np.random.default_rng(42)
+    probability = rng.integers(1, 6, size=20000)
+    impact = rng.integers(1, 6, size=20000)
+    data = get_heat_map_data(probability.astype(float), impact)
+    assert data.counts.sum() == 20000
+    cells = {(p, i): c for p, i, c in zip(*data)}
+    assert cells[(2, 3)] == np.count_nonzero((probability == 2) & (impact == 3))
+
+
+@pytest.mark.parametrize(
+    "probability, impact",
+    [([1, 6], [1, 1]), ([1, 2.5], [1, 1]), ([1, 2], [1]), ([1, np.nan], [1, 1])],
+)
+def test_get_heat_map_data_invalid(probability, impact):
+    with pytest.raises(ValueError):
+        get_heat_map_data(probability, impact)
+
+
+def test_get_score_centroid_empty():
+    with pytest.raises(ValueError):
+        get_score_centroid(get_heat_map_data([], []))
+
+
+def test_add_scatter_to_heat_map():
+    fig = add_scatter_to_heat_map(RISK_SCORE_COUNTS, "Risks")
+    np.testing.assert_array_equal(fig.data[1].x, [1, 3, 5])
+    np.testing.assert_array_equal(fig.data[1].marker.size, [1, 2, 1])
+    assert fig.data[2].x == (3.0,)
+    assert fig.data[2].y == (3.75,)
+
+
+def test_plot_heat_map_matches_counted_scores():
+    fig = plot_heat_map([1, 3, 3, 5], [2, 4, 4, 5], "Risks")
+    expected = add_scatter_to_heat_map(
+        HeatMapData(np.array([1, 3, 5]), np.array([2, 4, 5]), np.array([1, 2, 1])), "Risks"
+    )
+    assert fig.to_dict() == expected.to_dict()
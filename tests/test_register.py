@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from darpi.config import RegisterError, RiskRegister
+from darpi.quantitative.register import (
+    get_register_errors,
+    get_risk_register,
+    get_risk_register_from_frame,
+    read_risk_register,
+    validate_risk_register,
+)
+
+risks = {
+    "Risk 1": {"costs": (1000, 2000, 5000), "probability": 1},
+    "Risk 2": {"costs": (2000, 4000, 8000), "probability": 0.8},
+}
+
+
+def test_get_risk_register():
+    register = get_risk_register(risks)
+    assert isinstance(register, RiskRegister)
+    assert list(register.names) == ["Risk 1", "Risk 2"]
+    assert (register.minimum == [1000, 2000]).all()
+    assert (register.mode == [2000, 4000]).all()
+    assert (register.maximum == [5000, 8000]).all()
+    assert (register.probability == [1, 0.8]).all()
+
+
+def test_get_risk_register_type_error():
+    with pytest.raises(TypeError):
+        get_risk_register({"Risk 1": {"costs": ("a", 2, 3), "probability": 0.5}})
+
+
+def test_validate_risk_register():
+    register = RiskRegister(
+        names=np.asarray(["Risk 1", "Risk 2", "Risk 3"], dtype=object),
+        minimum=np.asarray([1.0, 1.0, 1.0]),
+        mode=np.asarray([2.0, 4.0, 2.0]),
+        maximum=np.asarray([3.0, 3.0, 3.0]),
+        probability=np.asarray([0.5, 0.5, 1.5]),
+    )
+    with pytest.raises(ValueError, match="Risk 2"):
+        validate_risk_register(register)
+    with pytest.raises(ValueError, match="Risk 3"):
+        validate_risk_register(register._replace(mode=np.asarray([2.0, 2.0, 2.0])))
+
+
+def test_get_register_errors():
+    register = RiskRegister(
+        names=np.asarray(["Risk 1", "Risk 2", "Risk 1", ""], dtype=object),
+        minimum=np.asarray([1.0, np.nan, 1.0, 1.0]),
+        mode=np.asarray([2.0, 2.0, 4.0, 2.0]),
+        maximum=np.asarray([3.0, 3.0, 3.0, 3.0]),
+        probability=np.asarray([0.5, 0.5, 0.5, -1]),
+    )
+    errors = get_register_errors(register)
+    assert all(isinstance(error, RegisterError) for error in errors)
+    assert [(error.row, error.name) for error in errors] == [
+        (0, "Risk 1"),
+        (1, "Risk 2"),
+        (2, "Risk 1"),
+        (2, "Risk 1"),
+        (3, ""),
+        (3, ""),
+    ]
+    assert "not unique" in errors[0].message
+    assert "numbers" in errors[1].message
+    assert get_register_errors(get_risk_register(risks)) == []
+    with pytest.raises(ValueError, match="row 1 \\(Risk 2\\)"):
+        validate_risk_register(register)
+
+
+def test_get_risk_register_from_frame():
+    frame = pd.DataFrame(
+        {
+            "Risk": ["Risk 1", "Risk 2"],
+            "Low": [1000, 2000],
+            "Likely": [2000, 4000],
+            "High": [5000, 8000],
+            "Probability": [1, 0.8],
+        }
+    )
+    register = get_risk_register_from_frame(
+        frame, name="Risk", minimum="Low", mode="Likely", maximum="High", probability="Probability"
+    )
+    expected = get_risk_register(risks)
+    for field, values in register._asdict().items():
+        assert list(values) == list(getattr(expected, field))
+
+
+def test_read_risk_register(tmp_path):
+    path = tmp_path / "register.csv"
+    path.write_text(
+        "name,minimum,mode,maximum,probability\n"
+        "Risk 1,1000,2000,5000,1\n"
+        "Risk 2,2000,4000,8000,0.8\n"
+    )
+    register = read_risk_register(path)
+    assert list(register.names) == ["Risk 1", "Risk 2"]
+    assert (register.maximum == [5000, 8000]).all()
+
+    path.write_text(
+        "name,minimum,mode,maximum,probability\n"
+        "Risk 1,1000,2000,5000,1\n"
+        "Risk 2,2000,n/a,8000,0.8\n"
+        "Risk 2,,4000,8000,0.8\n"
+    )
+    with pytest.raises(ValueError) as error:
+        read_risk_register(path)
+    assert "row 1 (Risk 2)" in str(error.value)
+    assert "row 2 (Risk 2)" in str(error.value)
@@ -0,0 +1,97 @@
+import numpy as np
+
+from darpi.config import CDFData, HistogramData, PPFData
+from darpi.quantitative.probability import (
+    get_aggregate_data,
+    get_empirical_cdf,
+    get_empirical_ppf,
+    get_histogram_data,
+    get_p_value,
+)
+from darpi.quantitative.results import SimulationResult, get_simulation_result
+from darpi.quantitative.tables import get_non_exceedance_table
+
+risks = {
+    "Risk 1": {"costs": (1000, 2000, 5000), "probability": 0.6},
+    "Risk 2": {"costs": (2000, 4000, 8000), "probability": 0.8},
+    "Risk 3": {"costs": (2800, 4000, 10000), "probability": 0.5},
+}
+
+
+def test_get_simulation_result():
+    result = get_simulation_result(risks, seed=1)
+    samples = get_aggregate_data({risk: dict(details) for risk, details in risks.items()}, seed=1)
+    assert isinstance(result, SimulationResult)
+    assert (result.totals == samples).all()
+    assert result.samples.shape == (3, len(samples))
+    assert "samples" not in risks["Risk 1"]
+
+    without_samples = get_simulation_result(risks, seed=1, keep_samples=False)
+    assert without_samples.samples is None
+    assert (without_samples.totals == samples).all()
+
+
+def test_simulation_result_cache():
+    result = get_simulation_result(risks, seed=2)
+    ppf_data = result.get_empirical_ppf()
+    assert isinstance(ppf_data, PPFData)
+    assert ppf_data is result.get_empirical_ppf()
+    assert np.allclose(ppf_data.cost, get_empirical_ppf(result.totals).cost)
+
+    cdf_data = result.get_empirical_cdf()
+    assert isinstance(cdf_data, CDFData)
+    assert (cdf_data.cost == get_empirical_cdf(result.totals).cost).all()
+
+    histogram_data = result.get_histogram_data()
+    assert isinstance(histogram_data, HistogramData)
+    assert np.allclose(histogram_data.frequency, get_histogram_data(result.totals).frequency)
+
+    assert result.get_p_value(0.8) == get_p_value(result.totals, 0.8)
+
+
+def test_simulation_result_table():
+    result = SimulationResult(np.asarray([0.0, 0.0, 1.0, 2.0, 3.0]))
+    table = get_non_exceedance_table(result)
+    assert (table["cost"] == get_empirical_ppf(result.totals).cost).all()
+
+
+def test_simulation_result_queries():
+    result = get_simulation_result(risks, seed=3, keep_samples=False)
+    p_values = np.linspace(0.5, 0.99, 50)
+    costs = result.get_costs(p_values)
+    assert np.allclose(costs, np.sort(result.totals)[np.ceil(p_values * 1e5 - 1).astype(int)], rtol=1e-3)
+    assert np.allclose(result.get_non_exceedance_probabilities(costs), p_values, atol=1e-4)
+
+
+def test_get_simulation_result_float32():
+    p_values = np.asarray([0.1, 0.5, 0.8, 0.9, 0.99])
+    expected = get_simulation_result(risks, seed=3, keep_samples=False)
+    for keep_samples in (True, False):
+        result = get_simulation_result(
+            risks, seed=3, keep_samples=keep_samples, dtype=np.float32
+        )
+        assert result.totals.dtype == np.float32
+        assert np.allclose(result.totals, expected.totals, rtol=4 * 2**-24, atol=0)
+        assert np.allclose(result.get_costs(p_values), expected.get_costs(p_values), rtol=1e-7)
+        assert np.allclose(
+            result.get_empirical_ppf().cost, expected.get_empirical_ppf().cost, rtol=1e-7
+        )
+    assert np.isclose(
+        result.get_histogram_data().frequency.sum(),
+        expected.get_histogram_data().frequency.sum(),
+    )
+
+
+def test_get_p_value_matches_table():
+    risks = {
+        "A": {"costs": (1000, 2000, 5000), "probability": 0.3},
+        "B": {"costs": (2000, 4000, 8000), "probability": 0.2},
+    }
+    data = get_aggregate_data(risks, seed=1)
+    result = get_simulation_result(risks, seed=1)
+    table = get_non_exceedance_table(data)
+    for percentile in range(101):
+        assert get_p_value(data, percentile / 100) == table["cost"][percentile].round(2)
+        assert result.get_p_value(percentile / 100) == table["cost"][percentile].round(2)
+    assert get_p_value(data, 0.55) > 0
+
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from darpi.config import SensitivityData
+from darpi.quantitative.results import SimulationResult, get_simulation_result
+from darpi.quantitative.sensitivity import get_sensitivity_data
+from darpi.quantitative.tables import get_sensitivity_table
+
+risks = {
+    "Risk 1": {"costs": (100, 200, 500), "probability": 0.6},
+    "Risk 2": {"costs": (2000, 4000, 8000), "probability": 0.8},
+    "Risk 3": {"costs": (2800, 4000, 10000), "probability": 0.5},
+}
+
+
+def test_get_sensitivity_data():
+    result = get_simulation_result(risks, iterations=20000, seed=1)
+    sensitivity_data = get_sensitivity_data(result, p_value=0.8)
+    assert isinstance(sensitivity_data, SensitivityData)
+    assert list(sensitivity_data.risk) == list(risks)
+
+    tail = result.totals >= result.get_costs(0.8)
+    assert np.isclose(sensitivity_data.tail_contribution.sum(), result.totals[tail].mean())
+
+    for index in range(3):
+        remaining = result.totals - result.samples[index]
+        expected = result.get_costs(0.8) - np.sort(remaining)[int(0.8 * 20000) - 1]
+        assert np.isclose(sensitivity_data.removal_delta[index], expected)
+
+    assert (np.abs(sensitivity_data.rank_correlation) <= 1).all()
+    assert sensitivity_data.rank_correlation[0] < sensitivity_data.rank_correlation[2]
+
+
+def test_get_sensitivity_data_without_samples():
+    with pytest.raises(ValueError):
+        get_sensitivity_data(SimulationResult(np.ones(10)))
+
+
+def test_get_sensitivity_table():
+    result = get_simulation_result(risks, iterations=20000, seed=2)
+    table = get_sensitivity_table(result)
+    assert list(table.columns) == list(SensitivityData._fields)
+    assert table["removal_delta"].is_monotonic_decreasing
+    assert table["risk"].iloc[-1] == "Risk 1"
@@ -0,0 +1,58 @@
+import json
+
+import numpy as np
+import pytest
+
+from darpi.quantitative.results import SimulationResult, get_simulation_result
+from darpi.quantitative.storage import load_simulation_result, save_simulation_result
+from darpi.quantitative.tables import get_non_exceedance_table
+
+risks = {
+    "Risk 1": {"costs": (1000, 2000, 5000), "probability": 0.6},
+    "Risk 2": {"costs": (2000, 4000, 8000), "probability": 0.8},
+    "Risk 3": {"costs": (2800, 4000, 10000), "probability": 0.5},
+}
+
+
+def test_save_and_load_simulation_result(tmp_path):
+    result = get_simulation_result(risks, iterations=1000, seed=1)
+    save_simulation_result(result, tmp_path / "run")
+    loaded = load_simulation_result(tmp_path / "run")
+
+    assert isinstance(loaded.totals, np.memmap)
+    assert isinstance(loaded.sorted_totals, np.memmap)
+    assert (loaded.totals == result.totals).all()
+    assert (loaded.samples == result.samples).all()
+    assert list(loaded.register.names) == list(result.register.names)
+    assert (loaded.register.maximum == result.register.maximum).all()
+    assert loaded.seed.entropy == 1
+    assert get_non_exceedance_table(loaded).equals(get_non_exceedance_table(result))
+    assert loaded.get_p_value(0.9) == result.get_p_value(0.9)
+
+    in_memory = load_simulation_result(tmp_path / "run", mmap_mode=None)
+    assert not isinstance(in_memory.totals, np.memmap)
+
+
+def test_save_simulation_result_totals_only(tmp_path):
+    result = get_simulation_result(risks, iterations=1000, seed=1)
+    save_simulation_result(result, tmp_path)
+    save_simulation_result(SimulationResult(result.totals), tmp_path)
+    loaded = load_simulation_result(tmp_path)
+    assert loaded.samples is None
+    assert loaded.register is None
+    assert loaded.seed is None
+
+    metadata = json.loads((tmp_path / "metadata.json").read_text())
+    (tmp_path / "metadata.json").write_text(json.dumps({**metadata, "version": 0}))
+    with pytest.raises(ValueError):
+        load_simulation_result(tmp_path)
+
+
+def test_save_and_load_generator_seed(tmp_path):
+    result = get_simulation_result(risks, iterations=1000, seed=np.random.default_rng(1))
+    save_simulation_result(result, tmp_path)
+    loaded = load_simulation_result(tmp_path)
+    np.testing.assert_array_equal(loaded.seed.entropy, result.seed.entropy)
+    assert loaded.seed.spawn_key == result.seed.spawn_key
+    rerun = get_simulation_result(risks, iterations=1000, seed=loaded.seed)
+    np.testing.assert_array_equal(rerun.totals, result.totals)
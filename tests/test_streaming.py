@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from darpi.config import CDFData, HistogramData, PPFData
+from darpi.quantitative.probability import (
+    get_aggregate_data,
+    get_empirical_ppf,
+    get_register_totals,
+)
+from darpi.quantitative.register import get_risk_register
+from darpi.quantitative.streaming import StreamingSummary, get_streaming_summary
+from darpi.quantitative.tables import get_non_exceedance_table
+
+risks = {
+    "Risk 1": {"costs": (1000, 2000, 5000), "probability": 0.6},
+    "Risk 2": {"costs": (2000, 4000, 8000), "probability": 0.8},
+    "Risk 3": {"costs": (2800, 4000, 10000), "probability": 0.5},
+}
+iterations = 50000
+
+
+def test_get_register_totals():
+    register = get_risk_register(risks)
+    totals = get_register_totals(register, iterations=1000, seed=5)
+    samples = get_aggregate_data({risk: dict(details) for risk, details in risks.items()}, seed=5)
+    assert (totals == samples[:1000]).all()
+
+
+def test_get_streaming_summary():
+    summary = get_streaming_summary(risks, iterations=iterations, seed=1, chunk_size=7000)
+    samples = get_register_totals(get_risk_register(risks), iterations=iterations, seed=1)
+    assert isinstance(summary, StreamingSummary)
+    assert summary.iterations == iterations
+    assert summary.zeros == (samples == 0).sum()
+    assert summary.minimum == samples[samples != 0].min()
+    assert summary.maximum == samples.max()
+
+    ppf_data = summary.get_empirical_ppf()
+    assert isinstance(ppf_data, PPFData)
+    assert np.allclose(ppf_data.cost, get_empirical_ppf(samples).cost, rtol=1e-3)
+    assert summary.get_p_value(0.8) == ppf_data.cost[80].round(2)
+
+
+def test_streaming_summary_histogram_and_cdf():
+    summary = get_streaming_summary(risks, iterations=iterations, seed=2)
+    histogram_data = summary.get_histogram_data()
+    assert isinstance(histogram_data, HistogramData)
+    assert len(histogram_data.cost) == 41
+    assert np.isclose(histogram_data.frequency.sum(), 1 - summary.zeros / iterations)
+    cdf_data = summary.get_empirical_cdf()
+    assert isinstance(cdf_data, CDFData)
+    assert cdf_data.p[-1] == 1
+
+
+def test_streaming_summary_update():
+    summary = StreamingSummary(upper=10, bins=10)
+    summary.update(np.asarray([0.0, 0.0, 2.5, 9.5]))
+    assert summary.zeros == 2
+    assert summary.counts[2] == 1
+    assert summary.counts[9] == 1
+    assert summary.minimum == 2.5
+
+
+def test_get_non_exceedance_table_summary():
+    summary = get_streaming_summary(risks, iterations=10000, seed=3)
+    table = get_non_exceedance_table(summary)
+    assert (table["cost"] == summary.get_empirical_ppf().cost).all()
+
+
+def test_streaming_summary_queries():
+    summary = get_streaming_summary(risks, iterations=iterations, seed=4)
+    samples = get_register_totals(get_risk_register(risks), iterations=iterations, seed=4)
+    p_values = np.asarray([0.55, 0.805, 0.95])
+    costs = summary.get_costs(p_values)
+    assert np.allclose(costs, np.quantile(samples, p_values), rtol=1e-3)
+    assert np.allclose(summary.get_non_exceedance_probabilities(costs), p_values, atol=1e-3)
+
+
+def test_streaming_summary_negative_costs():
+    risks = {"Saving": {"costs": (-500, -100, 200), "probability": 1}}
+    with pytest.raises(ValueError, match="Negative costs"):
+        get_streaming_summary(risks, iterations=1000, seed=1)
+    with pytest.raises(ValueError):
+        StreamingSummary(upper=0)
+    with pytest.raises(ValueError):
+        StreamingSummary(upper=10, bins=10).update(np.array([1.0, -1.0]))
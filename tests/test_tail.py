@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from darpi.quantitative.probability import get_costs, get_non_exceedance_probabilities
+from darpi.quantitative.tail import (
+    get_exceedance_probability,
+    get_expected_shortfall,
+    get_tail_mean,
+    get_value_at_risk,
+)
+
+LEVELS = np.array([0, 0.5, 0.8, 0.9, 0.95, 1])
+
+
+@pytest.fixture
+def data():
+    return np.random.default_rng(42).gamma(2, 1000, size=(3, 1001))
+
+
+def test_get_value_at_risk(data):
+    var = get_value_at_risk(data, LEVELS)
+    assert var.shape == (3, len(LEVELS))
+    for row, costs in zip(data, var):
+        np.testing.assert_array_equal(costs, get_costs(row, LEVELS))
+    assert get_value_at_risk(data[0], 0.9) == get_costs(data[0], 0.9)
+
+
+def test_get_value_at_risk_invalid(data):
+    with pytest.raises(ValueError):
+        get_value_at_risk(data, 1.5)
+
+
+def test_get_expected_shortfall(data):
+    shortfall = get_expected_shortfall(data, LEVELS)
+    assert shortfall.shape == (3, len(LEVELS))
+    for row, means in zip(np.sort(data, axis=1), shortfall):
+        expected = [row[int(np.floor(level * len(row))) :].mean() for level in LEVELS[:-1]]
+        np.testing.assert_allclose(means, expected + [row[-1]])
+
+
+def test_get_expected_shortfall_ties():
+    data = np.array([0, 0, 0, 0, 0, 0, 0, 0, 10, 20])
+    np.testing.assert_allclose(get_expected_shortfall(data, [0.7, 0.8]), [10, 15])
+    np.testing.assert_allclose(get_tail_mean(data, get_value_at_risk(data, 0.7)), 3)
+
+
+def test_get_tail_mean(data):
+    costs = np.array([[1000, 3000], [5000, 1e9]])
+    means = get_tail_mean(data, costs)
+    assert means.shape == (3, 2, 2)
+    assert means[1, 0, 1] == pytest.approx(data[1][data[1] >= 3000].mean())
+    assert np.isnan(means[:, 1, 1]).all()
+    for index, cost in np.ndenumerate(costs):
+        np.testing.assert_allclose(means[(..., *index)], get_tail_mean(data, cost))
+    np.testing.assert_allclose(get_tail_mean(data[0], [1000, 3000]), means[0, 0])
+
+
+def test_get_exceedance_probability(data):
+    costs = np.array([1000, 2000, 6000])
+    probabilities = get_exceedance_probability(data, costs)
+    for row, row_probabilities in zip(data, probabilities):
+        np.testing.assert_allclose(
+            row_probabilities, 1 - get_non_exceedance_probabilities(row, costs)
+        )
+    for index, cost in enumerate(costs):
+        np.testing.assert_array_equal(
+            probabilities[:, index], get_exceedance_probability(data, cost)
+        )
+    # Ties count as not exceeded
+    assert get_exceedance_probability(np.array([1, 2, 2, 3]), [2]) == [0.25]
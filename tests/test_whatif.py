@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from darpi.quantitative.results import get_simulation_result
+from darpi.quantitative.whatif import RegisterSimulation
+
+risks = {
+    "Risk 1": {"costs": (1000, 2000, 5000), "probability": 0.6},
+    "Risk 2": {"costs": (2000, 4000, 8000), "probability": 0.8},
+    "Risk 3": {"costs": (2800, 4000, 10000), "probability": 0.5},
+}
+
+
+def test_register_simulation():
+    simulation = RegisterSimulation(risks, seed=1)
+    assert (simulation.get_result().totals == get_simulation_result(risks, seed=1).totals).all()
+
+    simulation.set_risk("Risk 2", costs=(2000, 3000, 6000), probability=0.5)
+    edited = {**risks, "Risk 2": {"costs": (2000, 3000, 6000), "probability": 0.5}}
+    expected = get_simulation_result(edited, seed=1)
+    assert np.allclose(simulation.totals, expected.totals)
+    assert (simulation.samples == expected.samples).all()
+    assert simulation.register.probability[1] == 0.5
+
+    simulation.set_risk("Risk 4", costs=(100, 200, 300), probability=1)
+    simulation.remove_risk("Risk 1")
+    edited = {
+        "Risk 2": edited["Risk 2"],
+        "Risk 3": risks["Risk 3"],
+        "Risk 4": {"costs": (100, 200, 300), "probability": 1},
+    }
+    expected = get_simulation_result(edited, seed=1)
+    assert list(simulation.register.names) == list(expected.register.names)
+    assert np.allclose(simulation.get_result().totals, expected.totals)
+
+    simulation.resum()
+    assert (simulation.totals == expected.totals).all()
+    assert simulation.get_result().get_p_value(0.8) == expected.get_p_value(0.8)
+
+
+def test_register_simulation_errors():
+    simulation = RegisterSimulation(risks, seed=1, iterations=100)
+    with pytest.raises(KeyError):
+        simulation.remove_risk("Risk 9")
+    with pytest.raises(ValueError):
+        simulation.set_risk("Risk 1", costs=(3000, 2000, 1000), probability=0.5)
+    assert simulation.register.minimum[0] == 1000